@@ -112,3 +112,12 @@ LOGIN_REDIRECT_URL = "dashboard"
 LOGOUT_REDIRECT_URL = "dashboard"
 # Forms - use default div renderer
 FORM_RENDERER = "django.forms.renderers.DjangoDivFormRenderer"
+##########
+# Cache - entries are keyed by their school's data version, so each process can keep its own.
+# Timetables are cached for each pupil / teacher, hence the raised limit on the number of entries.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    }
+}
@@ -23,3 +23,11 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+
+# Logging settings -> show the solver's formulation reports in development
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"domain.solver": {"handlers": ["console"], "level": "INFO"}},
+}
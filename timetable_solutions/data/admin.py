@@ -83,3 +83,33 @@ class LessonAdmin(admin.ModelAdmin):
         "school__school_access_key",
     ]
     search_help_text = "Search by school access key"
+
+
+@admin.register(models.SolutionCandidate)
+class SolutionCandidateAdmin(admin.ModelAdmin):
+    list_display = ["school", "candidate_number", "objective_value", "created_at"]
+    list_filter = ["school"]
+    search_fields = [
+        "school__school_access_key",
+    ]
+    search_help_text = "Search by school access key"
+
+
+@admin.register(models.SolverRun)
+class SolverRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "school",
+        "created_at",
+        "solver_status",
+        "total_wall_time_seconds",
+        "max_phase_rss_rise_kb",
+        "number_of_variables",
+        "number_of_constraints",
+        "number_of_nonzeros",
+    ]
+    list_filter = ["school", "solver_status"]
+    ordering = ["-total_wall_time_seconds"]
+    search_fields = [
+        "school__school_access_key",
+    ]
+    search_help_text = "Search by school access key"
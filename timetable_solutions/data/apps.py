@@ -5,3 +5,12 @@ from django.apps import AppConfig
 class DataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "data"
+
+    def ready(self) -> None:
+        """
+        Connect the signal receivers once all models are loaded.
+        """
+        # Local application imports
+        from data import signals
+
+        signals.connect_signals()
@@ -28,3 +28,12 @@ class Day(models.IntegerChoices):
     @classmethod
     def weekdays(cls) -> list[Day]:
         return [cls.MONDAY, cls.TUESDAY, cls.WEDNESDAY, cls.THURSDAY, cls.FRIDAY]  # type: ignore[list-item]
+
+
+class SolverRunOutcome(models.TextChoices):
+    """Choices for how a run of the solver ended (labelled by their names, e.g. 'Data Changed')"""
+
+    SAVED = "SAVED"  # The problem was solved, and the solution (if any) saved
+    INVALID_INPUTS = "INVALID_INPUTS"
+    INFEASIBLE = "INFEASIBLE"  # Clearly infeasible, so not solved
+    DATA_CHANGED = "DATA_CHANGED"  # Solved, but the school's data changed meanwhile
@@ -0,0 +1,95 @@
+# Generated by Django 4.2 on 2026-10-18 21:01
+
+# Django imports
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SolutionCandidate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("candidate_number", models.PositiveSmallIntegerField()),
+                ("objective_value", models.FloatField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "school",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="data.school"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["candidate_number"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SolutionCandidateAssignment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "candidate",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="assignments",
+                        to="data.solutioncandidate",
+                    ),
+                ),
+                (
+                    "lesson",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="candidate_assignments",
+                        to="data.lesson",
+                    ),
+                ),
+                (
+                    "slot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="candidate_assignments",
+                        to="data.timetableslot",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="solutioncandidateassignment",
+            constraint=models.UniqueConstraint(
+                models.F("candidate"),
+                models.F("lesson"),
+                models.F("slot"),
+                name="lesson_slot_unique_for_candidate",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="solutioncandidate",
+            constraint=models.UniqueConstraint(
+                models.F("school"),
+                models.F("candidate_number"),
+                name="candidate_number_unique_for_school",
+            ),
+        ),
+    ]
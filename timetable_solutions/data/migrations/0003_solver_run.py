@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 21:10
+
+# Django imports
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0002_solution_candidate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SolverRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("phases", models.JSONField(default=list)),
+                ("total_wall_time_seconds", models.FloatField()),
+                ("peak_rss_kb", models.PositiveIntegerField()),
+                ("number_of_variables", models.PositiveIntegerField()),
+                ("number_of_constraints", models.PositiveIntegerField()),
+                ("number_of_nonzeros", models.PositiveIntegerField()),
+                ("solver_status", models.CharField(max_length=20)),
+                (
+                    "school",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="data.school"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 21:30
+
+# Django imports
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0003_solver_run"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="school",
+            name="data_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
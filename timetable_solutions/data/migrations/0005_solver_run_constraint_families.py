@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 22:28
+
+# Django imports
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0004_school_data_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solverrun",
+            name="constraint_families",
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,179 @@
+# Generated by Django 4.2 on 2026-10-18 22:40
+
+"""
+On Postgres, give timetable slots and breaks a generated integer range column spanning their minutes of the week
+(since Monday 00:00), with a GiST index, and check for clashes within a year group in the database.
+
+Year groups are related to slots and breaks by many-to-many relationships, which an EXCLUDE constraint can't span,
+so the exclusion is enforced by triggers on the relationships and timings. Each check takes an advisory lock on the
+year group, so that concurrent edits to the same year group can't both pass. Clashes have the same meaning as in
+domain.solver.filters.clashes.filter_queryset_for_clashes, with the span index used to find candidates.
+
+Other databases (i.e. SQLite) keep relying on the checks in the slot and break forms.
+"""
+
+# Standard library imports
+from collections.abc import Callable
+
+# Django imports
+from django.apps.registry import Apps
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+FORWARDS_SQL = """
+ALTER TABLE data_timetableslot ADD COLUMN minutes_of_week int4range GENERATED ALWAYS AS (
+    CASE WHEN starts_at < ends_at THEN int4range(
+        (day_of_week - 1) * 1440 + (EXTRACT(HOUR FROM starts_at) * 60 + EXTRACT(MINUTE FROM starts_at))::integer,
+        (day_of_week - 1) * 1440 + (EXTRACT(HOUR FROM ends_at) * 60 + EXTRACT(MINUTE FROM ends_at))::integer
+    ) END
+) STORED;
+CREATE INDEX data_timetableslot_minutes_of_week_gist ON data_timetableslot USING gist (minutes_of_week);
+
+ALTER TABLE data_break ADD COLUMN minutes_of_week int4range GENERATED ALWAYS AS (
+    CASE WHEN starts_at < ends_at THEN int4range(
+        (day_of_week - 1) * 1440 + (EXTRACT(HOUR FROM starts_at) * 60 + EXTRACT(MINUTE FROM starts_at))::integer,
+        (day_of_week - 1) * 1440 + (EXTRACT(HOUR FROM ends_at) * 60 + EXTRACT(MINUTE FROM ends_at))::integer
+    ) END
+) STORED;
+CREATE INDEX data_break_minutes_of_week_gist ON data_break USING gist (minutes_of_week);
+
+-- Raise if a span would clash with one of the year group's other slots or breaks
+CREATE FUNCTION data_raise_if_year_group_clash(
+    p_year_group_id bigint, p_span int4range, p_slot_id bigint, p_break_id bigint
+) RETURNS void AS $$
+BEGIN
+    IF p_span IS NULL THEN
+        RETURN;
+    END IF;
+    -- Serialise the checks for each year group, so that each sees the others' committed changes.
+    -- The two int4 key form namespaces the lock, so the (bigint) pk is folded into an int4.
+    PERFORM pg_advisory_xact_lock(
+        hashtext('data_year_group_clash'), (p_year_group_id % 2147483648)::integer
+    );
+    IF EXISTS (
+        SELECT 1
+        FROM (
+            SELECT slot.minutes_of_week AS span
+            FROM data_timetableslot slot
+            JOIN data_timetableslot_relevant_year_groups relevant
+            ON relevant.timetableslot_id = slot.id
+            WHERE relevant.yeargroup_id = p_year_group_id
+            AND slot.id IS DISTINCT FROM p_slot_id
+            AND slot.minutes_of_week && p_span
+            UNION ALL
+            SELECT break_.minutes_of_week AS span
+            FROM data_break break_
+            JOIN data_break_relevant_year_groups relevant
+            ON relevant.break_id = break_.id
+            WHERE relevant.yeargroup_id = p_year_group_id
+            AND break_.id IS DISTINCT FROM p_break_id
+            AND break_.minutes_of_week && p_span
+        ) candidate
+        WHERE (lower(candidate.span) < lower(p_span) AND upper(candidate.span) > lower(p_span))
+        OR (lower(candidate.span) < upper(p_span) AND upper(candidate.span) > upper(p_span))
+        OR lower(candidate.span) = lower(p_span)
+        OR upper(candidate.span) = upper(p_span)
+    ) THEN
+        RAISE EXCLUSION_VIOLATION USING MESSAGE = format(
+            'Year group %s already has a slot or break clashing with this time.', p_year_group_id
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION data_check_slot_year_group_clashes() RETURNS trigger AS $$
+DECLARE
+    year_group_id bigint;
+BEGIN
+    IF TG_TABLE_NAME = 'data_timetableslot_relevant_year_groups' THEN
+        PERFORM data_raise_if_year_group_clash(
+            NEW.yeargroup_id,
+            (SELECT minutes_of_week FROM data_timetableslot WHERE id = NEW.timetableslot_id),
+            NEW.timetableslot_id,
+            NULL
+        );
+    ELSE
+        FOR year_group_id IN
+            SELECT yeargroup_id FROM data_timetableslot_relevant_year_groups WHERE timetableslot_id = NEW.id
+        LOOP
+            PERFORM data_raise_if_year_group_clash(year_group_id, NEW.minutes_of_week, NEW.id, NULL);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION data_check_break_year_group_clashes() RETURNS trigger AS $$
+DECLARE
+    year_group_id bigint;
+BEGIN
+    IF TG_TABLE_NAME = 'data_break_relevant_year_groups' THEN
+        PERFORM data_raise_if_year_group_clash(
+            NEW.yeargroup_id,
+            (SELECT minutes_of_week FROM data_break WHERE id = NEW.break_id),
+            NULL,
+            NEW.break_id
+        );
+    ELSE
+        FOR year_group_id IN
+            SELECT yeargroup_id FROM data_break_relevant_year_groups WHERE break_id = NEW.id
+        LOOP
+            PERFORM data_raise_if_year_group_clash(year_group_id, NEW.minutes_of_week, NULL, NEW.id);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER data_timetableslot_year_groups_clash
+AFTER INSERT ON data_timetableslot_relevant_year_groups
+FOR EACH ROW EXECUTE FUNCTION data_check_slot_year_group_clashes();
+
+CREATE TRIGGER data_timetableslot_timings_clash
+AFTER UPDATE OF day_of_week, starts_at, ends_at ON data_timetableslot
+FOR EACH ROW EXECUTE FUNCTION data_check_slot_year_group_clashes();
+
+CREATE TRIGGER data_break_year_groups_clash
+AFTER INSERT ON data_break_relevant_year_groups
+FOR EACH ROW EXECUTE FUNCTION data_check_break_year_group_clashes();
+
+CREATE TRIGGER data_break_timings_clash
+AFTER UPDATE OF day_of_week, starts_at, ends_at ON data_break
+FOR EACH ROW EXECUTE FUNCTION data_check_break_year_group_clashes();
+"""
+
+BACKWARDS_SQL = """
+DROP TRIGGER data_break_timings_clash ON data_break;
+DROP TRIGGER data_break_year_groups_clash ON data_break_relevant_year_groups;
+DROP TRIGGER data_timetableslot_timings_clash ON data_timetableslot;
+DROP TRIGGER data_timetableslot_year_groups_clash ON data_timetableslot_relevant_year_groups;
+DROP FUNCTION data_check_break_year_group_clashes();
+DROP FUNCTION data_check_slot_year_group_clashes();
+DROP FUNCTION data_raise_if_year_group_clash(bigint, int4range, bigint, bigint);
+ALTER TABLE data_break DROP COLUMN minutes_of_week;
+ALTER TABLE data_timetableslot DROP COLUMN minutes_of_week;
+"""
+
+
+def run_on_postgres(sql: str) -> Callable[[Apps, BaseDatabaseSchemaEditor], None]:
+    """
+    Get a migration function running the given SQL, on Postgres only.
+    """
+
+    def run(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(sql, params=None)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0005_solver_run_constraint_families"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_postgres(FORWARDS_SQL), run_on_postgres(BACKWARDS_SQL)
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2 on 2026-10-18 22:48
+
+"""
+Add composite indexes for the clash filters on slots and breaks, and for joining the many-to-many tables from their
+second model (e.g. from a slot to its lessons). The unique constraints on the many-to-many tables already cover
+joining from their first model.
+"""
+
+# Django imports
+from django.db import migrations, models
+
+# The many-to-many tables are created by django, so only have indexes as raw SQL (table, index name, columns)
+THROUGH_TABLE_INDEXES = [
+    ("data_lesson_pupils", "lesson_pupils_pupil_lesson", "pupil_id, lesson_id"),
+    (
+        "data_lesson_user_defined_time_slots",
+        "lesson_user_slots_slot_lesson",
+        "timetableslot_id, lesson_id",
+    ),
+    (
+        "data_lesson_solver_defined_time_slots",
+        "lesson_solver_slots_slot_lesson",
+        "timetableslot_id, lesson_id",
+    ),
+    (
+        "data_timetableslot_relevant_year_groups",
+        "slot_year_groups_year_group_slot",
+        "yeargroup_id, timetableslot_id",
+    ),
+    (
+        "data_break_relevant_year_groups",
+        "break_year_groups_year_group_break",
+        "yeargroup_id, break_id",
+    ),
+    ("data_break_teachers", "break_teachers_teacher_break", "teacher_id, break_id"),
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0006_year_group_time_of_week_spans"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="break",
+            index=models.Index(
+                fields=["school", "day_of_week", "starts_at", "ends_at"],
+                name="break_school_time_of_week",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="timetableslot",
+            index=models.Index(
+                fields=["school", "day_of_week", "starts_at", "ends_at"],
+                name="slot_school_time_of_week",
+            ),
+        ),
+    ] + [
+        migrations.RunSQL(
+            sql=f"CREATE INDEX {name} ON {table} ({columns});",
+            reverse_sql=f"DROP INDEX {name};",
+        )
+        for table, name, columns in THROUGH_TABLE_INDEXES
+    ]
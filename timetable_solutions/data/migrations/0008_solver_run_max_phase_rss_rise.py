@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 10:12
+
+# Django imports
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0007_clash_and_through_table_indexes"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="solverrun",
+            old_name="peak_rss_kb",
+            new_name="max_phase_rss_rise_kb",
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-19 10:41
+
+# Django imports
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("data", "0008_solver_run_max_phase_rss_rise"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solverrun",
+            name="outcome",
+            field=models.CharField(
+                choices=[
+                    ("SAVED", "Saved"),
+                    ("INVALID_INPUTS", "Invalid Inputs"),
+                    ("INFEASIBLE", "Infeasible"),
+                    ("DATA_CHANGED", "Data Changed"),
+                ],
+                default="SAVED",
+                max_length=20,
+            ),
+        ),
+    ]
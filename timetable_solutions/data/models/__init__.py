@@ -15,6 +15,12 @@ from .exceptions import SchoolMismatchError
 from .lesson import Lesson, LessonQuerySet
 from .pupil import Pupil, PupilQuerySet
 from .school import School, SchoolQuerySet
+from .solution_candidate import (
+    SolutionCandidate,
+    SolutionCandidateAssignment,
+    SolutionCandidateQuerySet,
+)
+from .solver_run import SolverRun, SolverRunQuerySet
 from .teacher import Teacher, TeacherQuerySet
 from .timetable_slot import TimetableSlot, TimetableSlotQuerySet
 from .user_profile import Profile, ProfileQuerySet
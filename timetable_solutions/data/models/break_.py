@@ -6,7 +6,7 @@ Module defining the model for a SchoolClass, and its manager.
 import datetime as dt
 
 # Django imports
-from django.db import models
+from django.db import models, transaction
 
 # Local application imports
 from data import constants
@@ -71,6 +71,13 @@ class Break(models.Model):
                 name="break_ends_after_it_starts",
             ),
         ]
+        indexes = [
+            # For filtering a school's items for clashes, by day of week and time
+            models.Index(
+                fields=["school", "day_of_week", "starts_at", "ends_at"],
+                name="break_school_time_of_week",
+            ),
+        ]
 
     class Constant:
         """
@@ -97,6 +104,7 @@ class Break(models.Model):
     # --------------------
 
     @classmethod
+    @transaction.atomic
     def create_new(
         cls,
         school_id: int,
@@ -110,6 +118,7 @@ class Break(models.Model):
     ) -> "Break":
         """
         Method for creating a new Break instance in the db.
+        This is atomic, so the break is not left behind if e.g. its year groups are rejected by the db.
         """
         break_ = cls.objects.create(
             school_id=school_id,
@@ -132,7 +141,8 @@ class Break(models.Model):
     def delete_all_breaks_for_school(cls, school_id: int) -> tuple:
         """Method deleting all entries for a school in the Break table"""
         breaks = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = breaks.delete()
+        with School.coalesce_data_version_increments():
+            outcome = breaks.delete()
         return outcome
 
     # --------------------
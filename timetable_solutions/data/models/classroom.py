@@ -99,7 +99,8 @@ class Classroom(models.Model):
         Method to delete all the Classroom instances associated with a particular school
         """
         instances = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = instances.delete()
+        with School.coalesce_data_version_increments():
+            outcome = instances.delete()
         return outcome
 
     # --------------------
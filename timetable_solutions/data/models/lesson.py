@@ -174,15 +174,26 @@ class Lesson(models.Model):
     def delete_all_lessons_for_school(cls, school_id: int) -> tuple:
         """Method deleting all entries for a school in the Lesson table"""
         lessons = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = lessons.delete()
+        with School.coalesce_data_version_increments():
+            outcome = lessons.delete()
         return outcome
 
     @classmethod
-    def delete_solver_solution_for_school(cls, school_id: int) -> None:
-        """Method deleting all associations in the solver_defined_time_slots field, of a school's Lessons"""
-        lessons = cls.objects.get_all_instances_for_school(school_id=school_id)
-        for lesson in lessons:
-            lesson.solver_defined_time_slots.clear()
+    def delete_solver_solution_for_school(
+        cls, school_id: int, lesson_ids: list[str] | None = None
+    ) -> None:
+        """
+        Method deleting all associations in the solver_defined_time_slots field, of a school's Lessons.
+        This is a single DELETE on the through table, rather than one per lesson.
+        :param lesson_ids: if given, only the solution for these lessons is deleted.
+        """
+        solver_slots = cls.solver_defined_time_slots.through.objects.filter(
+            lesson__school_id=school_id
+        )
+        if lesson_ids is not None:
+            solver_slots = solver_slots.filter(lesson__lesson_id__in=lesson_ids)
+        solver_slots.delete()
+        School.increment_data_version(school_id=school_id)
 
     # --------------------
     # Mutators
@@ -263,6 +274,42 @@ class Lesson(models.Model):
             )
         self.user_defined_time_slots.add(*time_slots)
 
+    @classmethod
+    def bulk_add_solver_defined_time_slots(
+        cls, school_id: int, time_slot_pks_by_lesson_pk: dict[int, list[int]]
+    ) -> None:
+        """
+        Add the solver-generated solution slots for many of a school's lessons, with a single insert.
+        :param time_slot_pks_by_lesson_pk: the primary keys of the slots to add to each lesson, by lesson primary key.
+        """
+        user_defined_pairs = set(
+            cls.user_defined_time_slots.through.objects.filter(
+                lesson_id__in=time_slot_pks_by_lesson_pk.keys()
+            ).values_list("lesson_id", "timetableslot_id")
+        )
+        solver_defined_pairs = [
+            (lesson_pk, slot_pk)
+            for lesson_pk, slot_pks in time_slot_pks_by_lesson_pk.items()
+            for slot_pk in slot_pks
+        ]
+        if intersection := [
+            pair for pair in solver_defined_pairs if pair in user_defined_pairs
+        ]:
+            raise IntegrityError(
+                f"Tried to set (lesson, slot) pairs: {intersection} that appear in user defined slots "
+                "as solver defined!"
+            )
+
+        through_model = cls.solver_defined_time_slots.through
+        through_model.objects.bulk_create(
+            [
+                through_model(lesson_id=lesson_pk, timetableslot_id=slot_pk)
+                for lesson_pk, slot_pk in solver_defined_pairs
+            ],
+            ignore_conflicts=True,  # Consistent with .add(), which skips existing pairs
+        )
+        School.increment_data_version(school_id=school_id)
+
     def add_solver_defined_time_slots(self, time_slots: TimetableSlotQuerySet) -> None:
         """
         Add the solver-generated solution slots for this lesson.
@@ -104,7 +104,8 @@ class Pupil(models.Model):
         Method to delete all the Pupil instances associated with a particular school
         """
         instances = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = instances.delete()
+        with School.coalesce_data_version_increments():
+            outcome = instances.delete()
         return outcome
 
     # --------------------
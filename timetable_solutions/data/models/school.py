@@ -1,8 +1,18 @@
 """Module defining the model for a school_id in the database, and any ancillary objects"""
 
+# Standard library imports
+import contextlib
+import contextvars
+from collections.abc import Iterator
 
 # Django imports
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+
+# The schools whose data version is due to be incremented, when inside coalesce_data_version_increments
+_pending_data_version_increments: contextvars.ContextVar[
+    set[int] | None
+] = contextvars.ContextVar("pending_data_version_increments", default=None)
 
 
 class SchoolQuerySet(models.QuerySet):
@@ -21,6 +31,9 @@ class School(models.Model):
     school_access_key = models.AutoField(primary_key=True)
     school_name = models.CharField(max_length=50)
 
+    # Incremented whenever any of the school's timetabling data changes
+    data_version = models.PositiveIntegerField(default=0)
+
     # Introduce a custom manager
     objects = SchoolQuerySet.as_manager()
 
@@ -45,6 +58,48 @@ class School(models.Model):
         school.full_clean()
         return school
 
+    # --------------------
+    # Mutators
+    # --------------------
+
+    @classmethod
+    def increment_data_version(cls, school_id: int) -> None:
+        """
+        Method recording that some of a school's timetabling data has changed.
+        The increment is done in the database, so that concurrent changes are all counted.
+        Inside coalesce_data_version_increments, the increment is deferred to the end of the block.
+        """
+        if (pending := _pending_data_version_increments.get()) is not None:
+            pending.add(school_id)
+            return
+        cls.objects.filter(school_access_key=school_id).update(
+            data_version=F("data_version") + 1
+        )
+
+    @classmethod
+    @contextlib.contextmanager
+    def coalesce_data_version_increments(cls) -> Iterator[None]:
+        """
+        Run a block of changes in a transaction, incrementing each changed school's data version once at the end,
+        rather than once per change.
+        Nested blocks leave the increments to the outermost block.
+        """
+        if _pending_data_version_increments.get() is not None:
+            yield
+            return
+
+        pending: set[int] = set()
+        with transaction.atomic():
+            token = _pending_data_version_increments.set(pending)
+            try:
+                yield
+            finally:
+                _pending_data_version_increments.reset(token)
+            if pending:
+                cls.objects.filter(school_access_key__in=pending).update(
+                    data_version=F("data_version") + 1
+                )
+
     # --------------------
     # Properties tests
     # --------------------
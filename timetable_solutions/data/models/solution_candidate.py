@@ -0,0 +1,184 @@
+"""
+Module defining the model for a candidate timetable solution, and any ancillary objects.
+"""
+
+# Standard library imports
+from collections.abc import Iterable
+
+# Django imports
+from django.db import models
+
+# Local application imports
+from data.models.lesson import Lesson
+from data.models.school import School
+from data.models.timetable_slot import TimetableSlot
+
+
+class SolutionCandidateQuerySet(models.QuerySet):
+    """
+    Custom queryset manager for the SolutionCandidate model
+    """
+
+    def get_all_instances_for_school(
+        self, school_id: int
+    ) -> "SolutionCandidateQuerySet":
+        """Method returning the queryset of solution candidates found for the given school"""
+        return self.filter(school_id=school_id)
+
+    def get_individual_candidate(
+        self, school_id: int, candidate_number: int
+    ) -> "SolutionCandidate":
+        """Method returning an individual SolutionCandidate"""
+        return self.get(
+            models.Q(school_id=school_id) & models.Q(candidate_number=candidate_number)
+        )
+
+
+class SolutionCandidate(models.Model):
+    """
+    Model representing one of several alternative timetable solutions found in a single run of the solver.
+
+    A candidate stores its (lesson, slot) assignments separately to the solver_defined_time_slots
+    on each Lesson, so that it can be previewed, and then promoted to be the school's timetable.
+    """
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE)
+    candidate_number = models.PositiveSmallIntegerField()
+    objective_value = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    # Introduce a custom manager
+    objects = SolutionCandidateQuerySet.as_manager()
+
+    class Meta:
+        """
+        Django Meta class for the SolutionCandidate model
+        """
+
+        constraints = [
+            models.UniqueConstraint(
+                "school",
+                "candidate_number",
+                name="candidate_number_unique_for_school",
+            ),
+        ]
+        ordering = ["candidate_number"]
+
+    class Constant:
+        """
+        Additional constants to store about the SolutionCandidate model (that aren't an option in Meta)
+        """
+
+        human_string_singular = "solution candidate"
+        human_string_plural = "solution candidates"
+
+    def __str__(self) -> str:
+        """String representation of the model for the django admin site"""
+        return f"Candidate {self.candidate_number}"
+
+    def __repr__(self) -> str:
+        """String representation of the model for debugging"""
+        return f"{self.school}: candidate {self.candidate_number}"
+
+    # --------------------
+    # Factories
+    # --------------------
+
+    @classmethod
+    def create_new(
+        cls,
+        school_id: int,
+        candidate_number: int,
+        assignments: Iterable[tuple[Lesson, TimetableSlot]],
+        objective_value: float | None = None,
+    ) -> "SolutionCandidate":
+        """
+        Create a new SolutionCandidate instance, along with all of its (lesson, slot) assignments.
+        """
+        candidate = cls.objects.create(
+            school_id=school_id,
+            candidate_number=candidate_number,
+            objective_value=objective_value,
+        )
+        SolutionCandidateAssignment.objects.bulk_create(
+            [
+                SolutionCandidateAssignment(
+                    candidate=candidate, lesson=lesson, slot=slot
+                )
+                for lesson, slot in assignments
+            ]
+        )
+        return candidate
+
+    @classmethod
+    def delete_all_candidates_for_school(cls, school_id: int) -> tuple:
+        """Method deleting all of a school's solution candidates"""
+        candidates = cls.objects.get_all_instances_for_school(school_id=school_id)
+        outcome = candidates.delete()
+        return outcome
+
+    # --------------------
+    # Mutators
+    # --------------------
+
+    @School.coalesce_data_version_increments()
+    def promote(self) -> None:
+        """
+        Make this candidate the school's timetable solution.
+
+        The solver_defined_time_slots of all the school's lessons are replaced with
+        the assignments stored on this candidate.
+        """
+        Lesson.delete_solver_solution_for_school(school_id=self.school_id)
+        slot_pks_by_lesson_pk: dict[int, list[int]] = {}
+        for lesson_pk, slot_pk in self.assignments.values_list("lesson_id", "slot_id"):
+            slot_pks_by_lesson_pk.setdefault(lesson_pk, []).append(slot_pk)
+        Lesson.bulk_add_solver_defined_time_slots(
+            school_id=self.school_id, time_slot_pks_by_lesson_pk=slot_pks_by_lesson_pk
+        )
+
+    # --------------------
+    # Queries
+    # --------------------
+
+    def get_lesson_slots(self) -> dict[Lesson, list[TimetableSlot]]:
+        """
+        Get the slots assigned to each lesson in this candidate, ordered by time of week.
+        """
+        assignments = self.assignments.select_related("lesson", "slot").order_by(
+            "lesson__lesson_id", "slot__day_of_week", "slot__starts_at"
+        )
+        lesson_slots: dict[Lesson, list[TimetableSlot]] = {}
+        for assignment in assignments:
+            lesson_slots.setdefault(assignment.lesson, []).append(assignment.slot)
+        return lesson_slots
+
+
+class SolutionCandidateAssignment(models.Model):
+    """
+    A single (lesson, slot) pair forming part of a SolutionCandidate.
+    """
+
+    candidate = models.ForeignKey(
+        SolutionCandidate, on_delete=models.CASCADE, related_name="assignments"
+    )
+    lesson = models.ForeignKey(
+        Lesson, on_delete=models.CASCADE, related_name="candidate_assignments"
+    )
+    slot = models.ForeignKey(
+        TimetableSlot, on_delete=models.CASCADE, related_name="candidate_assignments"
+    )
+
+    class Meta:
+        """
+        Django Meta class for the SolutionCandidateAssignment model
+        """
+
+        constraints = [
+            models.UniqueConstraint(
+                "candidate",
+                "lesson",
+                "slot",
+                name="lesson_slot_unique_for_candidate",
+            ),
+        ]
@@ -0,0 +1,122 @@
+"""
+Module defining the model for a record of a single run of the solver.
+"""
+
+# Django imports
+from django.db import models
+
+# Local application imports
+from data import constants
+from data.models.school import School
+
+
+class SolverRunQuerySet(models.QuerySet):
+    """
+    Custom queryset manager for the SolverRun model
+    """
+
+    def get_all_instances_for_school(self, school_id: int) -> "SolverRunQuerySet":
+        """Method returning the queryset of solver runs for the given school"""
+        return self.filter(school_id=school_id)
+
+
+class SolverRun(models.Model):
+    """
+    Model recording the resources used by a single run of the solver, and the size of the problem it solved.
+
+    The phases are stored as a list of {"name", "wall_time_seconds", "peak_rss_kb", "child_peak_rss_kb"}
+    dictionaries, in the order the phases happened (see PhaseRecord). The peak RSS is a high-water mark over the
+    life of the process, so each phase records how much it raised it, and max_phase_rss_rise_kb is the largest rise
+    of any phase, in this process or its children.
+
+    Runs that end before the problem is solved (e.g. since its inputs were invalid) are recorded with an outcome
+    saying why, a problem size of 0 and the status of an unsolved problem.
+
+    The constraint families are stored similarly, as a list of {"name", "number_of_variables",
+    "number_of_constraints", "number_of_nonzeros", "wall_time_seconds"} dictionaries.
+    """
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    phases = models.JSONField(default=list)
+    total_wall_time_seconds = models.FloatField()
+    max_phase_rss_rise_kb = models.PositiveIntegerField()
+    number_of_variables = models.PositiveIntegerField()
+    number_of_constraints = models.PositiveIntegerField()
+    number_of_nonzeros = models.PositiveIntegerField()
+    constraint_families = models.JSONField(default=list)
+    solver_status = models.CharField(max_length=20)
+    outcome = models.CharField(
+        max_length=20,
+        choices=constants.SolverRunOutcome.choices,
+        default=constants.SolverRunOutcome.SAVED,
+    )
+
+    # Introduce a custom manager
+    objects = SolverRunQuerySet.as_manager()
+
+    class Meta:
+        """
+        Django Meta class for the SolverRun model
+        """
+
+        ordering = ["-created_at"]
+
+    class Constant:
+        """
+        Additional constants to store about the SolverRun model (that aren't an option in Meta)
+        """
+
+        human_string_singular = "solver run"
+        human_string_plural = "solver runs"
+
+    def __str__(self) -> str:
+        """String representation of the model for the django admin site"""
+        return f"Solver run at {self.created_at:%Y-%m-%d %H:%M}"
+
+    def __repr__(self) -> str:
+        """String representation of the model for debugging"""
+        return f"{self.school}: solver run {self.pk} ({self.solver_status})"
+
+    # --------------------
+    # Factories
+    # --------------------
+
+    @classmethod
+    def create_new(
+        cls,
+        school_id: int,
+        phases: list[dict[str, str | float | int]],
+        number_of_variables: int,
+        number_of_constraints: int,
+        number_of_nonzeros: int,
+        solver_status: str,
+        constraint_families: list[dict[str, str | float | int]] | None = None,
+        outcome: str = constants.SolverRunOutcome.SAVED,
+    ) -> "SolverRun":
+        """
+        Create a new SolverRun instance, summarising the resources used across its phases.
+        """
+        return cls.objects.create(
+            school_id=school_id,
+            phases=phases,
+            total_wall_time_seconds=sum(
+                float(phase["wall_time_seconds"]) for phase in phases
+            ),
+            max_phase_rss_rise_kb=max(
+                (
+                    max(
+                        int(phase["peak_rss_kb"]),
+                        int(phase.get("child_peak_rss_kb", 0)),
+                    )
+                    for phase in phases
+                ),
+                default=0,
+            ),
+            number_of_variables=number_of_variables,
+            number_of_constraints=number_of_constraints,
+            number_of_nonzeros=number_of_nonzeros,
+            constraint_families=constraint_families or [],
+            solver_status=solver_status,
+            outcome=outcome,
+        )
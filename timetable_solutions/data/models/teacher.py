@@ -112,7 +112,8 @@ class Teacher(models.Model):
         Note this will only work if all referencing Lessons have first been deleted.
         """
         instances = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = instances.delete()
+        with School.coalesce_data_version_increments():
+            outcome = instances.delete()
         return outcome
 
     # --------------------
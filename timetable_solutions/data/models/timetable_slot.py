@@ -6,7 +6,7 @@ import datetime as dt
 from typing import TYPE_CHECKING
 
 # Django imports
-from django.db import models
+from django.db import models, transaction
 
 # Local application imports
 from data import constants
@@ -81,6 +81,13 @@ class TimetableSlot(models.Model):
                 name="slot_ends_after_it_starts",
             ),
         ]
+        indexes = [
+            # For filtering a school's items for clashes, by day of week and time
+            models.Index(
+                fields=["school", "day_of_week", "starts_at", "ends_at"],
+                name="slot_school_time_of_week",
+            ),
+        ]
         ordering = ["day_of_week", "starts_at"]
 
     class Constant:
@@ -111,6 +118,7 @@ class TimetableSlot(models.Model):
     # --------------------
 
     @classmethod
+    @transaction.atomic
     def create_new(
         cls,
         school_id: int,
@@ -122,6 +130,7 @@ class TimetableSlot(models.Model):
     ) -> "TimetableSlot":
         """
         Create a new TimetableSlot instance.
+        This is atomic, so the slot is not left behind if e.g. its year groups are rejected by the db.
         """
         slot = cls.objects.create(
             school_id=school_id,
@@ -141,7 +150,8 @@ class TimetableSlot(models.Model):
         Method to delete all the TimetableSlot instances associated with a particular school
         """
         instances = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = instances.delete()
+        with School.coalesce_data_version_increments():
+            outcome = instances.delete()
         return outcome
 
     # --------------------
@@ -213,8 +223,18 @@ class TimetableSlot(models.Model):
     def get_all_lessons(self) -> "lesson.LessonQuerySet":
         """
         Get all the lessons this slot is in use for
+        The lessons are found from each many-to-many table by index lookups, rather than joining both to the lessons.
         """
-        return self.user_lessons.all() | self.solver_lessons.all()
+        user_lessons = self.user_lessons.through.objects.filter(
+            timetableslot_id=self.pk
+        )
+        solver_lessons = self.solver_lessons.through.objects.filter(
+            timetableslot_id=self.pk
+        )
+        return self.user_lessons.model.objects.filter(
+            models.Q(pk__in=user_lessons.values("lesson_id"))
+            | models.Q(pk__in=solver_lessons.values("lesson_id"))
+        )
 
     def check_if_slots_are_consecutive(self, other_slot: "TimetableSlot") -> bool:
         """
@@ -123,7 +123,8 @@ class YearGroup(models.Model):
     def delete_all_instances_for_school(cls, school_id: int) -> tuple:
         """Method deleting all entries for a school in the YearGroup table"""
         year_groups = cls.objects.get_all_instances_for_school(school_id=school_id)
-        outcome = year_groups.delete()
+        with School.coalesce_data_version_increments():
+            outcome = year_groups.delete()
         return outcome
 
     # --------------------
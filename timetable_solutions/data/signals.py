@@ -0,0 +1,71 @@
+"""
+Signal receivers keeping each school's data version up to date.
+
+The data version lets long-running processes (such as the solver) check whether a school's data
+has changed since they read it, without comparing the data itself.
+"""
+
+# Standard library imports
+from typing import Any
+
+# Django imports
+from django.db import models as django_models
+from django.db.models import signals
+
+# Local application imports
+from data import models
+
+# Models that the solver reads when producing a school's timetable
+_SOLVER_INPUT_MODELS: list[type[django_models.Model]] = [
+    models.YearGroup,
+    models.Pupil,
+    models.Teacher,
+    models.Classroom,
+    models.TimetableSlot,
+    models.Break,
+    models.Lesson,
+]
+
+# Many-to-many relationships between the solver input models.
+# Note that the solver's own solution (Lesson.solver_defined_time_slots) is not included.
+_SOLVER_INPUT_RELATIONSHIPS: list[type[django_models.Model]] = [
+    models.Lesson.pupils.through,
+    models.Lesson.user_defined_time_slots.through,
+    models.TimetableSlot.relevant_year_groups.through,
+    models.Break.teachers.through,
+    models.Break.relevant_year_groups.through,
+]
+
+
+def increment_data_version_on_change(
+    sender: type[django_models.Model], instance: Any, **kwargs: Any
+) -> None:
+    """
+    Receiver for when an instance of a solver input model is saved or deleted.
+    """
+    models.School.increment_data_version(school_id=instance.school_id)
+
+
+def increment_data_version_on_relationship_change(
+    sender: type[django_models.Model], instance: Any, action: str, **kwargs: Any
+) -> None:
+    """
+    Receiver for when a many-to-many relationship between solver input models changes.
+    The instance may be on either side of the relationship, but both sides always belong to the same school.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        models.School.increment_data_version(school_id=instance.school_id)
+
+
+def connect_signals() -> None:
+    """
+    Connect the receivers above to every solver input model and relationship.
+    """
+    for model in _SOLVER_INPUT_MODELS:
+        signals.post_save.connect(increment_data_version_on_change, sender=model)
+        signals.post_delete.connect(increment_data_version_on_change, sender=model)
+
+    for through_model in _SOLVER_INPUT_RELATIONSHIPS:
+        signals.m2m_changed.connect(
+            increment_data_version_on_relationship_change, sender=through_model
+        )
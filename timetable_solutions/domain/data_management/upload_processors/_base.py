@@ -17,7 +17,6 @@ from dateutil import parser as dateutil_parser  # type: ignore
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.db import models as django_models
-from django.db import transaction
 
 # Local application imports
 from data import models
@@ -130,7 +129,7 @@ class BaseFileUploadProcessor(Generic[_Model]):
         )
         if create_new_dict_list is not None:
             try:
-                with transaction.atomic():
+                with models.School.coalesce_data_version_increments():
                     for n, create_new_dict in enumerate(create_new_dict_list):
                         self.create_new(create_new_dict)
 
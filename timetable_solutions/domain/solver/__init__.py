@@ -7,5 +7,6 @@ from .linear_programming.solver_variables import (
     var_key,
 )
 from .run_solver import produce_timetable_solutions
+from .solution_pool import TimetableSolutionPool
 from .solver_input_data import SolutionSpecification, TimetableSolverInputs
 from .solver_output_data import TimetableSolverOutcome
@@ -0,0 +1,336 @@
+"""
+Fast checks for timetabling problems that cannot possibly be solved, run before the problem is formulated.
+
+Each check compares how many slots some lesson, teacher, classroom or pupil needs against an upper bound on how many
+slots it could be given, without clashing. The bounds are implied by the solver's constraints, so a problem is only
+ever rejected when the solver would have found it infeasible - but without the solver spending minutes proving it.
+"""
+
+# Standard library imports
+import datetime as dt
+
+# Third party imports
+import numpy as np
+
+# Local application imports
+from data import models
+from domain.solver.filters import clashes
+from domain.solver.solver_input_data import TimetableSolverInputs
+
+
+def check_feasibility(inputs: TimetableSolverInputs) -> list[str]:
+    """
+    Get an error message for each capacity bound the school's data breaks.
+    :return: an empty list if the timetabling problem could be feasible.
+    """
+    return FeasibilityAnalyser(inputs=inputs).get_error_messages()
+
+
+class FeasibilityAnalyser:
+    """
+    Class computing capacity bounds for a school's timetabling problem, with NumPy arrays over its bulk-loaded inputs.
+
+    The arrays are indexed by lessons requiring solving (L), all of the school's lessons (A), slots (S),
+    year groups (G), breaks (B), teachers (T), classrooms (C) and pupils (P).
+    """
+
+    def __init__(self, inputs: TimetableSolverInputs):
+        self._inputs = inputs
+        self._lessons = list(inputs.lessons)
+        self._slots = list(inputs.timetable_slots)
+        self._teachers = list(inputs.teachers)
+        self._classrooms = list(inputs.classrooms)
+        self._pupils = list(inputs.pupils)
+
+        self._slot_days = np.array([slot.day_of_week for slot in self._slots])
+        self._slot_starts = np.array([_minutes(slot.starts_at) for slot in self._slots])
+        self._slot_ends = np.array([_minutes(slot.ends_at) for slot in self._slots])
+        # Slots ordered by when they end, for finding the most slots that don't overlap
+        self._slots_by_end = np.lexsort((self._slot_ends, self._slot_days))
+        self._max_non_overlapping_cache: dict[bytes, int] = {}
+
+        self._load_arrays()
+
+    def get_error_messages(self) -> list[str]:
+        """
+        Run the capacity checks on the school's data.
+
+        A lesson that can't be scheduled also tends to break the bounds of its teacher, classroom and pupils,
+        so these are only checked once every lesson could be scheduled on its own.
+        """
+        if lesson_errors := [*self._check_lessons(), *self._check_double_periods()]:
+            return lesson_errors
+        return [
+            *self._check_teachers(),
+            *self._check_classrooms(),
+            *self._check_pupils(),
+        ]
+
+    # --------------------
+    # Capacity checks
+    # --------------------
+
+    def _check_lessons(self) -> list[str]:
+        """
+        Each lesson needs at least as many available slots as it has slots left to be scheduled.
+        """
+        n_available = self._candidate_slots.sum(axis=1)
+        return [
+            f"Lesson: {self._lessons[index]} requires {self._required_slots[index]} more slot(s), "
+            f"but only {n_available[index]} slot(s) are available to it.\n"
+            "Please amend your data!"
+            for index in np.flatnonzero(self._required_slots > n_available)
+        ]
+
+    def _check_double_periods(self) -> list[str]:
+        """
+        Each lesson needs at least as many pairs of consecutive slots as it has double periods left to be scheduled.
+        """
+        error_messages = []
+        adjacency = self._inputs.slot_adjacency
+        for lesson in self._lessons:
+            if lesson.total_required_double_periods == 0:
+                continue
+            if adjacency.get_year_group_pk(lesson=lesson) is None:
+                continue  # The lesson cannot be scheduled at all, which is reported above
+            n_required = adjacency.get_n_solver_double_periods_required(lesson=lesson)
+            n_available = len(adjacency.get_consecutive_slots_for_lesson(lesson=lesson))
+            if n_required > n_available:
+                error_messages.append(
+                    f"Lesson: {lesson} requires {n_required} more double period(s), "
+                    f"but only {n_available} pair(s) of consecutive slots are available to it.\n"
+                    "Please amend your data!"
+                )
+        return error_messages
+
+    def _check_teachers(self) -> list[str]:
+        """
+        A teacher can't teach at two overlapping slots, so can teach at most as many slots as there are
+        non-overlapping slots available to their lessons.
+        """
+        n_required = self._teacher_lessons @ self._required_slots
+        usable_slots = (self._teacher_lessons @ self._candidate_slots) > 0
+        return [
+            f"Teacher: {self._teachers[index]} must teach {n_required[index]} more slot(s), "
+            f"but at most {capacity} of the slots available to their lessons can be taught without a clash.\n"
+            "Please amend your data!"
+            for index in np.flatnonzero(n_required)
+            if n_required[index]
+            > (capacity := self._get_max_non_overlapping(usable_slots[index]))
+        ]
+
+    def _check_classrooms(self) -> list[str]:
+        """
+        A classroom can't be used at two overlapping slots, so can host at most as many slots as there are
+        non-overlapping slots available to its lessons.
+        """
+        n_required = self._classroom_lessons @ self._required_slots
+        usable_slots = (self._classroom_lessons @ self._candidate_slots) > 0
+        return [
+            f"Classroom: {self._classrooms[index]} must host {n_required[index]} more slot(s), "
+            f"but at most {capacity} of the slots available to its lessons can be used without a clash.\n"
+            "Please amend your data!"
+            for index in np.flatnonzero(n_required)
+            if n_required[index]
+            > (capacity := self._get_max_non_overlapping(usable_slots[index]))
+        ]
+
+    def _check_pupils(self) -> list[str]:
+        """
+        A pupil can attend one lesson at each of their year group's slots, provided they aren't already busy
+        with a user defined lesson or a break. Slots outside their year group are not restricted.
+        """
+        n_required = self._pupil_lessons @ self._required_slots
+
+        # The slots each pupil is already busy at (P x S)
+        user_defined_slots = (
+            self._pupil_all_lessons @ self._all_lesson_user_defined_slots
+        ) > 0
+        pupil_breaks = self._year_group_breaks[self._pupil_year_groups]
+        busy = ((user_defined_slots.astype(int) @ self._slot_slot_clashes) > 0) | (
+            (pupil_breaks.astype(int) @ self._break_slot_clashes) > 0
+        )
+        year_group_slots = self._year_group_slots[self._pupil_year_groups]
+
+        # Slots in the pupil's year group can be used at most once across all their lessons
+        usable_slots = (self._pupil_lessons @ self._candidate_slots) > 0
+        capacity = (usable_slots & year_group_slots & ~busy).sum(axis=1)
+        # Other slots can be used by each of their lessons
+        candidate_slots = self._candidate_slots.astype(int)
+        n_candidates_outside_year_group = candidate_slots.sum(
+            axis=1, keepdims=True
+        ) - candidate_slots @ year_group_slots.T.astype(
+            int
+        )  # L x P
+        capacity += (self._pupil_lessons * n_candidates_outside_year_group.T).sum(
+            axis=1
+        )
+
+        return [
+            f"Pupil: {self._pupils[index]} must attend {n_required[index]} more slot(s), "
+            f"but is only free for {capacity[index]} of the slots available to their lessons.\n"
+            "Please amend your data!"
+            for index in np.flatnonzero(n_required > capacity)
+        ]
+
+    # --------------------
+    # Helper methods
+    # --------------------
+
+    def _get_max_non_overlapping(self, slot_mask: np.ndarray) -> int:
+        """
+        Get the largest number of the given slots that can be chosen without any two overlapping.
+
+        Choosing greedily by end time is optimal for intervals, and many entities share the same slots,
+        so the result is cached.
+        """
+        cache_key = slot_mask.tobytes()
+        if (cached := self._max_non_overlapping_cache.get(cache_key)) is not None:
+            return cached
+
+        count = 0
+        last_day = last_end = None
+        for index in self._slots_by_end[slot_mask[self._slots_by_end]]:
+            if (
+                self._slot_days[index] != last_day
+                or self._slot_starts[index] >= last_end
+            ):
+                count += 1
+                last_day = self._slot_days[index]
+                last_end = self._slot_ends[index]
+
+        self._max_non_overlapping_cache[cache_key] = count
+        return count
+
+    def _load_arrays(self) -> None:
+        """
+        Load the school's data into the arrays used by the capacity checks, with a query per relationship.
+        """
+        school_id = self._inputs.school_id
+        slot_index = {slot.pk: index for index, slot in enumerate(self._slots)}
+        lesson_index = {lesson.pk: index for index, lesson in enumerate(self._lessons)}
+        n_slots = len(self._slots)
+
+        # Year groups
+        year_group_pks = models.YearGroup.objects.get_all_instances_for_school(
+            school_id=school_id
+        ).values_list("pk", flat=True)
+        year_group_index = {pk: index for index, pk in enumerate(year_group_pks)}
+        self._year_group_slots = np.zeros((len(year_group_index), n_slots), dtype=bool)
+        slot_year_groups = models.TimetableSlot.relevant_year_groups.through.objects
+        for slot_pk, year_group_pk in slot_year_groups.filter(
+            timetableslot__school_id=school_id
+        ).values_list("timetableslot_id", "yeargroup_id"):
+            self._year_group_slots[
+                year_group_index[year_group_pk], slot_index[slot_pk]
+            ] = True
+
+        # User defined slots, of all the school's lessons (A x S)
+        user_defined_rows = list(
+            models.Lesson.user_defined_time_slots.through.objects.filter(
+                lesson__school_id=school_id
+            ).values_list("lesson_id", "timetableslot_id")
+        )
+        pupil_lesson_rows = list(
+            models.Lesson.pupils.through.objects.filter(
+                lesson__school_id=school_id
+            ).values_list("lesson_id", "pupil_id")
+        )
+        all_lesson_index: dict[int, int] = {}
+        for lesson_pk, _ in user_defined_rows + pupil_lesson_rows:
+            all_lesson_index.setdefault(lesson_pk, len(all_lesson_index))
+        self._all_lesson_user_defined_slots = np.zeros(
+            (len(all_lesson_index), n_slots), dtype=int
+        )
+        for lesson_pk, slot_pk in user_defined_rows:
+            self._all_lesson_user_defined_slots[
+                all_lesson_index[lesson_pk], slot_index[slot_pk]
+            ] = 1
+
+        # The slots each lesson requiring solving could be given, and how many it needs (L x S, L)
+        self._candidate_slots = np.zeros((len(self._lessons), n_slots), dtype=bool)
+        for index, lesson in enumerate(self._lessons):
+            year_group_pk = self._inputs.slot_adjacency.get_year_group_pk(lesson=lesson)
+            if year_group_pk is not None:
+                self._candidate_slots[index] = self._year_group_slots[
+                    year_group_index[year_group_pk]
+                ]
+        n_user_defined = np.zeros(len(self._lessons), dtype=int)
+        for lesson_pk, slot_pk in user_defined_rows:
+            if (input_index := lesson_index.get(lesson_pk)) is not None:
+                self._candidate_slots[input_index, slot_index[slot_pk]] = False
+                n_user_defined[input_index] += 1
+        self._required_slots = (
+            np.array(
+                [lesson.total_required_slots for lesson in self._lessons], dtype=int
+            )
+            - n_user_defined
+        )
+
+        # Teachers and classrooms (T x L, C x L)
+        teacher_index = {
+            teacher.pk: index for index, teacher in enumerate(self._teachers)
+        }
+        self._teacher_lessons = np.zeros(
+            (len(self._teachers), len(self._lessons)), dtype=int
+        )
+        classroom_index = {
+            classroom.pk: index for index, classroom in enumerate(self._classrooms)
+        }
+        self._classroom_lessons = np.zeros(
+            (len(self._classrooms), len(self._lessons)), dtype=int
+        )
+        for index, lesson in enumerate(self._lessons):
+            if lesson.teacher_id is not None:
+                self._teacher_lessons[teacher_index[lesson.teacher_id], index] = 1
+            if lesson.classroom_id is not None:
+                self._classroom_lessons[classroom_index[lesson.classroom_id], index] = 1
+
+        # Pupils (P x L, P x A, P)
+        pupil_index = {pupil.pk: index for index, pupil in enumerate(self._pupils)}
+        self._pupil_lessons = np.zeros(
+            (len(self._pupils), len(self._lessons)), dtype=int
+        )
+        self._pupil_all_lessons = np.zeros(
+            (len(self._pupils), len(all_lesson_index)), dtype=int
+        )
+        for lesson_pk, pupil_pk in pupil_lesson_rows:
+            self._pupil_all_lessons[
+                pupil_index[pupil_pk], all_lesson_index[lesson_pk]
+            ] = 1
+            if (input_index := lesson_index.get(lesson_pk)) is not None:
+                self._pupil_lessons[pupil_index[pupil_pk], input_index] = 1
+        self._pupil_year_groups = np.array(
+            [year_group_index[pupil.year_group_id] for pupil in self._pupils], dtype=int
+        )
+
+        # Breaks (G x B)
+        breaks = list(
+            models.Break.objects.get_all_instances_for_school(school_id=school_id)
+        )
+        break_index = {break_.pk: index for index, break_ in enumerate(breaks)}
+        self._year_group_breaks = np.zeros(
+            (len(year_group_index), len(breaks)), dtype=bool
+        )
+        break_year_groups = models.Break.relevant_year_groups.through.objects
+        for break_pk, year_group_pk in break_year_groups.filter(
+            break__school_id=school_id
+        ).values_list("break_id", "yeargroup_id"):
+            self._year_group_breaks[
+                year_group_index[year_group_pk], break_index[break_pk]
+            ] = True
+
+        # Which slots and breaks clash with each slot (S x S, B x S)
+        self._slot_slot_clashes = clashes.get_clash_matrix(
+            items=self._slots, times=self._slots
+        ).astype(int)
+        self._break_slot_clashes = clashes.get_clash_matrix(
+            items=breaks, times=self._slots
+        ).astype(int)
+
+
+def _minutes(time: dt.time) -> int:
+    """
+    Get the number of minutes since midnight, at the given time.
+    """
+    return time.hour * 60 + time.minute
@@ -5,19 +5,32 @@ For example:
  * A pupil / teacher / classroom cannot have lessons that occur at clashing slots
  * A year group cannot have 2 slots that overlap
  * A pupil / teacher / classroom can't be assigned two clashing breaks
+
+Clashes can be found either in the database, with filter_queryset_for_clashes, or in memory, by representing
+times as integer minutes since Monday 00:00 (see TimesOfWeek).
 """
 
 # Standard library imports
 import dataclasses
 import datetime as dt
 import typing
+from collections.abc import Iterable, Sequence
+
+# Third party imports
+import numpy as np
 
 # Django imports
+from django.db import connections
 from django.db import models as django_models
+from django.db.models import expressions
 
 # Local application imports
 from data import constants, models
 
+MINUTES_PER_DAY = 24 * 60
+
+_SlotOrBreak = typing.TypeVar("_SlotOrBreak", models.TimetableSlot, models.Break)
+
 
 @dataclasses.dataclass
 class Clash:
@@ -53,6 +66,68 @@ class TimeOfWeek:
             day_of_week=break_.day_of_week,
         )
 
+    @property
+    def starts_at_minute_of_week(self) -> int:
+        return get_minute_of_week(day_of_week=self.day_of_week, time=self.starts_at)
+
+    @property
+    def ends_at_minute_of_week(self) -> int:
+        return get_minute_of_week(day_of_week=self.day_of_week, time=self.ends_at)
+
+
+@dataclasses.dataclass(frozen=True)
+class TimesOfWeek:
+    """
+    The spans of many slots / breaks, as arrays of integer minutes since Monday 00:00.
+
+    Slots and breaks never span midnight (see .clean on TimetableSlot), so two spans can only clash when they are
+    on the same day, and the minute of the week alone is enough to find clashes.
+    """
+
+    starts: np.ndarray
+    ends: np.ndarray
+
+    @classmethod
+    def from_items(
+        cls, items: Iterable[models.TimetableSlot | models.Break | TimeOfWeek]
+    ) -> "TimesOfWeek":
+        spans = [
+            (
+                get_minute_of_week(day_of_week=item.day_of_week, time=item.starts_at),
+                get_minute_of_week(day_of_week=item.day_of_week, time=item.ends_at),
+            )
+            for item in items
+        ]
+        spans_array = np.array(spans, dtype=int).reshape(-1, 2)
+        return cls(starts=spans_array[:, 0], ends=spans_array[:, 1])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def get_clash_matrix(self, times: "TimesOfWeek") -> np.ndarray:
+        """
+        Check every span against every one of the passed times (all-pairs).
+        :return A boolean array of shape (len(self), len(times)), which is True where the span clashes with the time.
+        """
+        return _clashes(
+            item_starts=self.starts.reshape(-1, 1),
+            item_ends=self.ends.reshape(-1, 1),
+            time_starts=times.starts,
+            time_ends=times.ends,
+        )
+
+    def get_clashes(self, time_of_week: TimeOfWeek) -> np.ndarray:
+        """
+        Check every span against a single time (one-vs-many).
+        :return A boolean array of length len(self), which is True where the span clashes with the time.
+        """
+        return _clashes(
+            item_starts=self.starts,
+            item_ends=self.ends,
+            time_starts=time_of_week.starts_at_minute_of_week,
+            time_ends=time_of_week.ends_at_minute_of_week,
+        )
+
 
 @typing.overload
 def filter_queryset_for_clashes(
@@ -77,7 +152,7 @@ def filter_queryset_for_clashes(
 def filter_queryset_for_clashes(
     queryset: models.TimetableSlotQuerySet | models.BreakQuerySet,
     *,
-    time_of_week: TimeOfWeek
+    time_of_week: TimeOfWeek,
 ) -> models.TimetableSlotQuerySet | models.BreakQuerySet:
     """
     Filter a queryset of slots or breaks against a time of the week.
@@ -107,3 +182,123 @@ def filter_queryset_for_clashes(
         )
         & django_models.Q(day_of_week=time_of_week.day_of_week)
     ).distinct()
+
+
+@typing.overload
+def find_clashes(
+    queryset: models.TimetableSlotQuerySet, *, time_of_week: TimeOfWeek
+) -> list[models.TimetableSlot]:
+    """
+    Return the TimetableSlots clashing with the time, if searching a TimetableSlotQuerySet.
+    """
+    ...
+
+
+@typing.overload
+def find_clashes(
+    queryset: models.BreakQuerySet, *, time_of_week: TimeOfWeek
+) -> list[models.Break]:
+    """
+    Return the Breaks clashing with the time, if searching a BreakQuerySet.
+    """
+    ...
+
+
+def find_clashes(
+    queryset: models.TimetableSlotQuerySet | models.BreakQuerySet,
+    *,
+    time_of_week: TimeOfWeek,
+) -> list[models.TimetableSlot] | list[models.Break]:
+    """
+    Get the items in a queryset of slots or breaks that clash with a time of the week, as filter_queryset_for_clashes.
+
+    On Postgres, the candidate items are found with an index lookup on their span of minutes of the week
+    (see migration 0006). Otherwise, the items on the same day are loaded and checked in memory.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        overlaps_time = expressions.RawSQL(
+            f'"{queryset.model._meta.db_table}"."minutes_of_week" && int4range(%s, %s)',
+            (
+                time_of_week.starts_at_minute_of_week,
+                time_of_week.ends_at_minute_of_week,
+            ),
+            output_field=django_models.BooleanField(),
+        )
+        return list(
+            filter_queryset_for_clashes(
+                queryset=queryset.alias(overlaps_time=overlaps_time).filter(
+                    overlaps_time=True
+                ),
+                time_of_week=time_of_week,
+            )
+        )
+
+    return filter_items_for_clashes(
+        items=list(queryset.filter(day_of_week=time_of_week.day_of_week).distinct()),
+        time_of_week=time_of_week,
+    )
+
+
+def filter_items_for_clashes(
+    items: Sequence[_SlotOrBreak], *, time_of_week: TimeOfWeek
+) -> list[_SlotOrBreak]:
+    """
+    In-memory equivalent of filter_queryset_for_clashes, for slots or breaks that have already been loaded.
+    :return The items that clash with the passed time, non-inclusively, in their original order.
+    """
+    clashes = TimesOfWeek.from_items(items).get_clashes(time_of_week=time_of_week)
+    return [item for item, clash in zip(items, clashes) if clash]
+
+
+def filter_times_for_clashes(
+    times: Sequence[TimeOfWeek],
+    *,
+    items: Sequence[models.TimetableSlot | models.Break | TimeOfWeek],
+) -> list[TimeOfWeek]:
+    """
+    Check many times of the week against many slots / breaks at once, in memory.
+    :return The times that clash with at least one of the items, in their original order.
+    """
+    clashes = get_clash_matrix(items=items, times=times).any(axis=0)
+    return [time for time, clash in zip(times, clashes) if clash]
+
+
+def get_clash_matrix(
+    items: Sequence[models.TimetableSlot | models.Break | TimeOfWeek],
+    times: Sequence[models.TimetableSlot | models.Break | TimeOfWeek],
+) -> np.ndarray:
+    """
+    In-memory equivalent of filter_queryset_for_clashes, for checking many times of the week at once.
+    :return A boolean array of shape (len(items), len(times)), which is True where the item would be
+    in filter_queryset_for_clashes(items, time_of_week=TimeOfWeek.from_slot(time)).
+    """
+    return TimesOfWeek.from_items(items).get_clash_matrix(
+        times=TimesOfWeek.from_items(times)
+    )
+
+
+def get_minute_of_week(day_of_week: int, time: dt.time) -> int:
+    """
+    Get the number of minutes since Monday 00:00, at the given time on the given day.
+    Note that Monday is day 1 (see constants.Day), and any seconds are ignored.
+    """
+    return (day_of_week - 1) * MINUTES_PER_DAY + time.hour * 60 + time.minute
+
+
+def _clashes(
+    item_starts: np.ndarray | int,
+    item_ends: np.ndarray | int,
+    time_starts: np.ndarray | int,
+    time_ends: np.ndarray | int,
+) -> np.ndarray:
+    """
+    Check whether the item spans clash with the time spans, broadcasting the arrays against each other.
+    These are the same conditions as in filter_queryset_for_clashes.
+    """
+    return np.asarray(
+        ((item_starts < time_starts) & (item_ends > time_starts))
+        | ((item_starts < time_ends) & (item_ends > time_ends))
+        # EXACT MATCH - we want slots to clash with other slots starting and finishing at the same time
+        | (item_starts == time_starts)
+        | (item_ends == time_ends)
+    )
@@ -0,0 +1,230 @@
+"""
+The times of the week that each of a school's year groups is occupied, for checking slots and breaks for clashes.
+
+Each year group's slots and breaks are represented as a bitset, with one bit per minute of the week (bit 0 being
+Monday 00:00-00:01), stored as a Python int. Checking whether a time clashes with a year group's slots and breaks is
+then a bitwise AND with the bits of the time's first and last minutes (see get_boundary_bits).
+
+A school's occupancy is cached against its data version, which is incremented whenever any of its slots, breaks
+or year groups, or the relationships between them, change (see data.signals). So a stale occupancy is never read.
+Occupancies are only cached once the transaction they were built in commits, since a rolled back data version is
+reused by the next change.
+"""
+
+# Standard library imports
+import dataclasses
+import datetime as dt
+import functools
+from collections import defaultdict
+from collections.abc import Iterable
+
+# Django imports
+from django.core.cache import cache
+from django.db import transaction
+
+# Local application imports
+from data import constants, models
+from domain.solver.filters import clashes
+
+
+@dataclasses.dataclass(frozen=True)
+class OccupiedTime:
+    """
+    The time of the week spanned by one slot or break.
+    """
+
+    pk: int
+    starts_at: dt.time
+    ends_at: dt.time
+    bits: int
+
+    def __str__(self) -> str:
+        return f'{self.starts_at.strftime("%H:%M")}-{self.ends_at.strftime("%H:%M")}'
+
+
+@dataclasses.dataclass
+class Occupancy:
+    """
+    The slots and breaks of a year group (or a whole school), and the union of the minutes they span.
+    """
+
+    slots: list[OccupiedTime] = dataclasses.field(default_factory=list)
+    breaks: list[OccupiedTime] = dataclasses.field(default_factory=list)
+    bits: int = 0
+
+    def add_slot(self, slot: OccupiedTime) -> None:
+        self.slots.append(slot)
+        self.bits |= slot.bits
+
+    def add_break(self, break_: OccupiedTime) -> None:
+        self.breaks.append(break_)
+        self.bits |= break_.bits
+
+
+@dataclasses.dataclass(frozen=True)
+class OccupancyClash:
+    """
+    Record the slots and breaks that clashed with some time, in the order they occur in the week.
+    """
+
+    slots: list[OccupiedTime]
+    breaks: list[OccupiedTime]
+
+    def __bool__(self) -> bool:
+        return bool(self.slots or self.breaks)
+
+    @property
+    def slot_clash_str(self) -> str:
+        """
+        Part of an error message stating the times of the clashing slots.
+        """
+        return ", ".join(str(slot) for slot in self.slots)
+
+    @property
+    def break_clash_str(self) -> str:
+        """
+        Part of an error message stating the times of the clashing breaks.
+        """
+        return ", ".join(str(break_) for break_ in self.breaks)
+
+
+@dataclasses.dataclass(frozen=True)
+class SchoolOccupancy:
+    """
+    The occupancy of each of a school's year groups, keyed by year group pk, and of the school as a whole.
+    Note that the school's occupancy also includes any slots and breaks not relevant to a year group.
+    """
+
+    school: Occupancy
+    year_groups: dict[int, Occupancy]
+
+    def get_clashes(
+        self,
+        time_of_week: clashes.TimeOfWeek,
+        *,
+        year_group_pks: Iterable[int] | None = None,
+        exclude_slot_pk: int | None = None,
+        exclude_break_pk: int | None = None,
+    ) -> OccupancyClash:
+        """
+        Get the slots and breaks that a time of the week clashes with, for some year groups.
+        These are the same clashes as filter_queryset_for_clashes would find.
+        :param year_group_pks: The year groups to check against, or None to check against the whole school.
+        :param exclude_slot_pk: A slot not to check against, e.g. since it's the slot being moved.
+        :param exclude_break_pk: A break not to check against, e.g. since it's the break being moved.
+        """
+        bits = get_boundary_bits(time_of_week)
+        if year_group_pks is None:
+            occupancies = [self.school]
+        else:
+            occupancies = [
+                self.year_groups[pk] for pk in year_group_pks if pk in self.year_groups
+            ]
+
+        slots: dict[int, OccupiedTime] = {}
+        breaks: dict[int, OccupiedTime] = {}
+        for occupancy in occupancies:
+            if not occupancy.bits & bits:
+                continue
+            slots |= {
+                slot.pk: slot
+                for slot in occupancy.slots
+                if slot.bits & bits and slot.pk != exclude_slot_pk
+            }
+            breaks |= {
+                break_.pk: break_
+                for break_ in occupancy.breaks
+                if break_.bits & bits and break_.pk != exclude_break_pk
+            }
+
+        return OccupancyClash(
+            slots=sorted(slots.values(), key=_get_first_bit),
+            breaks=sorted(breaks.values(), key=_get_first_bit),
+        )
+
+
+def get_school_occupancy(school_id: int) -> SchoolOccupancy:
+    """
+    Get the occupancy of a school's year groups, from the cache if its data hasn't changed since last built.
+    """
+    data_version = (
+        models.School.objects.filter(school_access_key=school_id)
+        .values_list("data_version", flat=True)
+        .get()
+    )
+    cache_key = f"school_occupancy:{school_id}:{data_version}"
+    if (school_occupancy := cache.get(cache_key)) is None:
+        school_occupancy = _build_school_occupancy(school_id=school_id)
+        transaction.on_commit(functools.partial(cache.set, cache_key, school_occupancy))
+    return school_occupancy
+
+
+def get_bits(time_of_week: clashes.TimeOfWeek) -> int:
+    """
+    Get the bitset of the minutes of the week that a time spans.
+    """
+    starts = time_of_week.starts_at_minute_of_week
+    n_minutes = max(time_of_week.ends_at_minute_of_week - starts, 0)
+    return ((1 << n_minutes) - 1) << starts
+
+
+def get_boundary_bits(time_of_week: clashes.TimeOfWeek) -> int:
+    """
+    Get the bits of the first and last minutes of the week that a time spans.
+
+    A slot or break clashes with the time, as in filter_queryset_for_clashes, exactly when it spans one of these
+    minutes. That is, when it spans the time's start, or ends at or spans its end. So a slot or break lying strictly
+    within the time doesn't clash with it.
+    """
+    first_minute = time_of_week.starts_at_minute_of_week
+    last_minute = time_of_week.ends_at_minute_of_week - 1
+    return (1 << first_minute) | (1 << last_minute)
+
+
+def _build_school_occupancy(school_id: int) -> SchoolOccupancy:
+    """
+    Load a school's slots and breaks, and the year groups they are relevant to, in four queries.
+    """
+    fields = ("pk", "day_of_week", "starts_at", "ends_at")
+    slots = models.TimetableSlot.objects.filter(school_id=school_id).values_list(
+        *fields
+    )
+    slot_year_groups = models.TimetableSlot.relevant_year_groups.through.objects.filter(
+        timetableslot__school_id=school_id
+    ).values_list("timetableslot_id", "yeargroup_id")
+    breaks = models.Break.objects.filter(school_id=school_id).values_list(*fields)
+    break_year_groups = models.Break.relevant_year_groups.through.objects.filter(
+        break__school_id=school_id
+    ).values_list("break_id", "yeargroup_id")
+
+    school = Occupancy()
+    year_groups: defaultdict[int, Occupancy] = defaultdict(Occupancy)
+
+    occupied_slots = {slot[0]: _get_occupied_time(*slot) for slot in slots}
+    for occupied_slot in occupied_slots.values():
+        school.add_slot(occupied_slot)
+    for slot_pk, year_group_pk in slot_year_groups:
+        year_groups[year_group_pk].add_slot(occupied_slots[slot_pk])
+
+    occupied_breaks = {break_[0]: _get_occupied_time(*break_) for break_ in breaks}
+    for occupied_break in occupied_breaks.values():
+        school.add_break(occupied_break)
+    for break_pk, year_group_pk in break_year_groups:
+        year_groups[year_group_pk].add_break(occupied_breaks[break_pk])
+
+    return SchoolOccupancy(school=school, year_groups=dict(year_groups))
+
+
+def _get_occupied_time(
+    pk: int, day_of_week: constants.Day, starts_at: dt.time, ends_at: dt.time
+) -> OccupiedTime:
+    time_of_week = clashes.TimeOfWeek(
+        starts_at=starts_at, ends_at=ends_at, day_of_week=day_of_week
+    )
+    return OccupiedTime(
+        pk=pk, starts_at=starts_at, ends_at=ends_at, bits=get_bits(time_of_week)
+    )
+
+
+def _get_first_bit(occupied_time: OccupiedTime) -> int:
+    return (occupied_time.bits & -occupied_time.bits).bit_length()
@@ -0,0 +1,242 @@
+"""
+Utilities for recording where the time and memory go when a school's timetabling problem is solved.
+"""
+
+# Standard library imports
+import contextlib
+import dataclasses
+import resource
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Generator
+
+# Third party imports
+import pulp as lp
+
+if TYPE_CHECKING:
+    # Local application imports
+    from domain.solver.linear_programming.sparse_model import SparseModel
+
+
+@dataclasses.dataclass(frozen=True)
+class PhaseRecord:
+    """
+    The resources used during a single phase of a solver run.
+
+    Memory is measured from the peak resident set size (RSS) that the OS reports, which is a high-water mark over
+    the whole life of the process, rather than over the phase. So each phase records how much it raised the
+    high-water mark. This is 0 when a phase stayed within memory already used, e.g. by an earlier solver run in the
+    same worker process, and is then a lower bound on the memory the phase used.
+
+    :field name: what the phase was, e.g. 'variables' or 'constraints: pupil'.
+    :field wall_time_seconds: how long the phase took.
+    :field peak_rss_kb: how much the phase raised this process's peak RSS, in kilobytes.
+    :field child_peak_rss_kb: how much the phase raised the peak RSS of this process's finished child processes, in
+    kilobytes. CBC is run as a child process, so its memory is only seen here, in the 'solve' phase.
+    """
+
+    name: str
+    wall_time_seconds: float
+    peak_rss_kb: int
+    child_peak_rss_kb: int
+
+
+class PhaseTimer:
+    """
+    Class recording the wall time and peak memory usage of each phase of a solver run.
+    """
+
+    def __init__(self) -> None:
+        self.phases: list[PhaseRecord] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """
+        Record the resources used by the code executed within this context.
+        """
+        start_peak_rss_kb = _get_peak_rss_kb(resource.RUSAGE_SELF)
+        start_child_peak_rss_kb = _get_peak_rss_kb(resource.RUSAGE_CHILDREN)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time_seconds = time.perf_counter() - start
+            self.phases.append(
+                PhaseRecord(
+                    name=name,
+                    wall_time_seconds=wall_time_seconds,
+                    peak_rss_kb=_get_peak_rss_kb(resource.RUSAGE_SELF)
+                    - start_peak_rss_kb,
+                    child_peak_rss_kb=_get_peak_rss_kb(resource.RUSAGE_CHILDREN)
+                    - start_child_peak_rss_kb,
+                )
+            )
+
+    @property
+    def total_wall_time_seconds(self) -> float:
+        """
+        The total time spent across all recorded phases.
+        """
+        return sum(phase.wall_time_seconds for phase in self.phases)
+
+    def as_json(self) -> list[dict[str, str | float | int]]:
+        """
+        The recorded phases, in a form that can be stored in a JSONField.
+        """
+        return [dataclasses.asdict(phase) for phase in self.phases]
+
+
+@dataclasses.dataclass(frozen=True)
+class ProblemSize:
+    """
+    The size of a formulated linear programming problem.
+    """
+
+    number_of_variables: int
+    number_of_constraints: int
+    number_of_nonzeros: int
+
+    @classmethod
+    def from_problem(cls, problem: lp.LpProblem) -> "ProblemSize":
+        """
+        Measure the size of the passed problem.
+        """
+        return cls(
+            number_of_variables=problem.numVariables(),
+            number_of_constraints=problem.numConstraints(),
+            number_of_nonzeros=sum(
+                len(constraint) for constraint in problem.constraints.values()
+            ),
+        )
+
+    @classmethod
+    def from_sparse_model(cls, model: "SparseModel") -> "ProblemSize":
+        """
+        Measure the size of the passed sparse model.
+        """
+        return cls(
+            number_of_variables=model.n_variables,
+            number_of_constraints=model.n_constraints,
+            number_of_nonzeros=model.n_nonzeros,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class ConstraintFamilySize:
+    """
+    The size of one family of constraints in a formulated problem, and how long the family took to build.
+
+    :field name: the family, e.g. 'pupil' or 'no split lessons in a day'.
+    :field number_of_variables: how many distinct variables appear in the family's constraints.
+    :field number_of_constraints: how many constraints (rows) are in the family.
+    :field number_of_nonzeros: how many coefficients the family's constraints have in total.
+    :field wall_time_seconds: how long it took to build the family's constraints.
+    """
+
+    name: str
+    number_of_variables: int
+    number_of_constraints: int
+    number_of_nonzeros: int
+    wall_time_seconds: float
+
+    @classmethod
+    def from_constraints(
+        cls, name: str, wall_time_seconds: float, constraints: Iterable[lp.LpConstraint]
+    ) -> "ConstraintFamilySize":
+        """
+        Measure the size of the passed PuLP constraints.
+        """
+        variables: set[lp.LpVariable] = set()
+        number_of_constraints = 0
+        number_of_nonzeros = 0
+        for constraint in constraints:
+            variables.update(constraint.keys())
+            number_of_constraints += 1
+            number_of_nonzeros += len(constraint)
+        return cls(
+            name=name,
+            number_of_variables=len(variables),
+            number_of_constraints=number_of_constraints,
+            number_of_nonzeros=number_of_nonzeros,
+            wall_time_seconds=wall_time_seconds,
+        )
+
+    @classmethod
+    def from_sparse_model(
+        cls, name: str, wall_time_seconds: float, model: "SparseModel", first_row: int
+    ) -> "ConstraintFamilySize":
+        """
+        Measure the size of the rows of the passed sparse model, from first_row onwards.
+        """
+        columns = model.get_columns_from_row(first_row=first_row)
+        return cls(
+            name=name,
+            number_of_variables=len(set(columns.tolist())),
+            number_of_constraints=model.n_constraints - first_row,
+            number_of_nonzeros=len(columns),
+            wall_time_seconds=wall_time_seconds,
+        )
+
+
+class FormulationReport:
+    """
+    Class recording the size of each family of constraints in a formulated problem, and how long each took to build.
+    This is used to see which family of constraints blows up for a given school.
+    """
+
+    def __init__(self, families: Iterable[ConstraintFamilySize] = ()) -> None:
+        self.families: list[ConstraintFamilySize] = list(families)
+
+    def add_family(self, family: ConstraintFamilySize) -> None:
+        self.families.append(family)
+
+    def as_json(self) -> list[dict[str, str | float | int]]:
+        """
+        The recorded families, in a form that can be stored in a JSONField.
+        """
+        return [dataclasses.asdict(family) for family in self.families]
+
+    @classmethod
+    def from_json(
+        cls, families: list[dict[str, str | float | int]]
+    ) -> "FormulationReport":
+        """
+        Rebuild a report stored using as_json.
+        """
+        return cls(
+            families=(
+                ConstraintFamilySize(
+                    name=str(family["name"]),
+                    number_of_variables=int(family["number_of_variables"]),
+                    number_of_constraints=int(family["number_of_constraints"]),
+                    number_of_nonzeros=int(family["number_of_nonzeros"]),
+                    wall_time_seconds=float(family["wall_time_seconds"]),
+                )
+                for family in families
+            )
+        )
+
+    def format_table(self) -> str:
+        """
+        Lay the report out as a plain text table, with one line per family, for logs and command output.
+        """
+        name_width = max(
+            [len("Constraint family")] + [len(family.name) for family in self.families]
+        )
+        lines = [
+            f"{'Constraint family':<{name_width}}  {'Variables':>10}  {'Rows':>10}  {'Non-zeros':>10}  {'Time (s)':>9}"
+        ]
+        lines.extend(
+            f"{family.name:<{name_width}}  {family.number_of_variables:>10}  {family.number_of_constraints:>10}  "
+            f"{family.number_of_nonzeros:>10}  {family.wall_time_seconds:>9.3f}"
+            for family in self.families
+        )
+        return "\n".join(lines)
+
+
+def _get_peak_rss_kb(who: int) -> int:
+    """
+    Get the peak resident set size so far, in kilobytes (as reported on linux).
+    :param who: RUSAGE_SELF for the current process, or RUSAGE_CHILDREN for the largest of its finished children.
+    """
+    return resource.getrusage(who).ru_maxrss
@@ -1,34 +1,58 @@
 # Standard library imports
+import copy
+import logging
 from typing import Any
 
 # Third party imports
 import pulp as lp
 
 # Local application imports
+from domain.solver.instrumentation import FormulationReport, PhaseTimer, ProblemSize
 from domain.solver.linear_programming.solver_constraints import (
     TimetableSolverConstraints,
 )
 from domain.solver.linear_programming.solver_objective import TimetableSolverObjective
-from domain.solver.linear_programming.solver_variables import TimetableSolverVariables
+from domain.solver.linear_programming.solver_sparse_formulation import (
+    TimetableSolverSparseFormulation,
+)
+from domain.solver.linear_programming.solver_variables import (
+    TimetableSolverVariables,
+    var_key,
+)
 from domain.solver.solver_input_data import TimetableSolverInputs
 
+logger = logging.getLogger(__name__)
+
 
 class TimetableSolver:
     """
     Class to formulate and solve the timetable scheduling problem as a linear programming problem.
     Subclass of the pulp LpProblem class to allow use of solve method
+
+    When the solution specification asks for a sparse model, the constraints and objective are assembled as arrays
+    instead of being added to the PuLP problem, which is then left empty. The PuLP variables are still created, and
+    are given the solution's values, so the solution is read back in the same way.
     """
 
-    def __init__(self, input_data: TimetableSolverInputs):
+    def __init__(
+        self, input_data: TimetableSolverInputs, timer: PhaseTimer | None = None
+    ):
         """
         :param - input_data - passing this to __init__ triggers the formulation of the timetable solution problem as
         a linear programming problem
+        :param - timer - used to record the resources spent on each phase of formulating and solving the problem
         """
+        self.timer = timer or PhaseTimer()
+        # The size of each family of constraints, and how long each took to build
+        self.formulation_report = FormulationReport()
+
         # Create a new problem instance - maximise since objective components are formulated such that bigger is better
         self.problem = lp.LpProblem(
             f"TTS_problem_for_{input_data.school_id}", sense=lp.LpMaximize
         )
         self.error_messages: list[str] = []
+        # The number of clash constraints added after solving, when they are generated lazily
+        self.n_lazy_clash_constraints = 0
 
         # Formulate the linear programming problem
         self.input_data = input_data
@@ -37,23 +61,182 @@ class TimetableSolver:
                 "TimetableSolver was passed input data containing errors!\n"
                 f"{self.input_data.error_messages}"
             )
-        self.variables = TimetableSolverVariables(inputs=input_data)
+        with self.timer.phase("variables"):
+            self.variables = TimetableSolverVariables(inputs=input_data)
 
-        constraint_maker = TimetableSolverConstraints(
-            inputs=input_data, variables=self.variables
-        )
-        constraint_maker.add_constraints_to_problem(problem=self.problem)
+        self._sparse_formulation: TimetableSolverSparseFormulation | None = None
+        if input_data.solution_specification.sparse_model:
+            self._sparse_formulation = TimetableSolverSparseFormulation(
+                inputs=input_data, variables=self.variables
+            )
+            self._sparse_formulation.add_constraints_to_model(
+                timer=self.timer, report=self.formulation_report
+            )
+        else:
+            self._constraint_maker = TimetableSolverConstraints(
+                inputs=input_data, variables=self.variables
+            )
+            self._constraint_maker.add_constraints_to_problem(
+                problem=self.problem, timer=self.timer, report=self.formulation_report
+            )
 
-        objective_maker = TimetableSolverObjective(
-            inputs=input_data, variables=self.variables
+        with self.timer.phase("objective"):
+            objective_maker = TimetableSolverObjective(
+                inputs=input_data, variables=self.variables
+            )
+            if self._sparse_formulation is not None:
+                self._sparse_formulation.add_objective_to_model(
+                    objective_maker=objective_maker
+                )
+            else:
+                objective_maker.add_objective_to_problem(problem=self.problem)
+
+        logger.info(
+            "Formulated the timetabling problem for school %s:\n%s",
+            input_data.school_id,
+            self.formulation_report.format_table(),
         )
-        objective_maker.add_objective_to_problem(problem=self.problem)
 
     def solve(self, *args: Any, **kwargs: Any) -> None:
         """
         Method calling the default PuLP solver (COIN API), and recording the error message if unsuccessful.
+
+        When the clash constraints are generated lazily, the clash constraints broken by each solution are added,
+        and the problem re-solved (starting from the previous solution), until a solution breaks none of them.
+        """
+        with self.timer.phase("solve"):
+            try:
+                if self._sparse_formulation is not None:
+                    self._sparse_formulation.model.solve(*args, **kwargs)
+                    return None
+                self.problem.solve(*args, **kwargs)
+                if self.input_data.solution_specification.lazy_clash_constraints:
+                    self._solve_until_no_clashes(**kwargs)
+            except lp.PulpSolverError as e:
+                self.error_messages += [e]
+
+    def _solve_until_no_clashes(self, **kwargs: Any) -> None:
+        """
+        Add the clash constraints broken by the current solution, and re-solve, until none are broken.
+
+        Each re-solve uses the solver (and so the time limit, threads etc.) of the first solve, warm started.
+        :param kwargs: any further keyword arguments the first solve was passed, which are passed on to the solver.
+        """
+        kwargs.pop("solver", None)
+        solver = _get_warm_start_solver(self.problem.solver)
+        while self.is_optimal:
+            violated_constraints = [
+                constraint
+                for constraint in self._constraint_maker.get_violated_clash_constraints(
+                    assignment=self.get_solved_assignment()
+                )
+                if constraint[1] not in self.problem.constraints
+            ]
+            if not violated_constraints:
+                break
+            for constraint in violated_constraints:
+                self.problem += constraint
+            self.n_lazy_clash_constraints += len(violated_constraints)
+            self.problem.solve(solver, **kwargs)
+
+    def get_solved_assignment(self) -> list[var_key]:
+        """
+        Get the keys of the decision variables that are set to 1 in the most recent solution.
+
+        The solver can return binary values a small tolerance away from 1, so values are rounded.
+        """
+        return [
+            key
+            for key, variable in self.variables.decision_variables.items()
+            if round(variable.varValue or 0) == 1
+        ]
+
+    def get_solved_slack(self) -> int:
+        """
+        Get the number of required slots and double periods left unassigned by the most recent solution.
+
+        This can only be non-zero in the elastic problem, where the shortfall is held by the slack variables.
         """
-        try:
-            self.problem.solve(*args, **kwargs)
-        except lp.PulpSolverError as e:
-            self.error_messages += [e]
+        slack_variables = [
+            *self.variables.fulfillment_slack_variables.values(),
+            *self.variables.double_period_slack_variables.values(),
+        ]
+        return sum(round(variable.varValue or 0) for variable in slack_variables)
+
+    def exclude_assignment(self, assignment: list[var_key], name: str) -> None:
+        """
+        Add a 'no-good' cut to the problem, so that re-solving cannot reproduce the passed assignment.
+
+        When every lesson must be fully timetabled, every solution sets the same number of decision variables to 1
+        (by the fulfillment constraints), so any other solution must set at least one of these variables to 0.
+        A partial timetable could instead set a subset or superset of them to 1, so in the elastic problem the
+        variables outside the assignment are also counted, and the cut then excludes only the exact assignment.
+        """
+        if self._sparse_formulation is not None:
+            self._sparse_formulation.add_exclusion_row(assignment=assignment, name=name)
+            return None
+
+        if self.input_data.solution_specification.allow_partial_timetable:
+            assigned = set(assignment)
+            self.problem += (
+                lp.lpSum(
+                    variable if key in assigned else -variable
+                    for key, variable in self.variables.decision_variables.items()
+                )
+                <= len(assignment) - 1,
+                name,
+            )
+            return None
+
+        self.problem += (
+            lp.lpSum(self.variables.decision_variables[key] for key in assignment)
+            <= len(assignment) - 1,
+            name,
+        )
+
+    @property
+    def status(self) -> str:
+        """
+        The status of the most recent call to solve, as described by PuLP.
+        """
+        return lp.LpStatus[self._status]
+
+    @property
+    def is_optimal(self) -> bool:
+        """
+        Whether the most recent call to solve found an optimal solution.
+        """
+        return self._status == lp.LpStatusOptimal
+
+    @property
+    def objective_value(self) -> float | None:
+        """
+        The value the objective took in the most recent solution.
+        """
+        if self._sparse_formulation is not None:
+            return self._sparse_formulation.model.objective_value
+        return lp.value(self.problem.objective)
+
+    @property
+    def _status(self) -> int:
+        if self._sparse_formulation is not None:
+            return self._sparse_formulation.model.status
+        return self.problem.status
+
+    def get_problem_size(self) -> ProblemSize:
+        """
+        Measure the size of the formulated problem.
+        """
+        if self._sparse_formulation is not None:
+            return ProblemSize.from_sparse_model(model=self._sparse_formulation.model)
+        return ProblemSize.from_problem(problem=self.problem)
+
+
+def _get_warm_start_solver(solver: lp.LpSolver) -> lp.LpSolver:
+    """
+    Get a copy of a solver that starts from the current values of the problem's variables.
+    The copy is shallow, so that it keeps all the solver's settings, without changing the passed solver.
+    """
+    warm_start_solver = copy.copy(solver)
+    warm_start_solver.optionsDict = {**solver.optionsDict, "warmStart": True}
+    return warm_start_solver
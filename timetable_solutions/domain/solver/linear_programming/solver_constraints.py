@@ -3,14 +3,23 @@ Declares the class handling timetable constraints.
 """
 
 # Standard library imports
+import functools
+import itertools
+from collections.abc import Callable, Iterable
 from typing import Generator
 
 # Third party imports
+import numpy as np
 import pulp as lp
 
 # Local application imports
 from data import constants, models
 from domain.solver.filters import clashes
+from domain.solver.instrumentation import (
+    ConstraintFamilySize,
+    FormulationReport,
+    PhaseTimer,
+)
 from domain.solver.linear_programming.solver_variables import (
     TimetableSolverVariables,
     doubles_var_key,
@@ -37,43 +46,103 @@ class TimetableSolverConstraints:
         self._inputs = inputs
         self._decision_variables = variables.decision_variables
         self._double_period_variables = variables.double_period_variables
+        self._fulfillment_slack_variables = variables.fulfillment_slack_variables
+        self._double_period_slack_variables = variables.double_period_slack_variables
 
-    def add_constraints_to_problem(self, problem: lp.LpProblem) -> None:
+    def add_constraints_to_problem(
+        self,
+        problem: lp.LpProblem,
+        timer: PhaseTimer | None = None,
+        report: FormulationReport | None = None,
+    ) -> None:
         """
         Add all relevant constraints to the passed problem.
 
         :param problem: A timetabling problem for a single school.
+        :param timer: Used to record the resources spent on each family of constraints.
+        :param report: Used to record the size of each family of constraints.
         :return None: The problem is mutated.
         """
+        add_family = functools.partial(
+            self._add_constraint_family,
+            problem=problem,
+            timer=timer or PhaseTimer(),
+            report=report or FormulationReport(),
+        )
+
         # Fulfillment
-        for constraint in self._get_all_fulfillment_constraints():
-            problem += constraint
+        add_family(
+            name="fulfillment", get_constraints=self._get_all_fulfillment_constraints
+        )
 
         # One place at a time constraints
-        for constraint in self._get_all_pupil_constraints():
-            problem += constraint
-
-        for constraint in self._get_all_teacher_constraints():
-            problem += constraint
+        add_family(name="pupil", get_constraints=self._get_all_pupil_constraints)
 
-        for constraint in self._get_all_classroom_constraints():
-            problem += constraint
+        if self._inputs.solution_specification.lazy_clash_constraints:
+            # Only the clash constraints that can't be found by checking a solution are added up front
+            add_family(
+                name="teacher",
+                get_constraints=self._get_all_teacher_single_slot_constraints,
+            )
+            add_family(
+                name="classroom",
+                get_constraints=self._get_all_classroom_occupied_constraints,
+            )
+        else:
+            add_family(
+                name="teacher", get_constraints=self._get_all_teacher_constraints
+            )
+            add_family(
+                name="classroom", get_constraints=self._get_all_classroom_constraints
+            )
 
         # Double period constraints
-        for constraint in self._get_all_double_period_fulfillment_constraints():
-            problem += constraint
-
-        for constraint in self._get_all_double_period_dependency_constraints():
-            problem += constraint
+        add_family(
+            name="double period fulfillment",
+            get_constraints=self._get_all_double_period_fulfillment_constraints,
+        )
+        add_family(
+            name="double period dependency",
+            get_constraints=self._get_all_double_period_dependency_constraints,
+        )
 
         # Structural constraints
         if not self._inputs.solution_specification.allow_split_lessons_within_each_day:
-            for constraint in self._get_all_no_split_lessons_in_a_day_constraints():
-                problem += constraint
+            add_family(
+                name="no split lessons in a day",
+                get_constraints=self._get_all_no_split_lessons_in_a_day_constraints,
+            )
 
         if not self._inputs.solution_specification.allow_triple_periods_and_above:
-            for constraint in self._get_all_no_two_doubles_in_a_day_constraints():
+            add_family(
+                name="no two doubles in a day",
+                get_constraints=self._get_all_no_two_doubles_in_a_day_constraints,
+            )
+
+    @staticmethod
+    def _add_constraint_family(
+        problem: lp.LpProblem,
+        timer: PhaseTimer,
+        report: FormulationReport,
+        name: str,
+        get_constraints: Callable[[], Iterable[tuple[lp.LpConstraint, str]]],
+    ) -> None:
+        """
+        Add one family of constraints to the problem, recording how long this took and how big the family is.
+        """
+        n_existing_constraints = len(problem.constraints)
+        with timer.phase(f"constraints: {name}"):
+            for constraint in get_constraints():
                 problem += constraint
+        report.add_family(
+            ConstraintFamilySize.from_constraints(
+                name=name,
+                wall_time_seconds=timer.phases[-1].wall_time_seconds,
+                constraints=itertools.islice(
+                    problem.constraints.values(), n_existing_constraints, None
+                ),
+            )
+        )
 
     # --------------------
     # Fulfillment constraints
@@ -91,6 +160,8 @@ class TimetableSolverConstraints:
         ) -> tuple[lp.LpConstraint, str]:
             """
             Ensure this lesson is assigned the required number of slots.
+
+            In an elastic problem, any shortfall is absorbed by the lesson's slack variable.
             """
             n_solver_slots_variable = lp.lpSum(
                 [
@@ -98,6 +169,7 @@ class TimetableSolverConstraints:
                     for key, var in self._decision_variables.items()
                     if key.lesson_id == lesson.lesson_id
                 ]
+                + [self._fulfillment_slack_variables.get(lesson.lesson_id, 0)]
             )
             n_solver_slots_required = lesson.get_n_solver_slots_required()
             constraint = (
@@ -186,10 +258,7 @@ class TimetableSolverConstraints:
             """
             # Need to constrain against ALL slots clashing with this one,
             # since the teacher can only be utilised for ONE of these slots
-            clashing_slots = clashes.filter_queryset_for_clashes(
-                queryset=self._inputs.timetable_slots,
-                time_of_week=clashes.TimeOfWeek.from_slot(slot=time_slot),
-            )
+            clashing_slots = self._get_clashing_slots(time_slot=time_slot)
 
             # Check for any other clashes
             possible_commitments = lp.lpSum(
@@ -211,7 +280,9 @@ class TimetableSolverConstraints:
                     f"teacher_{teacher.teacher_id}_available_at_{time_slot.slot_id}",
                 )
             ]
-            for other_slot in clashing_slots.exclude(slot_id=time_slot.slot_id):
+            for other_slot in clashing_slots:
+                if other_slot.slot_id == time_slot.slot_id:
+                    continue
                 possible_commitments = lp.lpSum(
                     [
                         self._decision_variables.get(key)
@@ -264,10 +335,7 @@ class TimetableSolverConstraints:
             # TODO -> mimic teacher constraints
             # Need to constrain against ALL slots clashing with this one
             # since the teacher can only be utilised for ONE of these slots
-            clashing_slots = clashes.filter_queryset_for_clashes(
-                queryset=self._inputs.timetable_slots,
-                time_of_week=clashes.TimeOfWeek.from_slot(slot=time_slot),
-            )
+            clashing_slots = self._get_clashing_slots(time_slot=time_slot)
             possible_uses = lp.lpSum(
                 [
                     self._decision_variables.get(key)
@@ -304,6 +372,270 @@ class TimetableSolverConstraints:
             for time_slot in self._inputs.timetable_slots
         )
 
+    # --------------------
+    # Lazy clash constraints
+    # These replace the teacher and classroom constraints above, when they are generated lazily
+    # --------------------
+
+    def get_violated_clash_constraints(
+        self, assignment: list[var_key]
+    ) -> list[tuple[lp.LpConstraint, str]]:
+        """
+        Get the teacher and classroom constraints that the given solution breaks.
+
+        The constraints are the same as those that would have been added up front by
+        _get_all_teacher_constraints and _get_all_classroom_constraints, so once a solution
+        breaks none of them, it is optimal for the full problem.
+
+        :param assignment: the keys of the decision variables set to 1 in a solution.
+        """
+        slot_index = self._slot_index
+        slots = self._slots
+        slot_clashes = self._slot_clashes
+        lessons = {lesson.lesson_id: lesson for lesson in self._inputs.lessons}
+
+        assigned_by_teacher: dict[int, set[int]] = {}
+        assigned_by_classroom: dict[int, list[int]] = {}
+        for key in assignment:
+            lesson = lessons[key.lesson_id]
+            if lesson.teacher_id is not None:
+                assigned_by_teacher.setdefault(lesson.teacher_id, set()).add(
+                    slot_index[key.slot_id]
+                )
+            if lesson.classroom_id is not None:
+                assigned_by_classroom.setdefault(lesson.classroom_id, []).append(
+                    slot_index[key.slot_id]
+                )
+
+        constraints = []
+        for teacher_pk, slot_indexes in assigned_by_teacher.items():
+            teacher = self._teachers[teacher_pk]
+            indexes = np.array(sorted(slot_indexes))
+            # Any two assigned slots that clash break one of the pairwise constraints
+            clashing_pairs = np.argwhere(slot_clashes[np.ix_(indexes, indexes)])
+            # Each clashing pair only needs one of its two (equivalent) constraints
+            seen_pairs: set[frozenset[int]] = set()
+            for other_position, position in clashing_pairs:
+                pair = frozenset((other_position, position))
+                if other_position == position or pair in seen_pairs:
+                    continue
+                seen_pairs.add(pair)
+                time_slot = slots[indexes[position]]
+                other_slot = slots[indexes[other_position]]
+                constraints.append(
+                    (
+                        lp.lpSum(
+                            self._get_lesson_variables_at_slots(
+                                lessons=self._lessons_by_teacher[teacher_pk],
+                                slot_ids=[time_slot.slot_id, other_slot.slot_id],
+                            )
+                        )
+                        <= 1,
+                        f"teacher_{teacher.teacher_id}_available_at_one_of_{time_slot.slot_id}_and_{other_slot.slot_id}",
+                    )
+                )
+
+        for classroom_pk, assigned_indexes in assigned_by_classroom.items():
+            classroom = self._classrooms[classroom_pk]
+            uses = np.bincount(assigned_indexes, minlength=len(slots))
+            # The number of uses at slots clashing with each slot
+            clashing_uses = uses @ slot_clashes
+            occupied = self._classroom_occupied_slots.get(classroom_pk)
+            for position in np.flatnonzero(clashing_uses > 1):
+                if occupied is not None and occupied[position]:
+                    continue  # Already constrained to no uses
+                time_slot = slots[position]
+                constraints.append(
+                    (
+                        lp.lpSum(
+                            self._get_lesson_variables_at_slots(
+                                lessons=self._lessons_by_classroom[classroom_pk],
+                                slot_ids=[
+                                    slots[clash_position].slot_id
+                                    for clash_position in np.flatnonzero(
+                                        slot_clashes[:, position]
+                                    )
+                                ],
+                            )
+                        )
+                        <= 1,
+                        f"classroom_{classroom.classroom_id}_unoccupied_at_{time_slot.slot_id}",
+                    )
+                )
+
+        return constraints
+
+    def _get_all_teacher_single_slot_constraints(
+        self,
+    ) -> Generator[tuple[lp.LpConstraint, str], None, None]:
+        """
+        Ensure every teacher is only assigned one lesson at each slot.
+        Constraints that only involve one variable always hold, so are not needed.
+        """
+        for teacher_pk, lessons in self._lessons_by_teacher.items():
+            teacher = self._teachers[teacher_pk]
+            for time_slot in self._slots:
+                variables = self._get_lesson_variables_at_slots(
+                    lessons=lessons, slot_ids=[time_slot.slot_id]
+                )
+                if len(variables) > 1:
+                    yield (
+                        lp.lpSum(variables) <= 1,
+                        f"teacher_{teacher.teacher_id}_available_at_{time_slot.slot_id}",
+                    )
+
+    def _get_all_classroom_occupied_constraints(
+        self,
+    ) -> Generator[tuple[lp.LpConstraint, str], None, None]:
+        """
+        Prevent every classroom being used at times it is already occupied by a user defined lesson.
+        """
+        for classroom_pk, occupied_slots in self._classroom_occupied_slots.items():
+            if classroom_pk not in self._lessons_by_classroom:
+                continue
+            classroom = self._classrooms[classroom_pk]
+            for position in np.flatnonzero(occupied_slots):
+                time_slot = self._slots[position]
+                variables = self._get_lesson_variables_at_slots(
+                    lessons=self._lessons_by_classroom[classroom_pk],
+                    slot_ids=[
+                        self._slots[clash_position].slot_id
+                        for clash_position in np.flatnonzero(
+                            self._slot_clashes[:, position]
+                        )
+                    ],
+                )
+                yield (
+                    lp.lpSum(variables) == 0,
+                    f"classroom_{classroom.classroom_id}_occupied_at_{time_slot.slot_id}",
+                )
+
+    def _get_lesson_variables_at_slots(
+        self, lessons: list[models.Lesson], slot_ids: list[int]
+    ) -> list[lp.LpVariable]:
+        """
+        Get the decision variables for the given lessons occurring at any of the given slots.
+        """
+        return [
+            variable
+            for lesson in lessons
+            for slot_id in slot_ids
+            if (
+                variable := self._decision_variables.get(
+                    var_key(lesson_id=lesson.lesson_id, slot_id=slot_id)
+                )
+            )
+            is not None
+        ]
+
+    def _get_clashing_slots(
+        self, time_slot: models.TimetableSlot
+    ) -> list[models.TimetableSlot]:
+        """
+        Get the school's slots that clash with the given slot (including the slot itself), in time order.
+        Equivalent to filter_queryset_for_clashes, using the precomputed clash matrix.
+        """
+        clashing_indexes = np.flatnonzero(
+            self._slot_clashes[:, self._slot_index[time_slot.slot_id]]
+        )
+        return [self._slots[index] for index in clashing_indexes]
+
+    @functools.cached_property
+    def _slots(self) -> list[models.TimetableSlot]:
+        return list(self._inputs.timetable_slots)
+
+    @functools.cached_property
+    def _slot_index(self) -> dict[int, int]:
+        return {slot.slot_id: index for index, slot in enumerate(self._slots)}
+
+    @functools.cached_property
+    def _slot_clashes(self) -> np.ndarray:
+        """
+        Whether each slot clashes with each other slot, as a (slots x slots) array.
+        The slots in column s are those in filter_queryset_for_clashes for slot s.
+        """
+        return clashes.get_clash_matrix(items=self._slots, times=self._slots)
+
+    @functools.cached_property
+    def _decision_variables_by_lesson_day(
+        self,
+    ) -> dict[tuple[str, int], list[lp.LpVariable]]:
+        """
+        The decision variables of each lesson on each day of the week, bucketed in a single pass over the variables.
+        A lesson's variables are all at slots relevant to its year group, so no further filtering is needed.
+        """
+        get_day_of_week = self._inputs.slot_adjacency.get_day_of_week
+        variables_by_lesson_day: dict[tuple[str, int], list[lp.LpVariable]] = {}
+        for key, var in self._decision_variables.items():
+            variables_by_lesson_day.setdefault(
+                (key.lesson_id, get_day_of_week(key.slot_id)), []
+            ).append(var)
+        return variables_by_lesson_day
+
+    @functools.cached_property
+    def _double_period_variables_by_lesson_day(
+        self,
+    ) -> dict[tuple[str, int], list[lp.LpVariable]]:
+        """
+        The double period variables of each lesson on each day of the week, bucketed in a single pass.
+        Bucketing by slot_1_id is sufficient, since slots 1 & 2 are on the same day.
+        """
+        get_day_of_week = self._inputs.slot_adjacency.get_day_of_week
+        variables_by_lesson_day: dict[tuple[str, int], list[lp.LpVariable]] = {}
+        for key, var in self._double_period_variables.items():
+            variables_by_lesson_day.setdefault(
+                (key.lesson_id, get_day_of_week(key.slot_1_id)), []
+            ).append(var)
+        return variables_by_lesson_day
+
+    @functools.cached_property
+    def _teachers(self) -> dict[int, models.Teacher]:
+        return {teacher.pk: teacher for teacher in self._inputs.teachers}
+
+    @functools.cached_property
+    def _classrooms(self) -> dict[int, models.Classroom]:
+        return {classroom.pk: classroom for classroom in self._inputs.classrooms}
+
+    @functools.cached_property
+    def _lessons_by_teacher(self) -> dict[int, list[models.Lesson]]:
+        lessons_by_teacher: dict[int, list[models.Lesson]] = {}
+        for lesson in self._inputs.lessons:
+            if lesson.teacher_id is not None:
+                lessons_by_teacher.setdefault(lesson.teacher_id, []).append(lesson)
+        return lessons_by_teacher
+
+    @functools.cached_property
+    def _lessons_by_classroom(self) -> dict[int, list[models.Lesson]]:
+        lessons_by_classroom: dict[int, list[models.Lesson]] = {}
+        for lesson in self._inputs.lessons:
+            if lesson.classroom_id is not None:
+                lessons_by_classroom.setdefault(lesson.classroom_id, []).append(lesson)
+        return lessons_by_classroom
+
+    @functools.cached_property
+    def _classroom_occupied_slots(self) -> dict[int, np.ndarray]:
+        """
+        The slots each classroom is occupied at by a user defined lesson, as a boolean array over the slots.
+        Equivalent to check_if_classroom_occupied_at_time, for every slot at once.
+        """
+        user_defined_uses: dict[int, np.ndarray] = {}
+        for (
+            classroom_pk,
+            slot_id,
+        ) in models.Lesson.user_defined_time_slots.through.objects.filter(
+            lesson__school_id=self._inputs.school_id, lesson__classroom__isnull=False
+        ).values_list(
+            "lesson__classroom_id", "timetableslot__slot_id"
+        ):
+            uses = user_defined_uses.setdefault(
+                classroom_pk, np.zeros(len(self._slots), dtype=int)
+            )
+            uses[self._slot_index[slot_id]] = 1
+        return {
+            classroom_pk: (uses @ self._slot_clashes) > 0
+            for classroom_pk, uses in user_defined_uses.items()
+        }
+
     # --------------------
     # Double period constraints
     # --------------------
@@ -329,6 +661,8 @@ class TimetableSolverConstraints:
             consecutive TimeSlots IS counted as a double. This is because there is not a decision
             variable for the user defined lesson, so the double period dependent variable relates to
             a single decision variable, so we have that either both are 0 or both are 1.
+
+            In an elastic problem, any shortfall is absorbed by the lesson's slack variable.
             """
             variables_sum = lp.lpSum(
                 [
@@ -336,9 +670,14 @@ class TimetableSolverConstraints:
                     for key, var in self._double_period_variables.items()
                     if key.lesson_id == lesson.lesson_id
                 ]
+                + [self._double_period_slack_variables.get(lesson.lesson_id, 0)]
             )
 
-            additional_doubles = lesson.get_n_solver_double_periods_required()
+            additional_doubles = (
+                self._inputs.slot_adjacency.get_n_solver_double_periods_required(
+                    lesson=lesson
+                )
+            )
             constraint = (
                 variables_sum == additional_doubles,
                 f"{lesson.lesson_id}_must_have_{additional_doubles}_additional_double_periods",
@@ -433,6 +772,7 @@ class TimetableSolverConstraints:
         Note: These constraints still allow a stacked triple or quadruple period, hence the need for the constraints
         below restricting the solution to no two double periods in a day (if we do not want triple periods).
         """
+        slot_adjacency = self._inputs.slot_adjacency
 
         def __no_split_lessons_in_a_day_constraint(
             lesson: models.Lesson, day_of_week: constants.Day
@@ -448,42 +788,22 @@ class TimetableSolverConstraints:
             :param day_of_week: the day of week we are disallowing the splitting on
             :return: a tuple of the constraint and the name for that constraint
             """
-            year_group = lesson.get_associated_year_group()
-            slot_ids_on_day = models.TimetableSlot.get_timeslot_ids_on_given_day(
-                school_id=self._inputs.school_id,
-                day_of_week=day_of_week,
-                year_group=year_group,
-            )
+            lesson_day = (lesson.lesson_id, day_of_week)
             # Variables contribution
             periods_on_day = lp.lpSum(
-                [
-                    var
-                    for key, var in self._decision_variables.items()
-                    if (key.slot_id in slot_ids_on_day)
-                    and (key.lesson_id == lesson.lesson_id)
-                ]
+                self._decision_variables_by_lesson_day.get(lesson_day, [])
             )
-
-            # Checking slot_1_id is in slot_ids is sufficient, since 1 & 2 are on same day
             double_periods_on_day = lp.lpSum(
-                [
-                    var
-                    for key, var in self._double_period_variables.items()
-                    if (key.lesson_id == lesson.lesson_id)
-                    and (key.slot_1_id in slot_ids_on_day)
-                ]
+                self._double_period_variables_by_lesson_day.get(lesson_day, [])
             )
+
             # Fixed contribution
-            existing_singles_on_day = (
-                lesson.user_defined_time_slots.get_timeslots_on_given_day(
-                    school_id=self._inputs.school_id,
-                    day_of_week=day_of_week,
-                    year_group=year_group,
-                ).count()
+            existing_singles_on_day = slot_adjacency.get_user_defined_slot_count_on_day(
+                lesson=lesson, day_of_week=day_of_week
             )
             existing_doubles_on_day = (
-                lesson.get_user_defined_double_period_count_on_day(
-                    day_of_week=day_of_week
+                slot_adjacency.get_user_defined_double_period_count_on_day(
+                    lesson=lesson, day_of_week=day_of_week
                 )
             )
             # Since user may have broken the rules, we limit the fixed contribution to 1
@@ -500,7 +820,7 @@ class TimetableSolverConstraints:
         yield from (
             __no_split_lessons_in_a_day_constraint(lesson=lesson, day_of_week=day)
             for lesson in self._inputs.lessons
-            for day in lesson.get_usable_days_of_week()
+            for day in slot_adjacency.get_usable_days_of_week(lesson=lesson)
         )
 
     def _get_all_no_two_doubles_in_a_day_constraints(
@@ -512,6 +832,7 @@ class TimetableSolverConstraints:
         Note: this has the effect of preventing triple periods and above, since a triple
         period is implemented as two doubles.
         """
+        slot_adjacency = self._inputs.slot_adjacency
 
         def __no_two_doubles_in_a_day_constraint(
             lesson: models.Lesson, day_of_week: constants.Day
@@ -519,24 +840,15 @@ class TimetableSolverConstraints:
             """
             Restrict the number of double periods on a single day to 1, for a single lesson.
             """
-            year_group = lesson.get_associated_year_group()
-            slot_ids_on_day = models.TimetableSlot.get_timeslot_ids_on_given_day(
-                school_id=self._inputs.school_id,
-                day_of_week=day_of_week,
-                year_group=year_group,
-            )
             solver_doubles_on_day = lp.lpSum(
-                [  # We only check slot_1_id is in slot_ids, since 1 & 2 are on same day
-                    var
-                    for key, var in self._double_period_variables.items()
-                    if (key.lesson_id == lesson.lesson_id)
-                    and (key.slot_1_id in slot_ids_on_day)
-                ]
+                self._double_period_variables_by_lesson_day.get(
+                    (lesson.lesson_id, day_of_week), []
+                )
             )
 
             existing_doubles_on_day = (
-                lesson.get_user_defined_double_period_count_on_day(
-                    day_of_week=day_of_week
+                slot_adjacency.get_user_defined_double_period_count_on_day(
+                    lesson=lesson, day_of_week=day_of_week
                 )
             )
             existing_doubles_on_day = min(
@@ -552,5 +864,5 @@ class TimetableSolverConstraints:
         yield from (
             __no_two_doubles_in_a_day_constraint(lesson=lesson, day_of_week=day)
             for lesson in self._inputs.lessons
-            for day in lesson.get_usable_days_of_week()
+            for day in slot_adjacency.get_usable_days_of_week(lesson=lesson)
         )
@@ -5,6 +5,7 @@ Module defining the objective function of the timetable solving problem
 
 # Standard library imports
 import datetime as dt
+from collections.abc import Iterable
 
 # Third party imports
 import numpy as np
@@ -30,6 +31,9 @@ class TimetableSolverObjective:
     ):
         self._inputs = inputs
         self._decision_variables = variables.decision_variables
+        self._slack_variables = list(
+            variables.fulfillment_slack_variables.values()
+        ) + list(variables.double_period_slack_variables.values())
 
         # Add some instance attributes for ease of access
         self._timetable_start = self._inputs.timetable_start_hour_as_float
@@ -42,6 +46,10 @@ class TimetableSolverObjective:
         :return None - since the passed problem will be modified in-place
         """
         objective = self._get_free_period_time_of_day_objective()
+        if self._slack_variables:
+            objective += self._get_shortfall_penalty_objective(
+                free_period_objective=objective
+            )
         problem += (objective, "total_timetabling_objective")
 
     def _get_free_period_time_of_day_objective(self) -> lp.LpAffineExpression:
@@ -56,23 +64,58 @@ class TimetableSolverObjective:
         :return - objective_component - the total duration of time between the optimal free time slot and each
         decision variable.
         """
-        objective_component = lp.LpAffineExpression()
+        return lp.LpAffineExpression(
+            (variable, coefficient)
+            for variable, coefficient in zip(
+                self._decision_variables.values(),
+                self.get_free_period_time_of_day_coefficients(),
+            )
+            if coefficient != 0
+        )
 
-        for key, variable in self._decision_variables.items():
+    def get_free_period_time_of_day_coefficients(self) -> list[float]:
+        """
+        Get the coefficient of each decision variable in the free period objective, in the order of the variables.
+
+        :return - the distance in hours between each variable's slot and the (possibly random) optimal free period
+        time. This is drawn once per variable, so the order of the decision variables matters.
+        """
+        coefficients = []
+        for key in self._decision_variables.keys():
             # Get the time of the slot corresponding to the variable
             slot_time = self._inputs.get_time_starts_at_from_slot_id(
                 slot_id=key.slot_id
             )
 
             repulsive_time = self._get_optimal_free_period_time()
-            difference_hours = abs(repulsive_time - slot_time.hour)
+            # If the variable's varValue = 1 (i.e. the associated class takes place at this time in the solution)
+            # then we get a non-zero contribution
+            coefficients.append(abs(repulsive_time - slot_time.hour))
 
-            # If variable.varValue = 1 (i.e. the associated class takes place at this time in the solution)
-            # then we get a non-zero contribution below
-            contribution = difference_hours * variable
-            objective_component += contribution
+        return coefficients
 
-        return objective_component
+    @staticmethod
+    def get_shortfall_penalty(free_period_coefficients: Iterable[float]) -> float:
+        """
+        Get the penalty per unit of slack, which is larger than the greatest possible value of the free
+        period objective.
+        """
+        return 1 + sum(abs(coefficient) for coefficient in free_period_coefficients)
+
+    def _get_shortfall_penalty_objective(
+        self, free_period_objective: lp.LpAffineExpression
+    ) -> lp.LpAffineExpression:
+        """
+        In an elastic problem, penalise each unit of slack, i.e. each required slot / double period not assigned.
+
+        The penalty per unit of slack is larger than the greatest possible value of the free period objective,
+        so that fulfilling one more slot is always preferred to any arrangement of free periods.
+        :return - objective_component - the (negative) total penalty for not fulfilling lessons.
+        """
+        penalty = self.get_shortfall_penalty(
+            free_period_coefficients=free_period_objective.values()
+        )
+        return -penalty * lp.lpSum(self._slack_variables)
 
     def _get_optimal_free_period_time(self) -> float:
         """
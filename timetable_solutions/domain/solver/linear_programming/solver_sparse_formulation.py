@@ -0,0 +1,808 @@
+"""
+Formulation of the timetabling problem straight into a SparseModel, without building any PuLP expressions.
+"""
+
+# Standard library imports
+import functools
+from collections import defaultdict
+from collections.abc import Callable
+
+# Third party imports
+import numpy as np
+import pulp as lp
+
+# Local application imports
+from data import constants, models
+from domain.solver.filters import clashes
+from domain.solver.instrumentation import (
+    ConstraintFamilySize,
+    FormulationReport,
+    PhaseTimer,
+)
+from domain.solver.linear_programming.solver_objective import TimetableSolverObjective
+from domain.solver.linear_programming.solver_variables import (
+    TimetableSolverVariables,
+    var_key,
+)
+from domain.solver.linear_programming.sparse_model import SparseModel
+from domain.solver.solver_input_data import TimetableSolverInputs
+
+# Enough to give every (lesson, day) pair a unique integer key
+_N_DAYS = len(constants.Day) + 1
+
+
+class TimetableSolverSparseFormulation:
+    """
+    Define the same constraints and objective as TimetableSolverConstraints and TimetableSolverObjective,
+    with each family of constraints assembled as arrays from index structures over the bulk-loaded inputs.
+
+    The columns of the model are the decision variables, then the double period variables, then any slack variables.
+    The clash constraints are always added up front, since solving from an MPS file can't add them lazily.
+    Rows that have no variables, and which every solution satisfies, are left out.
+    """
+
+    def __init__(
+        self, inputs: TimetableSolverInputs, variables: TimetableSolverVariables
+    ):
+        self._inputs = inputs
+        self._variables = variables
+        self.model = SparseModel(
+            variables=[
+                *variables.decision_variables.values(),
+                *variables.double_period_variables.values(),
+                *variables.fulfillment_slack_variables.values(),
+                *variables.double_period_slack_variables.values(),
+            ]
+        )
+
+        self._lessons = list(inputs.lessons)
+        self._slots = list(inputs.timetable_slots)
+        self._lesson_index = {
+            lesson.lesson_id: index for index, lesson in enumerate(self._lessons)
+        }
+        self._slot_index = {
+            slot.slot_id: index for index, slot in enumerate(self._slots)
+        }
+        self._slot_days = np.array(
+            [slot.day_of_week for slot in self._slots], dtype=int
+        )
+        # Column s holds the slots clashing with slot s, i.e. filter_queryset_for_clashes for slot s
+        self._slot_clashes = clashes.get_clash_matrix(
+            items=self._slots, times=self._slots
+        )
+
+        # Decision variable columns
+        self.decision_columns = {
+            key: column for column, key in enumerate(variables.decision_variables)
+        }
+        self._decision_lessons = np.array(
+            [self._lesson_index[key.lesson_id] for key in self.decision_columns],
+            dtype=int,
+        )
+        self._decision_slots = np.array(
+            [self._slot_index[key.slot_id] for key in self.decision_columns], dtype=int
+        )
+        # The column of each (lesson, slot) decision variable, or -1 if there isn't one
+        self._decision_column_array = np.full(
+            (len(self._lessons), len(self._slots)), -1, dtype=int
+        )
+        self._decision_column_array[
+            self._decision_lessons, self._decision_slots
+        ] = np.arange(len(self.decision_columns))
+
+        # Double period variable columns
+        offset = len(self.decision_columns)
+        self._double_keys = list(variables.double_period_variables)
+        self._double_columns = offset + np.arange(len(self._double_keys))
+        self._double_lessons = np.array(
+            [self._lesson_index[key.lesson_id] for key in self._double_keys], dtype=int
+        )
+        self._double_slot_1s = np.array(
+            [self._slot_index[key.slot_1_id] for key in self._double_keys], dtype=int
+        )
+        self._double_slot_2s = np.array(
+            [self._slot_index[key.slot_2_id] for key in self._double_keys], dtype=int
+        )
+
+        # Slack variable columns
+        offset += len(self._double_keys)
+        self._fulfillment_slack_columns = {
+            lesson_id: offset + index
+            for index, lesson_id in enumerate(variables.fulfillment_slack_variables)
+        }
+        offset += len(self._fulfillment_slack_columns)
+        self._double_period_slack_columns = {
+            lesson_id: offset + index
+            for index, lesson_id in enumerate(variables.double_period_slack_variables)
+        }
+
+        self._load_relationships()
+
+    def add_constraints_to_model(
+        self, timer: PhaseTimer | None = None, report: FormulationReport | None = None
+    ) -> None:
+        """
+        Add all relevant constraints to the model, using the same families (and phase names) as the PuLP formulation.
+        """
+        add_family = functools.partial(
+            self._add_row_family,
+            timer=timer or PhaseTimer(),
+            report=report or FormulationReport(),
+        )
+
+        add_family(name="fulfillment", add_rows=self._add_fulfillment_rows)
+        add_family(name="pupil", add_rows=self._add_pupil_rows)
+        add_family(name="teacher", add_rows=self._add_teacher_rows)
+        add_family(name="classroom", add_rows=self._add_classroom_rows)
+        add_family(
+            name="double period fulfillment",
+            add_rows=self._add_double_period_fulfillment_rows,
+        )
+        add_family(
+            name="double period dependency",
+            add_rows=self._add_double_period_dependency_rows,
+        )
+
+        if not self._inputs.solution_specification.allow_split_lessons_within_each_day:
+            add_family(
+                name="no split lessons in a day",
+                add_rows=self._add_no_split_lessons_in_a_day_rows,
+            )
+
+        if not self._inputs.solution_specification.allow_triple_periods_and_above:
+            add_family(
+                name="no two doubles in a day",
+                add_rows=self._add_no_two_doubles_in_a_day_rows,
+            )
+
+    def _add_row_family(
+        self,
+        timer: PhaseTimer,
+        report: FormulationReport,
+        name: str,
+        add_rows: Callable[[], None],
+    ) -> None:
+        """
+        Add one family of rows to the model, recording how long this took and how big the family is.
+        """
+        first_row = self.model.n_constraints
+        with timer.phase(f"constraints: {name}"):
+            add_rows()
+        report.add_family(
+            ConstraintFamilySize.from_sparse_model(
+                name=name,
+                wall_time_seconds=timer.phases[-1].wall_time_seconds,
+                model=self.model,
+                first_row=first_row,
+            )
+        )
+
+    def add_objective_to_model(self, objective_maker: TimetableSolverObjective) -> None:
+        """
+        Set the same objective as the PuLP formulation, which uses the same (random) coefficients.
+        """
+        coefficients = objective_maker.get_free_period_time_of_day_coefficients()
+        self.model.objective[: len(coefficients)] = coefficients
+        if self._fulfillment_slack_columns or self._double_period_slack_columns:
+            penalty = objective_maker.get_shortfall_penalty(
+                free_period_coefficients=coefficients
+            )
+            slack_columns = [
+                *self._fulfillment_slack_columns.values(),
+                *self._double_period_slack_columns.values(),
+            ]
+            self.model.objective[slack_columns] = -penalty
+
+    def add_exclusion_row(self, assignment: list[var_key], name: str) -> None:
+        """
+        Add a 'no-good' cut excluding the passed assignment, as in TimetableSolver.exclude_assignment.
+        """
+        if self._inputs.solution_specification.allow_partial_timetable:
+            coefficients = -np.ones(len(self.decision_columns))
+            coefficients[[self.decision_columns[key] for key in assignment]] = 1
+            self.model.add_rows(
+                rows=np.zeros(len(self.decision_columns), dtype=int),
+                columns=np.arange(len(self.decision_columns)),
+                coefficients=coefficients,
+                senses=np.array([lp.LpConstraintLE]),
+                rhs=np.array([len(assignment) - 1]),
+                names=[name],
+            )
+            return None
+
+        self.model.add_row_sums(
+            column_lists=[[self.decision_columns[key] for key in assignment]],
+            senses=np.array([lp.LpConstraintLE]),
+            rhs=np.array([len(assignment) - 1]),
+            names=[name],
+        )
+
+    # --------------------
+    # Fulfillment constraints
+    # --------------------
+
+    def _add_fulfillment_rows(self) -> None:
+        """
+        Each lesson is assigned the required number of slots, less any shortfall in an elastic problem.
+        """
+        n_user_defined = np.bincount(
+            self._user_defined_lessons[self._user_defined_lessons >= 0],
+            minlength=len(self._lessons),
+        )
+        required = (
+            np.array(
+                [lesson.total_required_slots for lesson in self._lessons], dtype=int
+            )
+            - n_user_defined
+        )
+
+        slack_lessons = np.array(
+            [
+                self._lesson_index[lesson_id]
+                for lesson_id in self._fulfillment_slack_columns
+            ],
+            dtype=int,
+        )
+        self.model.add_rows(
+            rows=np.concatenate([self._decision_lessons, slack_lessons]),
+            columns=np.concatenate(
+                [
+                    np.arange(len(self._decision_lessons)),
+                    list(self._fulfillment_slack_columns.values()),
+                ]
+            ),
+            coefficients=np.ones(len(self._decision_lessons) + len(slack_lessons)),
+            senses=np.full(len(self._lessons), lp.LpConstraintEQ),
+            rhs=required,
+            names=[
+                f"{lesson.lesson_id}_taught_for_{n_required}_additional_slots"
+                for lesson, n_required in zip(self._lessons, required)
+            ],
+        )
+
+    # --------------------
+    # One place at a time constraints
+    # --------------------
+
+    def _add_pupil_rows(self) -> None:
+        """
+        Each pupil attends at most one lesson at each of their year group's slots, and none if they are busy.
+        """
+        n_slots = len(self._slots)
+        pupils = list(self._inputs.pupils)
+        pupil_index = {pupil.pk: index for index, pupil in enumerate(pupils)}
+        pupil_year_groups = np.array(
+            [self._year_group_index[pupil.year_group_id] for pupil in pupils], dtype=int
+        )
+
+        # The slots each pupil is busy at, with a user defined lesson or a break (P x S)
+        user_defined_slots = np.zeros((len(pupils), n_slots), dtype=int)
+        for lesson_pk, pupil_pk in self._pupil_lesson_rows:
+            for slot in self._user_defined_slots_by_lesson_pk.get(lesson_pk, []):
+                user_defined_slots[pupil_index[pupil_pk], slot] = 1
+        busy = ((user_defined_slots @ self._slot_clashes) > 0) | (
+            (
+                self._year_group_breaks[pupil_year_groups].astype(int)
+                @ self._break_slot_clashes
+            )
+            > 0
+        )
+
+        # Group the decision variables of each pupil's lessons by (pupil, slot)
+        pupil_lessons = [
+            (pupil_index[pupil_pk], lesson_index)
+            for lesson_pk, pupil_pk in self._pupil_lesson_rows
+            if (lesson_index := self._lesson_pk_index.get(lesson_pk)) is not None
+        ]
+        keys, columns = self._expand_decision_columns(
+            owner_lessons=pupil_lessons, n_slots=n_slots
+        )
+        # Only the pupil's year group slots are constrained, and empty rows are trivially satisfied
+        in_year_group = self._year_group_slots[pupil_year_groups].ravel()
+        counts = np.bincount(keys, minlength=len(pupils) * n_slots)
+        row_keys = np.flatnonzero(in_year_group & (counts > 0))
+
+        row_busy = busy.ravel()[row_keys]
+        self._add_rows_for_keys(
+            keys=keys,
+            columns=columns,
+            row_keys=row_keys,
+            senses=np.where(row_busy, lp.LpConstraintEQ, lp.LpConstraintLE),
+            rhs=np.where(row_busy, 0, 1),
+            names=[
+                f"pupil_{pupils[key // n_slots].pupil_id}_"
+                f"{'unavailable' if is_busy else 'available'}_at_{self._slots[key % n_slots].slot_id}"
+                for key, is_busy in zip(row_keys, row_busy)
+            ],
+        )
+
+    def _add_teacher_rows(self) -> None:
+        """
+        Each teacher teaches at most one lesson at each slot, and at most one of each pair of clashing slots.
+        """
+        n_slots = len(self._slots)
+        teachers = list(self._inputs.teachers)
+        teacher_index = {teacher.pk: index for index, teacher in enumerate(teachers)}
+        keys, columns = self._expand_decision_columns(
+            owner_lessons=[
+                (teacher_index[lesson.teacher_id], index)
+                for index, lesson in enumerate(self._lessons)
+                if lesson.teacher_id is not None
+            ],
+            n_slots=n_slots,
+        )
+
+        # Rows at a single slot
+        counts = np.bincount(keys, minlength=len(teachers) * n_slots)
+        single_keys = np.flatnonzero(counts)
+        self._add_rows_for_keys(
+            keys=keys,
+            columns=columns,
+            row_keys=single_keys,
+            senses=np.full(len(single_keys), lp.LpConstraintLE),
+            rhs=np.ones(len(single_keys)),
+            names=[
+                f"teacher_{teachers[key // n_slots].teacher_id}_available_at_{self._slots[key % n_slots].slot_id}"
+                for key in single_keys
+            ],
+        )
+
+        # Rows at each (slot, other clashing slot) pair, for the teachers with lessons at either slot
+        slot_pairs = np.argwhere(self._slot_clashes.T & ~np.eye(n_slots, dtype=bool))
+        teacher_has_lesson_at = (counts > 0).reshape(len(teachers), n_slots)
+        pair_teachers, pair_indexes = np.nonzero(
+            teacher_has_lesson_at[:, slot_pairs[:, 0]]
+            | teacher_has_lesson_at[:, slot_pairs[:, 1]]
+        )
+        first_keys = pair_teachers * n_slots + slot_pairs[pair_indexes, 0]
+        second_keys = pair_teachers * n_slots + slot_pairs[pair_indexes, 1]
+        first_rows, first_columns = self._gather(keys, columns, first_keys)
+        second_rows, second_columns = self._gather(keys, columns, second_keys)
+        self.model.add_rows(
+            rows=np.concatenate([first_rows, second_rows]),
+            columns=np.concatenate([first_columns, second_columns]),
+            coefficients=np.ones(len(first_columns) + len(second_columns)),
+            senses=np.full(len(first_keys), lp.LpConstraintLE),
+            rhs=np.ones(len(first_keys)),
+            names=[
+                f"teacher_{teachers[teacher].teacher_id}_available_at_one_of_"
+                f"{self._slots[slot].slot_id}_and_{self._slots[other_slot].slot_id}"
+                for teacher, (slot, other_slot) in zip(
+                    pair_teachers, slot_pairs[pair_indexes]
+                )
+            ],
+        )
+
+    def _add_classroom_rows(self) -> None:
+        """
+        Each classroom hosts at most one lesson across the slots clashing with each slot, and none if occupied.
+        """
+        n_slots = len(self._slots)
+        classrooms = list(self._inputs.classrooms)
+        classroom_index = {
+            classroom.pk: index for index, classroom in enumerate(classrooms)
+        }
+        keys, columns = self._expand_decision_columns(
+            owner_lessons=[
+                (classroom_index[lesson.classroom_id], index)
+                for index, lesson in enumerate(self._lessons)
+                if lesson.classroom_id is not None
+            ],
+            n_slots=n_slots,
+        )
+        # Each variable at slot o contributes to the row of every slot s that o clashes with
+        owners, variable_slots = np.divmod(keys, n_slots)
+        variables, row_slots = np.nonzero(self._slot_clashes[variable_slots])
+        row_keys_by_entry = owners[variables] * n_slots + row_slots
+        row_keys, entry_rows = np.unique(row_keys_by_entry, return_inverse=True)
+
+        # The slots each classroom is occupied at, by a user defined lesson
+        user_defined_uses = np.zeros((len(classrooms), n_slots), dtype=int)
+        for classroom_pk, slot in self._user_defined_classroom_slots:
+            user_defined_uses[classroom_index[classroom_pk], slot] = 1
+        occupied = ((user_defined_uses @ self._slot_clashes) > 0).ravel()[row_keys]
+
+        self.model.add_rows(
+            rows=entry_rows,
+            columns=columns[variables],
+            coefficients=np.ones(len(variables)),
+            senses=np.where(occupied, lp.LpConstraintEQ, lp.LpConstraintLE),
+            rhs=np.where(occupied, 0, 1),
+            names=[
+                f"classroom_{classrooms[key // n_slots].classroom_id}_"
+                f"{'occupied' if is_occupied else 'unoccupied'}_at_{self._slots[key % n_slots].slot_id}"
+                for key, is_occupied in zip(row_keys, occupied)
+            ],
+        )
+
+    # --------------------
+    # Double period constraints
+    # --------------------
+
+    def _add_double_period_fulfillment_rows(self) -> None:
+        """
+        Each lesson has the required number of double periods, less any shortfall in an elastic problem.
+        """
+        lessons = [
+            lesson
+            for lesson in self._lessons
+            if lesson.total_required_double_periods != 0
+        ]
+        row_index = {lesson.lesson_id: row for row, lesson in enumerate(lessons)}
+        column_lists: list[list[int]] = [[] for _ in lessons]
+        for key, column in zip(self._double_keys, self._double_columns):
+            column_lists[row_index[key.lesson_id]].append(column)
+        for lesson_id, column in self._double_period_slack_columns.items():
+            column_lists[row_index[lesson_id]].append(column)
+
+        additional_doubles = [
+            self._inputs.slot_adjacency.get_n_solver_double_periods_required(
+                lesson=lesson
+            )
+            for lesson in lessons
+        ]
+        self.model.add_row_sums(
+            column_lists=column_lists,
+            senses=np.full(len(lessons), lp.LpConstraintEQ),
+            rhs=np.array(additional_doubles),
+            names=[
+                f"{lesson.lesson_id}_must_have_{n_doubles}_additional_double_periods"
+                for lesson, n_doubles in zip(lessons, additional_doubles)
+            ],
+        )
+
+    def _add_double_period_dependency_rows(self) -> None:
+        """
+        A double period can only happen at two slots if the lesson happens at both.
+
+        Where the lesson is already user defined at one of the slots, the double period happens exactly when
+        the lesson happens at the other slot. Where it is user defined at both, no row is needed.
+        """
+        slot_1_columns = self._decision_column_array[
+            self._double_lessons, self._double_slot_1s
+        ]
+        slot_2_columns = self._decision_column_array[
+            self._double_lessons, self._double_slot_2s
+        ]
+
+        row_columns = []
+        senses = []
+        names = []
+        for key, double_column, slot_column, other_slot_column, is_slot_1 in [
+            *zip(
+                self._double_keys,
+                self._double_columns,
+                slot_1_columns,
+                slot_2_columns,
+                [True] * len(self._double_keys),
+            ),
+            *zip(
+                self._double_keys,
+                self._double_columns,
+                slot_2_columns,
+                slot_1_columns,
+                [False] * len(self._double_keys),
+            ),
+        ]:
+            slot_id, other_slot_id = (
+                (key.slot_1_id, key.slot_2_id)
+                if is_slot_1
+                else (key.slot_2_id, key.slot_1_id)
+            )
+            if slot_column >= 0:
+                row_columns.append((slot_column, double_column))
+                senses.append(lp.LpConstraintGE)
+                position = "start" if is_slot_1 else "end"
+                names.append(f"{key.lesson_id}_double_could_{position}_at_{slot_id}")
+            elif other_slot_column >= 0:
+                row_columns.append((other_slot_column, double_column))
+                senses.append(lp.LpConstraintEQ)
+                names.append(
+                    f"{key.lesson_id}_occurs_at_{other_slot_id}_if_and_only_if_a_"
+                    f"double_period_is_created_with_the_user_defined_slot_at_{slot_id}"
+                )
+
+        n_rows = len(row_columns)
+        self.model.add_rows(
+            rows=np.repeat(np.arange(n_rows), 2),
+            columns=np.array(row_columns, dtype=int).reshape(-1),
+            coefficients=np.tile([1, -1], n_rows),
+            senses=np.array(senses),
+            rhs=np.zeros(n_rows),
+            names=names,
+        )
+
+    # --------------------
+    # Structural constraints
+    # --------------------
+
+    def _add_no_split_lessons_in_a_day_rows(self) -> None:
+        """
+        Each lesson is taught at most once a day, where a double period counts once, as do any user defined slots.
+        """
+        # The user defined slots of each lesson on each day, in the lesson's year group
+        user_defined_singles: dict[int, int] = defaultdict(int)
+        for lesson_index, slot in zip(
+            self._user_defined_lessons, self._user_defined_slots
+        ):
+            if lesson_index < 0:
+                continue
+            year_group = self._lesson_year_groups[lesson_index]
+            if year_group >= 0 and self._year_group_slots[year_group, slot]:
+                user_defined_singles[
+                    lesson_index * _N_DAYS + self._slot_days[slot]
+                ] += 1
+
+        row_keys, fixed_contributions = [], []
+        for lesson_index, lesson in enumerate(self._lessons):
+            for day in self._inputs.slot_adjacency.get_usable_days_of_week(
+                lesson=lesson
+            ):
+                key = lesson_index * _N_DAYS + day
+                existing_doubles = self._inputs.slot_adjacency.get_user_defined_double_period_count_on_day(
+                    lesson=lesson, day_of_week=day
+                )
+                row_keys.append(key)
+                # Since user may have broken the rules, we limit the fixed contribution to 1
+                fixed_contributions.append(
+                    min(user_defined_singles[key] - existing_doubles, 1)
+                )
+
+        self._add_lesson_day_rows(
+            row_keys=np.array(row_keys, dtype=int),
+            include_decision_variables=True,
+            rhs=1 - np.array(fixed_contributions, dtype=int),
+            name_format="no_split_{lesson_id}_classes_on_day_{day}",
+        )
+
+    def _add_no_two_doubles_in_a_day_rows(self) -> None:
+        """
+        Each lesson has at most one double period a day, which prevents triple periods and above.
+        """
+        row_keys, existing_doubles = [], []
+        for lesson_index, lesson in enumerate(self._lessons):
+            for day in self._inputs.slot_adjacency.get_usable_days_of_week(
+                lesson=lesson
+            ):
+                row_keys.append(lesson_index * _N_DAYS + day)
+                existing_doubles.append(
+                    self._inputs.slot_adjacency.get_user_defined_double_period_count_on_day(
+                        lesson=lesson, day_of_week=day
+                    )
+                )
+
+        self._add_lesson_day_rows(
+            row_keys=np.array(row_keys, dtype=int),
+            include_decision_variables=False,
+            # Since user may have broken the rules
+            rhs=1 - np.minimum(np.array(existing_doubles, dtype=int), 1),
+            name_format="max_one_{lesson_id}_double_day_{day}",
+        )
+
+    def _add_lesson_day_rows(
+        self,
+        row_keys: np.ndarray,
+        include_decision_variables: bool,
+        rhs: np.ndarray,
+        name_format: str,
+    ) -> None:
+        """
+        Add a row per (lesson, day) key, on the lesson's double period variables starting that day (with a
+        coefficient of -1 when the decision variables that day are also included, and +1 otherwise).
+        """
+        key_parts = []
+        column_parts = []
+        coefficient_parts = []
+        if include_decision_variables:
+            key_parts.append(
+                self._decision_lessons * _N_DAYS + self._slot_days[self._decision_slots]
+            )
+            column_parts.append(np.arange(len(self._decision_lessons)))
+            coefficient_parts.append(np.ones(len(self._decision_lessons)))
+        key_parts.append(
+            self._double_lessons * _N_DAYS + self._slot_days[self._double_slot_1s]
+        )
+        column_parts.append(self._double_columns)
+        coefficient_parts.append(
+            np.full(len(self._double_keys), -1 if include_decision_variables else 1)
+        )
+        keys = np.concatenate(key_parts)
+        columns = np.concatenate(column_parts)
+        coefficients = np.concatenate(coefficient_parts)
+
+        # Rows without variables are trivially satisfied
+        has_variables = np.isin(row_keys, keys)
+        row_keys, rhs = row_keys[has_variables], rhs[has_variables]
+        entries = np.isin(keys, row_keys)
+        entry_rows = np.searchsorted(np.sort(row_keys), keys[entries])
+        row_order = np.argsort(row_keys)
+
+        sorted_keys = row_keys[row_order]
+        self.model.add_rows(
+            rows=entry_rows,
+            columns=columns[entries],
+            coefficients=coefficients[entries],
+            senses=np.full(len(sorted_keys), lp.LpConstraintLE),
+            rhs=rhs[row_order],
+            names=[
+                name_format.format(
+                    lesson_id=self._lessons[key // _N_DAYS].lesson_id,
+                    day=key % _N_DAYS,
+                )
+                for key in sorted_keys
+            ],
+        )
+
+    # --------------------
+    # Helper methods
+    # --------------------
+
+    def _expand_decision_columns(
+        self, owner_lessons: list[tuple[int, int]], n_slots: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the decision variable columns of each owner (e.g. a teacher), keyed by owner * n_slots + slot.
+
+        :param owner_lessons: (owner index, lesson index) pairs.
+        :return: the key and column of each decision variable belonging to an owner, sorted by key.
+        """
+        owners_by_lesson: dict[int, list[int]] = defaultdict(list)
+        for owner, lesson_index in owner_lessons:
+            owners_by_lesson[lesson_index].append(owner)
+        lesson_owner_counts = np.array(
+            [len(owners_by_lesson[index]) for index in range(len(self._lessons))],
+            dtype=int,
+        )
+
+        # Repeat each variable once per owner of its lesson
+        variable_owner_counts = lesson_owner_counts[self._decision_lessons]
+        variables = np.repeat(
+            np.arange(len(self._decision_lessons)), variable_owner_counts
+        )
+        owners = np.fromiter(
+            (
+                owner
+                for lesson_index in self._decision_lessons
+                for owner in owners_by_lesson[lesson_index]
+            ),
+            dtype=int,
+            count=len(variables),
+        )
+        keys = owners * n_slots + self._decision_slots[variables]
+        order = np.argsort(keys, kind="stable")
+        return keys[order], variables[order]
+
+    @staticmethod
+    def _gather(
+        keys: np.ndarray, columns: np.ndarray, row_keys: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the columns with each of the row keys, and the (position of) the row key they were found for.
+
+        :param keys: sorted keys, with the columns in the same order.
+        """
+        starts = np.searchsorted(keys, row_keys, side="left")
+        counts = np.searchsorted(keys, row_keys, side="right") - starts
+        total = int(counts.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return (
+            np.repeat(np.arange(len(row_keys)), counts),
+            columns[np.repeat(starts, counts) + offsets],
+        )
+
+    def _add_rows_for_keys(
+        self,
+        keys: np.ndarray,
+        columns: np.ndarray,
+        row_keys: np.ndarray,
+        senses: np.ndarray,
+        rhs: np.ndarray,
+        names: list[str],
+    ) -> None:
+        """
+        Add a row on the sum of the columns with each of the row keys.
+        """
+        rows, row_columns = self._gather(keys, columns, row_keys)
+        self.model.add_rows(
+            rows=rows,
+            columns=row_columns,
+            coefficients=np.ones(len(row_columns)),
+            senses=senses,
+            rhs=rhs,
+            names=names,
+        )
+
+    def _load_relationships(self) -> None:
+        """
+        Load the relationships between the school's data needed to assemble the rows, with a query per relationship.
+        """
+        school_id = self._inputs.school_id
+        slot_pk_index = {slot.pk: index for index, slot in enumerate(self._slots)}
+        self._lesson_pk_index = {
+            lesson.pk: index for index, lesson in enumerate(self._lessons)
+        }
+
+        # Year groups (G x S)
+        year_group_pks = models.YearGroup.objects.get_all_instances_for_school(
+            school_id=school_id
+        ).values_list("pk", flat=True)
+        self._year_group_index = {pk: index for index, pk in enumerate(year_group_pks)}
+        self._year_group_slots = np.zeros(
+            (len(self._year_group_index), len(self._slots)), dtype=bool
+        )
+        slot_year_groups = models.TimetableSlot.relevant_year_groups.through.objects
+        for slot_pk, year_group_pk in slot_year_groups.filter(
+            timetableslot__school_id=school_id
+        ).values_list("timetableslot_id", "yeargroup_id"):
+            self._year_group_slots[
+                self._year_group_index[year_group_pk], slot_pk_index[slot_pk]
+            ] = True
+        self._lesson_year_groups = np.array(
+            [
+                -1
+                if (
+                    year_group_pk := self._inputs.slot_adjacency.get_year_group_pk(
+                        lesson
+                    )
+                )
+                is None
+                else self._year_group_index[year_group_pk]
+                for lesson in self._lessons
+            ],
+            dtype=int,
+        )
+
+        # User defined slots, of all the school's lessons
+        user_defined_slots = models.Lesson.user_defined_time_slots.through.objects
+        user_defined_rows = list(
+            user_defined_slots.filter(lesson__school_id=school_id).values_list(
+                "lesson_id", "timetableslot_id", "lesson__classroom_id"
+            )
+        )
+        self._user_defined_slots_by_lesson_pk: dict[int, list[int]] = defaultdict(list)
+        for lesson_pk, slot_pk, _ in user_defined_rows:
+            self._user_defined_slots_by_lesson_pk[lesson_pk].append(
+                slot_pk_index[slot_pk]
+            )
+        # The (solver) lesson index of each user defined slot, or -1 for lessons not requiring solving
+        self._user_defined_lessons = np.array(
+            [
+                self._lesson_pk_index.get(lesson_pk, -1)
+                for lesson_pk, _, _ in user_defined_rows
+            ],
+            dtype=int,
+        )
+        self._user_defined_slots = np.array(
+            [slot_pk_index[slot_pk] for _, slot_pk, _ in user_defined_rows], dtype=int
+        )
+        self._user_defined_classroom_slots = [
+            (classroom_pk, slot_pk_index[slot_pk])
+            for _, slot_pk, classroom_pk in user_defined_rows
+            if classroom_pk is not None
+        ]
+
+        # Pupils of all the school's lessons
+        self._pupil_lesson_rows = list(
+            models.Lesson.pupils.through.objects.filter(
+                lesson__school_id=school_id
+            ).values_list("lesson_id", "pupil_id")
+        )
+
+        # Breaks (G x B, B x S)
+        breaks = list(
+            models.Break.objects.get_all_instances_for_school(school_id=school_id)
+        )
+        break_index = {break_.pk: index for index, break_ in enumerate(breaks)}
+        self._year_group_breaks = np.zeros(
+            (len(self._year_group_index), len(breaks)), dtype=bool
+        )
+        break_year_groups = models.Break.relevant_year_groups.through.objects
+        for break_pk, year_group_pk in break_year_groups.filter(
+            break__school_id=school_id
+        ).values_list("break_id", "yeargroup_id"):
+            self._year_group_breaks[
+                self._year_group_index[year_group_pk], break_index[break_pk]
+            ] = True
+        self._break_slot_clashes = clashes.get_clash_matrix(
+            items=breaks, times=self._slots
+        ).astype(int)
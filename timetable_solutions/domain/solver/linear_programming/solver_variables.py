@@ -33,6 +33,17 @@ class TimetableSolverVariables:
             self.decision_variables = self._get_decision_variables()
             self.double_period_variables = self._get_double_period_variables()
 
+            if inputs.solution_specification.allow_partial_timetable:
+                self.fulfillment_slack_variables = (
+                    self._get_fulfillment_slack_variables()
+                )
+                self.double_period_slack_variables = (
+                    self._get_double_period_slack_variables()
+                )
+            else:
+                self.fulfillment_slack_variables = {}
+                self.double_period_slack_variables = {}
+
     def _get_decision_variables(
         self, strip: bool = True
     ) -> dict[var_key, lp.LpVariable]:
@@ -94,11 +105,10 @@ class TimetableSolverVariables:
             if lesson.total_required_double_periods == 0:
                 continue
 
-            relevant_year_group = lesson.get_associated_year_group()
             for (
                 consecutive_slot_pair
-            ) in self._inputs.get_consecutive_slots_for_year_group(
-                year_group=relevant_year_group
+            ) in self._inputs.slot_adjacency.get_consecutive_slots_for_lesson(
+                lesson=lesson
             ):
                 key = doubles_var_key(
                     lesson_id=lesson.lesson_id,
@@ -113,3 +123,43 @@ class TimetableSolverVariables:
                 variables[key] = variable
 
         return variables
+
+    # SLACK VARIABLES
+    def _get_fulfillment_slack_variables(self) -> dict[str, lp.LpVariable]:
+        """
+        Method to get the slack variables used to relax the fulfillment constraints, in an elastic problem.
+
+        For each lesson, there is a variable counting how many of its required slots have not been assigned.
+        Since the decision variables are binary, the slack can only take integer values, so it is left continuous.
+
+        :return - Dictionary of pulp variables, indexed by lesson id
+        """
+        return {
+            lesson.lesson_id: lp.LpVariable(
+                f"{lesson.lesson_id}_unfulfilled_slots",
+                lowBound=0,
+                upBound=lesson.get_n_solver_slots_required(),
+            )
+            for lesson in self._inputs.lessons
+        }
+
+    def _get_double_period_slack_variables(self) -> dict[str, lp.LpVariable]:
+        """
+        Method to get the slack variables used to relax the double period fulfillment constraints, in an elastic problem.
+
+        :return - Dictionary of pulp variables, indexed by lesson id, for lessons requiring double periods
+        """
+        return {
+            lesson.lesson_id: lp.LpVariable(
+                f"{lesson.lesson_id}_unfulfilled_double_periods",
+                lowBound=0,
+                upBound=max(
+                    self._inputs.slot_adjacency.get_n_solver_double_periods_required(
+                        lesson=lesson
+                    ),
+                    0,
+                ),
+            )
+            for lesson in self._inputs.lessons
+            if lesson.total_required_double_periods != 0
+        }
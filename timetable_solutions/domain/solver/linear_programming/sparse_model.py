@@ -0,0 +1,283 @@
+"""
+A mixed integer programme held as NumPy arrays, which can be written straight to an MPS file and solved with CBC.
+"""
+
+# Standard library imports
+import os
+import pathlib
+import subprocess
+import tempfile
+from collections.abc import Sequence
+
+# Third party imports
+import numpy as np
+import pulp as lp
+
+
+class SparseModel:
+    """
+    Class storing a maximisation problem's constraint matrix in coordinate (COO) form.
+
+    Each column is one of the passed PuLP variables, which are only used for their names, bounds and category,
+    and to hand back the solution. Rows are added in blocks of arrays, so no PuLP expressions are ever built.
+    """
+
+    def __init__(self, variables: Sequence[lp.LpVariable]):
+        """
+        :param variables: the columns of the model, in order.
+        """
+        self.variables = list(variables)
+        n_columns = len(self.variables)
+        self.lower_bounds = np.array(
+            [variable.lowBound or 0 for variable in self.variables], dtype=float
+        )
+        self.upper_bounds = np.array(
+            [
+                np.inf if variable.upBound is None else variable.upBound
+                for variable in self.variables
+            ],
+            dtype=float,
+        )
+        self.is_integer = np.array(
+            [variable.cat == lp.LpInteger for variable in self.variables], dtype=bool
+        )
+        self.objective = np.zeros(n_columns, dtype=float)
+
+        self._block_first_rows: list[int] = []
+        self._row_indexes: list[np.ndarray] = []
+        self._column_indexes: list[np.ndarray] = []
+        self._coefficients: list[np.ndarray] = []
+        self._senses: list[np.ndarray] = []
+        self._rhs: list[np.ndarray] = []
+        self.row_names: list[str] = []
+
+        # Set by solve
+        self.status: int = lp.LpStatusNotSolved
+        self.objective_value: float | None = None
+
+    # --------------------
+    # Formulation
+    # --------------------
+
+    def add_rows(
+        self,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        coefficients: np.ndarray,
+        senses: np.ndarray,
+        rhs: np.ndarray,
+        names: list[str],
+    ) -> None:
+        """
+        Add a block of constraints to the model.
+
+        :param rows: the row of each nonzero, numbered from 0 within this block.
+        :param columns: the column of each nonzero.
+        :param coefficients: the value of each nonzero.
+        :param senses: the sense of each row, as one of PuLP's LpConstraintEQ / LE / GE.
+        :param rhs: the right hand side of each row.
+        :param names: the name of each row.
+        """
+        if len(names) == 0:
+            return None
+        self._block_first_rows.append(self.n_constraints)
+        self._row_indexes.append(np.asarray(rows, dtype=np.int64) + self.n_constraints)
+        self._column_indexes.append(np.asarray(columns, dtype=np.int64))
+        self._coefficients.append(np.asarray(coefficients, dtype=float))
+        self._senses.append(np.asarray(senses, dtype=np.int8))
+        self._rhs.append(np.asarray(rhs, dtype=float))
+        self.row_names.extend(names)
+
+    def add_row_sums(
+        self,
+        column_lists: list[list[int]],
+        senses: np.ndarray,
+        rhs: np.ndarray,
+        names: list[str],
+    ) -> None:
+        """
+        Add a block of constraints, each on the (unweighted) sum of some columns.
+        """
+        lengths = np.array([len(columns) for columns in column_lists], dtype=np.int64)
+        columns = np.fromiter(
+            (column for columns in column_lists for column in columns),
+            dtype=np.int64,
+            count=int(lengths.sum()),
+        )
+        self.add_rows(
+            rows=np.repeat(np.arange(len(column_lists)), lengths),
+            columns=columns,
+            coefficients=np.ones(len(columns)),
+            senses=senses,
+            rhs=rhs,
+            names=names,
+        )
+
+    def to_coo(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the constraint matrix as (rows, columns, coefficients) arrays.
+        """
+        if not self._row_indexes:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, np.array([], dtype=float)
+        return (
+            np.concatenate(self._row_indexes),
+            np.concatenate(self._column_indexes),
+            np.concatenate(self._coefficients),
+        )
+
+    def get_columns_from_row(self, first_row: int) -> np.ndarray:
+        """
+        Get the column of each nonzero in the rows from first_row onwards (e.g. those of one family of constraints).
+        """
+        columns = [
+            block_columns
+            for block_first_row, block_columns in zip(
+                self._block_first_rows, self._column_indexes
+            )
+            if block_first_row >= first_row
+        ]
+        return np.concatenate(columns) if columns else np.array([], dtype=np.int64)
+
+    @property
+    def senses(self) -> np.ndarray:
+        return np.concatenate(self._senses) if self._senses else np.array([])
+
+    @property
+    def rhs(self) -> np.ndarray:
+        return np.concatenate(self._rhs) if self._rhs else np.array([])
+
+    @property
+    def n_variables(self) -> int:
+        return len(self.variables)
+
+    @property
+    def n_constraints(self) -> int:
+        return len(self.row_names)
+
+    @property
+    def n_nonzeros(self) -> int:
+        return sum(len(coefficients) for coefficients in self._coefficients)
+
+    # --------------------
+    # Solving
+    # --------------------
+
+    def write_mps(self, path: str | pathlib.Path) -> None:
+        """
+        Write the model as a fixed format MPS file, laid out as by PuLP's writeMPS with renaming.
+
+        The columns are named X0000000, X0000001, ... and the rows R0000000, ... so that each column's
+        solution value can be found by its index. MPS files are minimised, so the objective is negated.
+        """
+        rows, columns, coefficients = self.to_coo()
+        order = np.lexsort((rows, columns))
+        rows, columns, coefficients = rows[order], columns[order], coefficients[order]
+        row_types = {
+            lp.LpConstraintEQ: "E",
+            lp.LpConstraintLE: "L",
+            lp.LpConstraintGE: "G",
+        }
+
+        lines = ["NAME          MODEL", "ROWS", " N  OBJ"]
+        lines.extend(
+            f" {row_types[sense]}  R{index:07d}"
+            for index, sense in enumerate(self.senses)
+        )
+
+        lines.append("COLUMNS")
+        # The nonzeros of each column are contiguous once sorted
+        column_starts = np.searchsorted(columns, np.arange(self.n_variables + 1))
+        in_integer_block = False
+        for column in range(self.n_variables):
+            if self.is_integer[column] != in_integer_block:
+                marker = "INTORG" if self.is_integer[column] else "INTEND"
+                lines.append(f"    MARK      'MARKER'                 '{marker}'")
+                in_integer_block = bool(self.is_integer[column])
+            name = f"X{column:07d}"
+            start, end = column_starts[column], column_starts[column + 1]
+            lines.extend(
+                _mps_line(name, f"R{row:07d}", coefficient)
+                for row, coefficient in zip(rows[start:end], coefficients[start:end])
+            )
+            # Every column must appear at least once, so the objective entry is written even when zero
+            lines.append(_mps_line(name, "OBJ", -self.objective[column]))
+        if in_integer_block:
+            lines.append("    MARK      'MARKER'                 'INTEND'")
+
+        lines.append("RHS")
+        rhs = self.rhs
+        lines.extend(
+            _mps_line("RHS", f"R{row:07d}", rhs[row]) for row in np.flatnonzero(rhs)
+        )
+
+        lines.append("BOUNDS")
+        for column in range(self.n_variables):
+            lower, upper = self.lower_bounds[column], self.upper_bounds[column]
+            if lower != 0:
+                lines.append(" LO " + _mps_line("BND", f"X{column:07d}", lower)[4:])
+            if upper != np.inf:
+                lines.append(" UP " + _mps_line("BND", f"X{column:07d}", upper)[4:])
+        lines.append("ENDATA")
+
+        pathlib.Path(path).write_text("\n".join(lines) + "\n")
+
+    def solve(self, solver: lp.PULP_CBC_CMD | None = None) -> None:
+        """
+        Solve the model with the CBC binary shipped with PuLP, and set the value of each variable.
+
+        :param solver: used for its path, time limit and options - the default PuLP solver is used if not passed.
+        """
+        solver = solver or lp.PULP_CBC_CMD(msg=False)
+        if not solver.executable(solver.path):
+            raise lp.PulpSolverError(f"Pulp: cannot execute {solver.path}")
+
+        with tempfile.TemporaryDirectory() as directory:
+            mps_path = os.path.join(directory, "model.mps")
+            solution_path = os.path.join(directory, "model.sol")
+            self.write_mps(mps_path)
+
+            args = [solver.path, mps_path]
+            if solver.timeLimit is not None:
+                args += ["sec", str(solver.timeLimit)]
+            for option in solver.options + solver.getOptions():
+                args += option.split()
+            args += ["branch", "printingOptions", "all", "solution", solution_path]
+            result = subprocess.run(
+                args, stdout=None if solver.msg else subprocess.DEVNULL, stderr=None
+            )
+            if result.returncode != 0 or not os.path.exists(solution_path):
+                raise lp.PulpSolverError(f"Pulp: Error while executing {solver.path}")
+
+            self.status, _ = solver.get_status(solution_path)
+            values = self._read_solution(solution_path)
+
+        for variable, value in zip(self.variables, values):
+            variable.varValue = value
+        self.objective_value = float(self.objective @ values)
+
+    def _read_solution(self, path: str) -> np.ndarray:
+        """
+        Read the column values from a CBC solution file, by their index.
+        """
+        values = np.zeros(self.n_variables, dtype=float)
+        with open(path) as solution_file:
+            next(solution_file)  # The status line
+            for line in solution_file:
+                fields = line.split()
+                if fields and fields[0] == "**":
+                    # Marks infeasibilities
+                    fields = fields[1:]
+                if len(fields) < 3:
+                    continue
+                name = fields[1]
+                if name.startswith("X"):
+                    values[int(name[1:])] = float(fields[2])
+        return values
+
+
+def _mps_line(first_name: str, second_name: str, value: float) -> str:
+    """
+    Get a line of a fixed format MPS file, with the names and value in their fixed columns.
+    """
+    return f"    {first_name:<8}  {second_name:<8}  {value: .12e}"
@@ -4,6 +4,7 @@ Solver-related queries of the classroom model.
 
 # Standard library imports
 import datetime as dt
+from collections.abc import Sequence
 
 # Local application imports
 from data import constants, models
@@ -36,3 +37,19 @@ def check_if_classroom_occupied_at_time(
         return None
 
     return lesson_clashes
+
+
+def find_classroom_clashes(
+    classroom: models.Classroom, times: Sequence[clashes.TimeOfWeek]
+) -> list[clashes.TimeOfWeek]:
+    """
+    Get the times at which a classroom is already occupied with some slot, out of many times.
+
+    The classroom's slots on the relevant days are loaded with one query, and checked in memory.
+    """
+    user_defined_slots = models.TimetableSlot.objects.filter(
+        user_lessons__classroom=classroom,
+        day_of_week__in={time.day_of_week for time in times},
+    ).distinct()
+
+    return clashes.filter_times_for_clashes(times, items=list(user_defined_slots))
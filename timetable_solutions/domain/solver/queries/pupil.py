@@ -4,6 +4,7 @@ Solver-related queries of the pupil model.
 
 # Standard library imports
 import datetime as dt
+from collections.abc import Sequence
 
 # Local application imports
 from data import constants, models
@@ -39,3 +40,34 @@ def check_if_pupil_busy_at_time(
         return None
 
     return clashes.Clash(slots=lesson_clashes, breaks=break_clashes)
+
+
+def find_busy_pupils(
+    pupils: Sequence[models.Pupil], times: Sequence[clashes.TimeOfWeek]
+) -> list[models.Pupil]:
+    """
+    Get the pupils that are already busy with some slot or break at any of many times.
+
+    The times of the pupils' slots and their year groups' breaks on the relevant days are loaded with one
+    query each, tagged with the pupil they belong to, and checked in memory.
+    :return The busy pupils, in their original order.
+    """
+    days_of_week = {time.day_of_week for time in times}
+    fields = ("day_of_week", "starts_at", "ends_at")
+    slot_commitments = models.TimetableSlot.objects.filter(
+        user_lessons__pupils__in=pupils, day_of_week__in=days_of_week
+    ).values_list("user_lessons__pupils", *fields)
+    break_commitments = models.Break.objects.filter(
+        relevant_year_groups__pupils__in=pupils, day_of_week__in=days_of_week
+    ).values_list("relevant_year_groups__pupils", *fields)
+
+    commitments = [*slot_commitments, *break_commitments]
+    commitment_times = [
+        clashes.TimeOfWeek(starts_at=starts_at, ends_at=ends_at, day_of_week=day)
+        for _, day, starts_at, ends_at in commitments
+    ]
+    is_clash = clashes.get_clash_matrix(items=commitment_times, times=times).any(axis=1)
+    busy_pupil_pks = {
+        pupil_pk for (pupil_pk, *_), clash in zip(commitments, is_clash) if clash
+    }
+    return [pupil for pupil in pupils if pupil.pk in busy_pupil_pks]
@@ -4,6 +4,7 @@ Solver-related queries of the teacher model.
 
 # Standard library imports
 import datetime as dt
+from collections.abc import Sequence
 
 # Local application imports
 from data import constants, models
@@ -41,3 +42,20 @@ def check_if_teacher_busy_at_time(
         return None
 
     return clashes.Clash(slots=lesson_clashes, breaks=break_clashes)
+
+
+def find_teacher_clashes(
+    teacher: models.Teacher, times: Sequence[clashes.TimeOfWeek]
+) -> list[clashes.TimeOfWeek]:
+    """
+    Get the times at which a teacher is already busy with some slot or break, out of many times.
+
+    The teacher's slots and breaks on the relevant days are loaded with one query each, and checked in memory.
+    """
+    days_of_week = {time.day_of_week for time in times}
+    user_defined_slots = models.TimetableSlot.objects.filter(
+        user_lessons__teacher=teacher, day_of_week__in=days_of_week
+    ).distinct()
+    breaks = teacher.breaks.filter(day_of_week__in=days_of_week)
+
+    return clashes.filter_times_for_clashes(times, items=[*user_defined_slots, *breaks])
@@ -3,18 +3,32 @@ Entry point to the solver, both in terms of using it, and in terms of the interf
 The function below and SolutionSpecification are the only two objects used outside of domain/solver
 """
 
+# Standard library imports
+import contextlib
+from collections.abc import Iterator
+
+# Third party imports
+import pulp as lp
+
 # Django imports
 from django.db import transaction
 
 # Local application imports
-from data import models
+from data import constants, models
 
+from .feasibility import check_feasibility
+from .instrumentation import PhaseTimer, ProblemSize
 from .linear_programming.solver import TimetableSolver
+from .solution_pool import TimetableSolutionPool
 from .solver_input_data import SolutionSpecification, TimetableSolverInputs
 from .solver_output_data import TimetableSolverOutcome
 
+DATA_CHANGED_ERROR_MESSAGE = (
+    "Your school's data was changed while your timetables were being produced, so they have not been saved.\n"
+    "Please try again!"
+)
+
 
-@transaction.atomic
 def produce_timetable_solutions(
     school_access_key: int,
     solution_specification: SolutionSpecification,
@@ -25,22 +39,151 @@ def produce_timetable_solutions(
     A button is clicked, creates a POST request handled by the CreateTimetable view which then calls this function,
     providing the solution spec via a form.
 
+    No transaction is held while solving, since this can take a long time. Instead, the problem is formulated
+    from a consistent snapshot of the school's data, and the solution is then saved in a short transaction,
+    provided the school's data has not changed in the meantime.
+
     :param school_access_key - the unique integer used to access a given school's data.
     :param solution_specification - the user-defined requirements for how the solution should be generated.
     :param clear_existing - whether to clear the existing solutions found by the solver.
     :return The list of error messages encountered at the earliest point of the process.
+
+    Every run is recorded as a SolverRun, including runs that end early with an error, with an outcome saying how
+    the run ended.
     """
-    if clear_existing:
-        models.Lesson.delete_solver_solution_for_school(school_id=school_access_key)
+    timer = PhaseTimer()
 
-    input_data = TimetableSolverInputs(
-        school_id=school_access_key, solution_specification=solution_specification
-    )
-    if len(input_data.error_messages) > 0:
-        return input_data.error_messages
+    with _consistent_snapshot():
+        data_version = models.School.objects.get_individual_school(
+            school_id=school_access_key
+        ).data_version
+        with timer.phase("input data"):
+            input_data = TimetableSolverInputs(
+                school_id=school_access_key,
+                solution_specification=solution_specification,
+                check_for_existing_solution=not clear_existing,
+            )
+        if len(input_data.error_messages) > 0:
+            _record_solver_run(
+                school_id=school_access_key,
+                timer=timer,
+                outcome=constants.SolverRunOutcome.INVALID_INPUTS,
+            )
+            return input_data.error_messages
+
+        # Reject problems that clearly can't be solved, unless a partial timetable is acceptable
+        if not solution_specification.allow_partial_timetable:
+            with timer.phase("feasibility"):
+                feasibility_errors = check_feasibility(inputs=input_data)
+            if len(feasibility_errors) > 0:
+                _record_solver_run(
+                    school_id=school_access_key,
+                    timer=timer,
+                    outcome=constants.SolverRunOutcome.INFEASIBLE,
+                )
+                return feasibility_errors
+
+        solver = TimetableSolver(input_data=input_data, timer=timer)
 
-    solver = TimetableSolver(input_data=input_data)
     solver.solve()
+    # The solution is read now, since the solution pool re-solves the problem
+    outcome = TimetableSolverOutcome(timetable_solver=solver, save_solution=False)
+
+    # A partial timetable from the elastic problem has no error messages until it is saved, so its slack is checked
+    pool = None
+    if (
+        solution_specification.number_of_candidate_solutions > 1
+        and len(outcome.error_messages) == 0
+        and solver.get_solved_slack() == 0
+    ):
+        with timer.phase("solution pool"):
+            pool = TimetableSolutionPool(
+                timetable_solver=solver,
+                pool_size=solution_specification.number_of_candidate_solutions,
+            )
+            pool.find_solutions()
+
+    with models.School.coalesce_data_version_increments():
+        school = models.School.objects.select_for_update().get_individual_school(
+            school_id=school_access_key
+        )
+        if school.data_version != data_version:
+            _record_solver_run(
+                school_id=school_access_key,
+                timer=timer,
+                outcome=constants.SolverRunOutcome.DATA_CHANGED,
+                solver=solver,
+            )
+            return [DATA_CHANGED_ERROR_MESSAGE]
+
+        if clear_existing:
+            models.Lesson.delete_solver_solution_for_school(school_id=school_access_key)
+        if clear_existing or pool is not None:
+            # Any existing candidates are from a previous run, and so are replaced by the new pool
+            models.SolutionCandidate.delete_all_candidates_for_school(
+                school_id=school_access_key
+            )
+
+        with timer.phase("outcome"):
+            outcome.save_solution()
+            if pool is not None:
+                pool.save_candidates()
+
+        _record_solver_run(
+            school_id=school_access_key,
+            timer=timer,
+            outcome=constants.SolverRunOutcome.SAVED,
+            solver=solver,
+        )
 
-    outcome = TimetableSolverOutcome(timetable_solver=solver)
     return outcome.error_messages  # Will be an empty list if there are no errors
+
+
+def _record_solver_run(
+    school_id: int,
+    timer: PhaseTimer,
+    outcome: str,
+    solver: TimetableSolver | None = None,
+) -> None:
+    """
+    Record the phases of a run of the solver, and the problem it solved, however the run ended.
+    :param solver - the solver of the run, or None if the run ended before the problem was formulated.
+    """
+    if solver is None:
+        problem_size = ProblemSize(
+            number_of_variables=0, number_of_constraints=0, number_of_nonzeros=0
+        )
+        constraint_families = []
+        solver_status = lp.LpStatus[lp.LpStatusNotSolved]
+    else:
+        problem_size = solver.get_problem_size()
+        constraint_families = solver.formulation_report.as_json()
+        solver_status = solver.status
+
+    models.SolverRun.create_new(
+        school_id=school_id,
+        phases=timer.as_json(),
+        number_of_variables=problem_size.number_of_variables,
+        number_of_constraints=problem_size.number_of_constraints,
+        number_of_nonzeros=problem_size.number_of_nonzeros,
+        constraint_families=constraint_families,
+        solver_status=solver_status,
+        outcome=outcome,
+    )
+
+
+@contextlib.contextmanager
+def _consistent_snapshot() -> Iterator[None]:
+    """
+    Open a transaction in which every read sees the same snapshot of the database.
+
+    On PostgreSQL this needs the repeatable read isolation level, which can only be set at the start of a transaction.
+    SQLite transactions are already serializable.
+    """
+    connection = transaction.get_connection()
+    starts_transaction = not connection.in_atomic_block
+    with transaction.atomic():
+        if starts_transaction and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        yield
@@ -0,0 +1,219 @@
+"""
+Precomputed lookups of which timetable slots are consecutive, used for the solver's double period logic.
+"""
+
+# Standard library imports
+from collections import defaultdict
+from collections.abc import Iterable
+
+# Local application imports
+from data import constants, models
+
+
+class SlotAdjacency:
+    """
+    Class holding the consecutive slot pairs and usable days of each year group,
+    and the user defined double periods of each lesson.
+
+    Everything is built from a few bulk queries when the solver inputs are loaded, so that the double period logic
+    used when formulating the problem is then all in-memory lookups, rather than queries per lesson / day.
+    """
+
+    def __init__(self, school_id: int, lessons: Iterable[models.Lesson]):
+        """
+        :param school_id: the school whose slots should be loaded.
+        :param lessons: the lessons to count the user defined double periods of.
+        """
+        self._school_id = school_id
+
+        # Note that slots are ordered by day and time, using the TimetableSlot Meta class
+        slots = list(
+            models.TimetableSlot.objects.get_all_instances_for_school(
+                school_id=school_id
+            )
+        )
+        self._slots_by_pk = {slot.pk: slot for slot in slots}
+        self._days_by_slot_id = {slot.slot_id: slot.day_of_week for slot in slots}
+
+        slot_year_groups = models.TimetableSlot.relevant_year_groups.through.objects
+        year_group_pks_by_slot_pk: dict[int, set[int]] = defaultdict(set)
+        for slot_pk, year_group_pk in slot_year_groups.filter(
+            timetableslot__school_id=school_id
+        ).values_list("timetableslot_id", "yeargroup_id"):
+            year_group_pks_by_slot_pk[slot_pk].add(year_group_pk)
+        self._year_group_pks_by_slot_pk = year_group_pks_by_slot_pk
+
+        self._consecutive_slots_by_year_group: dict[
+            int, list[tuple[models.TimetableSlot, models.TimetableSlot]]
+        ] = defaultdict(list)
+        self._days_by_year_group: dict[int, set[int]] = defaultdict(set)
+        previous_slot_by_year_group: dict[int, models.TimetableSlot] = {}
+        for slot in slots:
+            for year_group_pk in year_group_pks_by_slot_pk[slot.pk]:
+                self._days_by_year_group[year_group_pk].add(slot.day_of_week)
+                previous_slot = previous_slot_by_year_group.get(year_group_pk)
+                if previous_slot is not None and slot.check_if_slots_are_consecutive(
+                    other_slot=previous_slot
+                ):
+                    self._consecutive_slots_by_year_group[year_group_pk].append(
+                        (previous_slot, slot)
+                    )
+                previous_slot_by_year_group[year_group_pk] = slot
+
+        lessons = list(lessons)
+        self._year_group_pk_by_lesson_pk = self._get_year_group_pk_by_lesson_pk(
+            lessons=lessons
+        )
+        self._user_defined_slots_by_lesson_pk: dict[int, dict[int, int]] = {}
+        self._user_defined_doubles_by_lesson_pk: dict[int, dict[int, int]] = {}
+        self._count_user_defined_slots_by_day(lessons=lessons)
+
+    # --------------------
+    # Queries
+    # --------------------
+
+    def get_year_group_pk(self, lesson: models.Lesson) -> int | None:
+        """
+        Get the primary key of the year group a lesson is taught to, or None if the lesson has no year group or pupils.
+        """
+        return self._year_group_pk_by_lesson_pk.get(lesson.pk)
+
+    def get_day_of_week(self, slot_id: int) -> int:
+        """
+        Get the day of the week that a slot is on.
+        """
+        return self._days_by_slot_id[slot_id]
+
+    def get_consecutive_slots_for_year_group(
+        self, year_group: models.YearGroup
+    ) -> list[tuple[models.TimetableSlot, models.TimetableSlot]]:
+        """
+        Get the pairs of consecutive slots relevant to a year group, ordered by time of week.
+        """
+        return self._consecutive_slots_by_year_group.get(year_group.pk, [])
+
+    def get_consecutive_slots_for_lesson(
+        self, lesson: models.Lesson
+    ) -> list[tuple[models.TimetableSlot, models.TimetableSlot]]:
+        """
+        Get the pairs of consecutive slots that the lesson could have a double period at.
+        """
+        year_group_pk = self._get_year_group_pk(lesson=lesson)
+        return self._consecutive_slots_by_year_group.get(year_group_pk, [])
+
+    def get_usable_days_of_week(self, lesson: models.Lesson) -> list[constants.Day]:
+        """
+        Get the days of the week that a lesson may be taught on, sorted from lowest to highest.
+        Equivalent to Lesson.get_usable_days_of_week.
+        """
+        year_group_pk = self._get_year_group_pk(lesson=lesson)
+        return sorted(
+            constants.Day(day)
+            for day in self._days_by_year_group.get(year_group_pk, [])
+        )
+
+    def get_user_defined_slot_count_on_day(
+        self, lesson: models.Lesson, day_of_week: constants.Day
+    ) -> int:
+        """
+        Get the number of slots the user has already defined for a lesson on the given day, in its year group.
+        Equivalent to counting lesson.user_defined_time_slots.get_timeslots_on_given_day.
+        """
+        return self._user_defined_slots_by_lesson_pk[lesson.pk].get(day_of_week, 0)
+
+    def get_user_defined_double_period_count_on_day(
+        self, lesson: models.Lesson, day_of_week: constants.Day
+    ) -> int:
+        """
+        Get the number of double periods the user has already defined for a lesson on the given day.
+        Equivalent to Lesson.get_user_defined_double_period_count_on_day.
+        """
+        return self._user_defined_doubles_by_lesson_pk[lesson.pk].get(day_of_week, 0)
+
+    def get_n_solver_double_periods_required(self, lesson: models.Lesson) -> int:
+        """
+        Get the number of double periods the solver must produce for a lesson.
+        Equivalent to Lesson.get_n_solver_double_periods_required.
+        """
+        total_user_defined = sum(
+            self._user_defined_doubles_by_lesson_pk[lesson.pk].values()
+        )
+        return lesson.total_required_double_periods - total_user_defined
+
+    # --------------------
+    # Helper methods
+    # --------------------
+
+    def _get_year_group_pk(self, lesson: models.Lesson) -> int:
+        """
+        Get the primary key of the year group a lesson is taught to.
+        """
+        try:
+            return self._year_group_pk_by_lesson_pk[lesson.pk]
+        except KeyError:
+            # The lesson has no year group or pupils, so let the data layer raise its usual error
+            return lesson.get_associated_year_group().pk
+
+    @staticmethod
+    def _get_year_group_pk_by_lesson_pk(
+        lessons: list[models.Lesson],
+    ) -> dict[int, int]:
+        """
+        Get the year group of each lesson, which is taken from its first pupil when not set on the lesson.
+        """
+        year_group_pk_by_lesson_pk = {
+            lesson.pk: lesson.year_group_id
+            for lesson in lessons
+            if lesson.year_group_id
+        }
+        lessons_without_year_group = [
+            lesson.pk for lesson in lessons if not lesson.year_group_id
+        ]
+        # Pupils are ordered as in the Pupil Meta class, so that the same pupil is 'first' as in the data layer
+        for lesson_pk, year_group_pk in (
+            models.Lesson.pupils.through.objects.filter(
+                lesson_id__in=lessons_without_year_group
+            )
+            .order_by("pupil__surname", "pupil__firstname")
+            .values_list("lesson_id", "pupil__year_group_id")
+        ):
+            year_group_pk_by_lesson_pk.setdefault(lesson_pk, year_group_pk)
+        return year_group_pk_by_lesson_pk
+
+    def _count_user_defined_slots_by_day(self, lessons: list[models.Lesson]) -> None:
+        """
+        Count the user defined slots and double periods of each lesson, on each day of the week.
+
+        Only the user defined slots relevant to the lesson's year group are considered, and consecutive
+        pairs are counted in time order - so e.g. a user defined triple period counts as two doubles.
+        """
+        user_defined_slots = models.Lesson.user_defined_time_slots.through.objects
+        user_defined_slot_pks: dict[int, list[int]] = defaultdict(list)
+        for lesson_pk, slot_pk in user_defined_slots.filter(
+            lesson__school_id=self._school_id
+        ).values_list("lesson_id", "timetableslot_id"):
+            user_defined_slot_pks[lesson_pk].append(slot_pk)
+
+        for lesson in lessons:
+            slots_by_day: dict[int, int] = defaultdict(int)
+            doubles_by_day: dict[int, int] = defaultdict(int)
+            self._user_defined_slots_by_lesson_pk[lesson.pk] = slots_by_day
+            self._user_defined_doubles_by_lesson_pk[lesson.pk] = doubles_by_day
+            slot_pks = user_defined_slot_pks.get(lesson.pk)
+            year_group_pk = self._year_group_pk_by_lesson_pk.get(lesson.pk)
+            if not slot_pks or year_group_pk is None:
+                continue
+
+            user_slots = sorted(
+                (
+                    self._slots_by_pk[slot_pk]
+                    for slot_pk in slot_pks
+                    if year_group_pk in self._year_group_pks_by_slot_pk[slot_pk]
+                ),
+                key=lambda slot: (slot.day_of_week, slot.starts_at),
+            )
+            for slot in user_slots:
+                slots_by_day[slot.day_of_week] += 1
+            for previous_slot, slot in zip(user_slots, user_slots[1:]):
+                if slot.check_if_slots_are_consecutive(other_slot=previous_slot):
+                    doubles_by_day[slot.day_of_week] += 1
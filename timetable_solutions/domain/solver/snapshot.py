@@ -0,0 +1,279 @@
+"""
+Module for taking an anonymised snapshot of a school's solver inputs, and loading a snapshot back into the database.
+
+This lets a timetabling problem be reproduced (e.g. to investigate a slow solve) without copying the data it came from.
+Only the structure relevant to the solver is kept - names are replaced and ids are kept only where they are
+not descriptive.
+"""
+
+# Standard library imports
+import dataclasses
+import datetime as dt
+from typing import Any
+
+# Local application imports
+from data import models
+from domain.solver.solver_input_data import SolutionSpecification
+
+SNAPSHOT_VERSION = 1
+
+
+def get_school_snapshot(
+    school_id: int, solution_specification: SolutionSpecification
+) -> dict[str, Any]:
+    """
+    Get an anonymised, json serializable snapshot of a school's solver inputs.
+
+    :param school_id: the school to take a snapshot of.
+    :param solution_specification: stored with the snapshot, so that the same problem can be formulated again.
+    """
+    lessons = models.Lesson.objects.get_all_instances_for_school(school_id=school_id)
+    # Lesson ids and subject names tend to be descriptive, so are replaced
+    lesson_ids = {
+        lesson_id: f"lesson-{n}"
+        for n, lesson_id in enumerate(
+            lessons.order_by("lesson_id").values_list("lesson_id", flat=True)
+        )
+    }
+    subject_names = {
+        subject_name: f"subject-{n}"
+        for n, subject_name in enumerate(
+            lessons.order_by("subject_name")
+            .values_list("subject_name", flat=True)
+            .distinct()
+        )
+    }
+
+    pupils = models.Pupil.objects.get_all_instances_for_school(school_id=school_id)
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "solution_specification": _serialize_solution_specification(
+            solution_specification
+        ),
+        "year_groups": list(
+            models.YearGroup.objects.get_all_instances_for_school(
+                school_id=school_id
+            ).values_list("year_group_id", flat=True)
+        ),
+        "pupils": [
+            {"pupil_id": pupil_id, "year_group_id": year_group_id}
+            for pupil_id, year_group_id in pupils.values_list(
+                "pupil_id", "year_group__year_group_id"
+            )
+        ],
+        "teachers": list(
+            models.Teacher.objects.get_all_instances_for_school(
+                school_id=school_id
+            ).values_list("teacher_id", flat=True)
+        ),
+        "classrooms": list(
+            models.Classroom.objects.get_all_instances_for_school(
+                school_id=school_id
+            ).values_list("classroom_id", flat=True)
+        ),
+        "timetable_slots": [
+            {
+                "slot_id": slot.slot_id,
+                "day_of_week": slot.day_of_week,
+                "starts_at": slot.starts_at.isoformat(),
+                "ends_at": slot.ends_at.isoformat(),
+                "relevant_year_groups": [
+                    yg.year_group_id for yg in slot.relevant_year_groups.all()
+                ],
+            }
+            for slot in models.TimetableSlot.objects.get_all_instances_for_school(
+                school_id=school_id
+            ).prefetch_related("relevant_year_groups")
+        ],
+        "breaks": [
+            {
+                "break_id": f"break-{n}",
+                "day_of_week": break_.day_of_week,
+                "starts_at": break_.starts_at.isoformat(),
+                "ends_at": break_.ends_at.isoformat(),
+                "teachers": [teacher.teacher_id for teacher in break_.teachers.all()],
+                "relevant_year_groups": [
+                    yg.year_group_id for yg in break_.relevant_year_groups.all()
+                ],
+            }
+            for n, break_ in enumerate(
+                models.Break.objects.get_all_instances_for_school(
+                    school_id=school_id
+                ).prefetch_related("teachers", "relevant_year_groups")
+            )
+        ],
+        "lessons": [
+            {
+                "lesson_id": lesson_ids[lesson.lesson_id],
+                "subject_name": subject_names[lesson.subject_name],
+                "year_group_id": lesson.year_group.year_group_id
+                if lesson.year_group
+                else None,
+                "teacher_id": lesson.teacher.teacher_id if lesson.teacher else None,
+                "classroom_id": lesson.classroom.classroom_id
+                if lesson.classroom
+                else None,
+                "total_required_slots": lesson.total_required_slots,
+                "total_required_double_periods": lesson.total_required_double_periods,
+                "pupils": [pupil.pupil_id for pupil in lesson.pupils.all()],
+                "user_defined_time_slots": [
+                    slot.slot_id for slot in lesson.user_defined_time_slots.all()
+                ],
+            }
+            for lesson in lessons.select_related(
+                "year_group", "teacher", "classroom"
+            ).prefetch_related("pupils", "user_defined_time_slots")
+        ],
+    }
+
+
+@models.School.coalesce_data_version_increments()
+def load_school_snapshot(snapshot: dict[str, Any]) -> models.School:
+    """
+    Load a snapshot into a new school, with placeholder names where the snapshot has none.
+
+    :return: the new school holding the snapshot's data.
+    """
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Cannot load snapshot with version {snapshot.get('version')}, "
+            f"only version {SNAPSHOT_VERSION} is supported."
+        )
+
+    school = models.School.create_new(school_name="Snapshot school")
+    school_id = school.school_access_key
+
+    year_groups = {
+        yg.year_group_id: yg
+        for yg in models.YearGroup.objects.bulk_create(
+            [
+                models.YearGroup(
+                    school=school,
+                    year_group_id=year_group_id,
+                    year_group_name=str(year_group_id),
+                )
+                for year_group_id in snapshot["year_groups"]
+            ]
+        )
+    }
+    pupils = {
+        pupil.pupil_id: pupil
+        for pupil in models.Pupil.objects.bulk_create(
+            [
+                models.Pupil(
+                    school=school,
+                    pupil_id=pupil["pupil_id"],
+                    firstname="Pupil",
+                    surname=str(pupil["pupil_id"]),
+                    year_group=year_groups[pupil["year_group_id"]],
+                )
+                for pupil in snapshot["pupils"]
+            ]
+        )
+    }
+    teachers = {
+        teacher.teacher_id: teacher
+        for teacher in models.Teacher.objects.bulk_create(
+            [
+                models.Teacher(
+                    school=school,
+                    teacher_id=teacher_id,
+                    firstname="Teacher",
+                    surname=str(teacher_id),
+                    title="",
+                )
+                for teacher_id in snapshot["teachers"]
+            ]
+        )
+    }
+    classrooms = {
+        classroom.classroom_id: classroom
+        for classroom in models.Classroom.objects.bulk_create(
+            [
+                models.Classroom(
+                    school=school,
+                    classroom_id=classroom_id,
+                    building="Building",
+                    room_number=classroom_id,
+                )
+                for classroom_id in snapshot["classrooms"]
+            ]
+        )
+    }
+    # The bulk inserts above don't send the signals that would otherwise do this
+    models.School.increment_data_version(school_id=school_id)
+
+    slots = {}
+    for slot_data in snapshot["timetable_slots"]:
+        slot = models.TimetableSlot.objects.create(
+            school=school,
+            slot_id=slot_data["slot_id"],
+            day_of_week=slot_data["day_of_week"],
+            starts_at=dt.time.fromisoformat(slot_data["starts_at"]),
+            ends_at=dt.time.fromisoformat(slot_data["ends_at"]),
+        )
+        slot.relevant_year_groups.add(
+            *(year_groups[yg_id] for yg_id in slot_data["relevant_year_groups"])
+        )
+        slots[slot.slot_id] = slot
+
+    for break_data in snapshot["breaks"]:
+        break_ = models.Break.objects.create(
+            school=school,
+            break_id=break_data["break_id"],
+            break_name="Break",
+            day_of_week=break_data["day_of_week"],
+            starts_at=dt.time.fromisoformat(break_data["starts_at"]),
+            ends_at=dt.time.fromisoformat(break_data["ends_at"]),
+        )
+        break_.teachers.add(*(teachers[t_id] for t_id in break_data["teachers"]))
+        break_.relevant_year_groups.add(
+            *(year_groups[yg_id] for yg_id in break_data["relevant_year_groups"])
+        )
+
+    for lesson_data in snapshot["lessons"]:
+        lesson = models.Lesson.objects.create(
+            school_id=school_id,
+            lesson_id=lesson_data["lesson_id"],
+            subject_name=lesson_data["subject_name"],
+            year_group=year_groups.get(lesson_data["year_group_id"]),
+            teacher=teachers.get(lesson_data["teacher_id"]),
+            classroom=classrooms.get(lesson_data["classroom_id"]),
+            total_required_slots=lesson_data["total_required_slots"],
+            total_required_double_periods=lesson_data["total_required_double_periods"],
+        )
+        lesson.pupils.add(*(pupils[p_id] for p_id in lesson_data["pupils"]))
+        lesson.user_defined_time_slots.add(
+            *(slots[s_id] for s_id in lesson_data["user_defined_time_slots"])
+        )
+
+    return school
+
+
+def get_solution_specification_from_snapshot(
+    snapshot: dict[str, Any]
+) -> SolutionSpecification:
+    """
+    Get the solution specification the snapshot was taken with.
+    """
+    spec_data = dict(snapshot["solution_specification"])
+    optimal_time = spec_data["optimal_free_period_time_of_day"]
+    if optimal_time not in vars(SolutionSpecification.OptimalFreePeriodOptions):
+        spec_data["optimal_free_period_time_of_day"] = dt.time.fromisoformat(
+            optimal_time
+        )
+    return SolutionSpecification(**spec_data)
+
+
+def _serialize_solution_specification(
+    solution_specification: SolutionSpecification,
+) -> dict[str, Any]:
+    """
+    Get a json serializable representation of a solution specification.
+    """
+    spec_data = dataclasses.asdict(solution_specification)
+    optimal_time = spec_data["optimal_free_period_time_of_day"]
+    if isinstance(optimal_time, dt.time):
+        spec_data["optimal_free_period_time_of_day"] = optimal_time.isoformat()
+    return spec_data
@@ -0,0 +1,89 @@
+"""
+Implementation for finding several alternative solutions to a single formulated timetabling problem.
+"""
+
+# Local application imports
+from data import models
+from domain.solver.linear_programming.solver import TimetableSolver
+from domain.solver.linear_programming.solver_variables import var_key
+
+
+class TimetableSolutionPool:
+    """
+    Class responsible for generating a pool of distinct solutions from an already solved TimetableSolver,
+    and storing these as SolutionCandidate instances.
+
+    After each solution is found, a no-good cut excluding it is added to the existing problem, which is
+    then re-solved. This avoids re-formulating the problem for each alternative timetable.
+    """
+
+    def __init__(self, timetable_solver: TimetableSolver, pool_size: int):
+        """
+        :param timetable_solver: a solver whose problem has already been solved once.
+        :param pool_size: the maximum number of distinct solutions to find, including the initial one.
+        """
+        self._timetable_solver = timetable_solver
+        self._input_data = timetable_solver.input_data
+        self._pool_size = pool_size
+
+        self.assignments: list[list[var_key]] = []
+        self.objective_values: list[float | None] = []
+
+    def find_solutions(self) -> None:
+        """
+        Record the initial solution, then find alternative solutions until the pool is full.
+
+        The pool may end up smaller than requested, if the problem has fewer distinct solutions.
+        Only complete timetables are kept, so an elastic problem with any shortfall gives an empty pool.
+        """
+        if not self._is_complete_solution():
+            return None
+        self._record_current_solution()
+
+        while len(self.assignments) < self._pool_size:
+            self._timetable_solver.exclude_assignment(
+                assignment=self.assignments[-1],
+                name=f"exclude_solution_candidate_{len(self.assignments)}",
+            )
+            self._timetable_solver.solve()
+            if not self._is_complete_solution():
+                # There are no more distinct complete timetables
+                break
+            self._record_current_solution()
+
+    def save_candidates(self) -> list[models.SolutionCandidate]:
+        """
+        Store each solution in the pool as a SolutionCandidate.
+        """
+        lessons = {lesson.lesson_id: lesson for lesson in self._input_data.lessons}
+        slots = {slot.slot_id: slot for slot in self._input_data.timetable_slots}
+
+        return [
+            models.SolutionCandidate.create_new(
+                school_id=self._input_data.school_id,
+                candidate_number=candidate_number,
+                assignments=[
+                    (lessons[key.lesson_id], slots[key.slot_id]) for key in assignment
+                ],
+                objective_value=objective_value,
+            )
+            for candidate_number, (assignment, objective_value) in enumerate(
+                zip(self.assignments, self.objective_values), start=1
+            )
+        ]
+
+    def _is_complete_solution(self) -> bool:
+        """
+        Whether the solver's most recent solution is optimal, and leaves no requirement unfulfilled.
+        """
+        return (
+            self._timetable_solver.is_optimal
+            and self._timetable_solver.get_solved_slack() == 0
+        )
+
+    def _record_current_solution(self) -> None:
+        """
+        Add the solution currently held by the solver's variables to the pool.
+        """
+        self.assignments.append(self._timetable_solver.get_solved_assignment())
+        self.objective_values.append(self._timetable_solver.objective_value)
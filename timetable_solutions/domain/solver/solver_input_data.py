@@ -7,6 +7,7 @@ from dataclasses import dataclass
 
 # Local application imports
 from data import models
+from domain.solver.slot_adjacency import SlotAdjacency
 
 
 @dataclass
@@ -23,6 +24,16 @@ class SolutionSpecification:
     have free periods.
     :field ideal_proportion_of_free_periods_at_this_time: 1 - the proportion of objective function contributions
     that will be randomly allocated.
+    :field number_of_candidate_solutions: How many distinct timetables to generate from the one formulated problem,
+    so that the user can compare them. The first is applied straight away, and all are stored as candidates.
+    :field allow_partial_timetable: Whether to solve an elastic version of the problem, where the required number of
+    slots and double periods for each lesson may be missed at a (large) cost. A single solve then gives the best
+    partial timetable, and the shortfall for each lesson, even when no full timetable exists.
+    :field lazy_clash_constraints: Whether to leave out the teacher and classroom clash constraints at first, and only
+    add those that the solution breaks, re-solving until none are broken. Most clash constraints never bind, so on
+    sparse schools this solves much smaller problems, to the same optimal timetable.
+    :field sparse_model: Whether to assemble the constraint matrix directly as arrays and solve it from an MPS file,
+    rather than building it from PuLP expressions. The PuLP problem is easier to inspect, so is kept for debugging.
     """
 
     class OptimalFreePeriodOptions:
@@ -40,18 +51,31 @@ class SolutionSpecification:
     allow_triple_periods_and_above: bool
     optimal_free_period_time_of_day: str | dt.time = OptimalFreePeriodOptions.NONE
     ideal_proportion_of_free_periods_at_this_time: float = 1.0
+    number_of_candidate_solutions: int = 1
+    allow_partial_timetable: bool = False
+    lazy_clash_constraints: bool = False
+    sparse_model: bool = False
 
 
 class TimetableSolverInputs:
-    def __init__(self, school_id: int, solution_specification: SolutionSpecification):
+    def __init__(
+        self,
+        school_id: int,
+        solution_specification: SolutionSpecification,
+        check_for_existing_solution: bool = True,
+    ):
         """
         Class responsible for loading in all of a school's data and storing it.
         Notes: we group the methods on this class as if it were a django model.
+
+        :param check_for_existing_solution: whether lessons that already have a solution are an error. This can be
+        skipped when the existing solution is going to be replaced when the new solution is saved.
         """
 
         # Store passed information
         self.school_id = school_id
         self.solution_specification = solution_specification
+        self._check_for_existing_solution = check_for_existing_solution
 
         # Call the data layer to get all necessary data
         self.pupils = models.Pupil.objects.get_all_instances_for_school(
@@ -75,6 +99,11 @@ class TimetableSolverInputs:
             school_id=self.school_id
         )
 
+        # Precompute the consecutive slots / user defined double periods, used throughout formulation
+        self.slot_adjacency = SlotAdjacency(
+            school_id=self.school_id, lessons=self.lessons
+        )
+
         # Check that solution spec and data are compatible (data that's individually invalid has already been checked)
         self.error_messages: list[str] = []
         self._check_specification_aligns_with_input_data()
@@ -123,8 +152,8 @@ class TimetableSolverInputs:
     # Helper methods for TimetableSolverVariables
     # --------------------
 
-    @staticmethod
     def get_consecutive_slots_for_year_group(
+        self,
         year_group: models.YearGroup,
     ) -> list[tuple[models.TimetableSlot, models.TimetableSlot]]:
         """
@@ -134,18 +163,9 @@ class TimetableSolverInputs:
         :param year_group: The string identifier of the year_group instance
         :return - as a list, the tuples of consecutive slots.
         """
-        slots = year_group.slots.all().order_by("day_of_week", "starts_at")
-
-        consecutive_slots: list[tuple[models.TimetableSlot, models.TimetableSlot]] = []
-        previous_slot = None
-        for current_slot in slots:
-            if (
-                previous_slot is not None
-            ) and current_slot.check_if_slots_are_consecutive(other_slot=previous_slot):
-                consecutive_slots.append((previous_slot, current_slot))
-            previous_slot = current_slot
-
-        return consecutive_slots
+        return self.slot_adjacency.get_consecutive_slots_for_year_group(
+            year_group=year_group
+        )
 
     # --------------------
     # Validation methods
@@ -159,11 +179,18 @@ class TimetableSolverInputs:
         resolve directly within this method, but given the different options, the choice is left to the user.
         """
         if not self.solution_specification.allow_split_lessons_within_each_day:
+            lesson_pks_with_pupils = set(
+                models.Lesson.pupils.through.objects.filter(
+                    lesson__school_id=self.school_id
+                ).values_list("lesson_id", flat=True)
+            )
             for lesson in self.lessons:
                 required_distinct_days = (
                     lesson.total_required_slots - lesson.total_required_double_periods
                 )
-                n_available_distinct_days = len(lesson.get_usable_days_of_week())
+                n_available_distinct_days = len(
+                    self.slot_adjacency.get_usable_days_of_week(lesson=lesson)
+                )
                 if required_distinct_days > n_available_distinct_days:
                     self.error_messages.append(
                         f"Lesson: {lesson} requires too many distinct slots for the solution timetables to all be "
@@ -171,15 +198,22 @@ class TimetableSolverInputs:
                         "Please allow this in your solution, or amend your data!"
                     )
 
-                if lesson.pupils.all().count() == 0:
+                if lesson.pk not in lesson_pks_with_pupils:
                     self.error_messages.append(
                         f"Lesson: {lesson} has no pupils, and therefore cannot be solved.\n"
                         f"Please add some!"
                     )
 
         # Check no existing solution
+        if not self._check_for_existing_solution:
+            return None
+        lesson_pks_with_solution = set(
+            models.Lesson.solver_defined_time_slots.through.objects.filter(
+                lesson__school_id=self.school_id
+            ).values_list("lesson_id", flat=True)
+        )
         for lesson in self.lessons:
-            if lesson.solver_defined_time_slots.count() > 0:
+            if lesson.pk in lesson_pks_with_solution:
                 self.error_messages.append(
                     f"{lesson} with solver defined time slot(s) was passed as "
                     f"solver input data!"
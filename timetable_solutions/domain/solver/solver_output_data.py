@@ -3,7 +3,11 @@ Implementation for inserting the solver solution into the relevant part of the d
 """
 
 
+# Third party imports
+import numpy as np
+
 # Local application imports
+from data import models
 from domain.solver.linear_programming.solver import TimetableSolver
 
 
@@ -12,36 +16,109 @@ class TimetableSolverOutcome:
     Class responsible for extracting results from a solved TimetableSolver, and inserting the outcome into the database.
     """
 
-    def __init__(self, timetable_solver: TimetableSolver):
-        self._timetable_solver = timetable_solver
+    def __init__(self, timetable_solver: TimetableSolver, save_solution: bool = True):
+        """
+        The solution is read from the solver's variables straight away, so that the solver can be re-solved
+        (e.g. to find alternative solutions) before this solution is saved.
+
+        :param save_solution: whether to insert the solution into the database now, or leave this to save_solution.
+        """
         self._input_data = timetable_solver.input_data
-        self._decision_variables = timetable_solver.variables.decision_variables
-        self.error_messages = timetable_solver.error_messages
+        self._is_elastic = (
+            self._input_data.solution_specification.allow_partial_timetable
+        )
+        self.error_messages = list(timetable_solver.error_messages)
+
+        self._variable_keys = list(timetable_solver.variables.decision_variables.keys())
+        self._variable_values = np.array(
+            [
+                var.varValue or 0.0
+                for var in timetable_solver.variables.decision_variables.values()
+            ],
+            dtype=float,
+        )
+        self._double_period_slack_values = {
+            lesson_id: round(slack.varValue or 0)
+            for lesson_id, slack in timetable_solver.variables.double_period_slack_variables.items()
+        }
 
+        # The number of required slots / double periods that could not be assigned to each lesson
+        self.slot_shortfall: dict[models.Lesson, int] = {}
+        self.double_period_shortfall: dict[models.Lesson, int] = {}
+
+        if save_solution:
+            self.save_solution()
+
+    def save_solution(self) -> None:
+        """
+        Insert the solution into the database, provided the solver did not encounter any errors.
+        """
         if len(self.error_messages) == 0:
+            # The user defined slots are prefetched, to count the slots each lesson requires without extra queries
+            self._lessons = list(
+                self._input_data.lessons.prefetch_related("user_defined_time_slots")
+            )
             self._extract_results()
+            self._extract_double_period_shortfall()
 
     def _extract_results(self) -> None:
         """
-        Method to recover the variable values (1s / 0s) and use these to add slots to the
-        'solver_defined_time_slots' on all relevant Lesson instances
+        Method to use the recovered variable values (1s / 0s) to add slots to the
+        'solver_defined_time_slots' on all relevant Lesson instances.
+
+        The variable values are grouped by lesson in a single pass, so that all
+        solved slots can then be inserted at once.
         """
+        solved_slot_ids_by_lesson_id: dict[str, list[int]] = {}
+        for index in np.flatnonzero(np.isclose(self._variable_values, 1.0)):
+            key = self._variable_keys[index]
+            solved_slot_ids_by_lesson_id.setdefault(key.lesson_id, []).append(
+                key.slot_id
+            )
+
+        slot_pks = dict(self._input_data.timetable_slots.values_list("slot_id", "pk"))
+        time_slot_pks_by_lesson_pk = {}
         unsolved_lessons = []
-        for lesson in self._input_data.lessons:
-            solved_timeslot_ids = [
-                var_key.slot_id
-                for var_key, var in self._decision_variables.items()
-                if (var.varValue == 1.0) and (var_key.lesson_id == lesson.lesson_id)
+        for lesson in self._lessons:
+            solved_slot_ids = solved_slot_ids_by_lesson_id.get(lesson.lesson_id, [])
+            time_slot_pks_by_lesson_pk[lesson.pk] = [
+                slot_pks[slot_id] for slot_id in solved_slot_ids
             ]
 
-            if len(solved_timeslot_ids) < lesson.get_n_solver_slots_required():
+            n_solver_slots_required = lesson.get_n_solver_slots_required()
+            if len(solved_slot_ids) < n_solver_slots_required:
                 unsolved_lessons.append(lesson)
-            solved_timeslots = self._input_data.timetable_slots.filter(
-                slot_id__in=solved_timeslot_ids
-            )
-            lesson.add_solver_defined_time_slots(time_slots=solved_timeslots)
-        if unsolved_lessons:
+                self.slot_shortfall[lesson] = n_solver_slots_required - len(
+                    solved_slot_ids
+                )
+
+        models.Lesson.bulk_add_solver_defined_time_slots(
+            school_id=self._input_data.school_id,
+            time_slot_pks_by_lesson_pk=time_slot_pks_by_lesson_pk,
+        )
+
+        if unsolved_lessons and self._is_elastic:
+            for lesson in unsolved_lessons:
+                self.error_messages.append(
+                    f"Could not fulfill required slots of lesson: {lesson}. "
+                    f"{self.slot_shortfall[lesson]} slot(s) still need to be scheduled."
+                )
+        elif unsolved_lessons:
             lessons = ", ".join([str(lsn) for lsn in unsolved_lessons])
             self.error_messages.append(
                 f"Could not find solution to fulfill required slots of lesson: {lessons}."
             )
+
+    def _extract_double_period_shortfall(self) -> None:
+        """
+        Method to recover the double periods each lesson is short of, from the slack variables of an elastic problem.
+        """
+        lessons = {lesson.lesson_id: lesson for lesson in self._lessons}
+        for lesson_id, shortfall in self._double_period_slack_values.items():
+            if shortfall:
+                lesson = lessons[lesson_id]
+                self.double_period_shortfall[lesson] = shortfall
+                self.error_messages.append(
+                    f"Could not fulfill required double periods of lesson: {lesson}. "
+                    f"{shortfall} double period(s) still need to be scheduled."
+                )
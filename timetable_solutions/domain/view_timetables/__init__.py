@@ -2,3 +2,5 @@
 Convenience imports for objects form view_timetables domain component
 """
 from .queries import get_pupil_timetable, get_teacher_timetable
+from .school_timetables import SchoolTimetables
+from .timetable_cache import TimetableCache
@@ -20,7 +20,7 @@ def get_pupil_timetable(
     :return OrderedDict, whose key/value pairs are the pupil's timetable for each
     day of the week, including lessons, breaks and free periods.
     """
-    lessons = pupil.lessons.all()
+    lessons = timetable.prefetch_lessons(pupil.lessons.all())
     breaks = pupil.year_group.breaks.all()
     tt = timetable.Timetable(lessons=lessons, breaks=breaks)
     return tt.make_timetable()
@@ -35,7 +35,7 @@ def get_teacher_timetable(
     :return OrderedDict, whose key/value pairs are the teacher's timetable for each
     day of the week, including lessons, breaks and free periods.
     """
-    lessons = teacher.lessons.all()
+    lessons = timetable.prefetch_lessons(teacher.lessons.all())
     breaks = teacher.breaks.all()
     tt = timetable.Timetable(lessons=lessons, breaks=breaks)
     return tt.make_timetable()
@@ -0,0 +1,127 @@
+"""
+Construction of every pupil / teacher timetable at a school in one go, e.g. for printing them all.
+"""
+
+# Standard library imports
+from collections import OrderedDict, defaultdict
+from collections.abc import Sequence
+
+# Django imports
+from django.db.models import Q
+
+# Local application imports
+from data import constants as data_constants
+from data import models
+from domain.view_timetables import timetable, timetable_component
+
+
+class SchoolTimetables:
+    """
+    Load a school's lessons, slots and breaks (or just those of some of its pupils / teachers), in a fixed number
+    of queries, to make many timetables from.
+    Each pupil / teacher's timetable is then assembled in memory, with the same layout as a Timetable.
+    """
+
+    def __init__(
+        self,
+        school_id: int,
+        pupils: Sequence[models.Pupil] | None = None,
+        teachers: Sequence[models.Teacher] | None = None,
+    ) -> None:
+        """
+        :param pupils / teachers - if either is passed, only the lessons and breaks of these pupils / teachers are
+        loaded, e.g. for a batch of them, and so only their timetables can be made.
+        """
+        lessons = models.Lesson.objects.filter(school_id=school_id)
+        pupil_memberships = models.Lesson.pupils.through.objects.filter(
+            lesson__school_id=school_id
+        )
+        breaks = models.Break.objects.filter(school_id=school_id)
+        year_group_breaks = models.Break.relevant_year_groups.through.objects.filter(
+            break__school_id=school_id
+        )
+        teacher_breaks = models.Break.teachers.through.objects.filter(
+            break__school_id=school_id
+        )
+        if pupils is not None or teachers is not None:
+            pupil_pks = [pupil.pk for pupil in pupils or []]
+            year_group_pks = {pupil.year_group_id for pupil in pupils or []}
+            teacher_pks = [teacher.pk for teacher in teachers or []]
+            lessons = lessons.filter(
+                Q(pupils__in=pupil_pks) | Q(teacher__in=teacher_pks)
+            ).distinct()
+            pupil_memberships = pupil_memberships.filter(pupil_id__in=pupil_pks)
+            breaks = breaks.filter(
+                Q(relevant_year_groups__in=year_group_pks) | Q(teachers__in=teacher_pks)
+            ).distinct()
+            year_group_breaks = year_group_breaks.filter(
+                yeargroup_id__in=year_group_pks
+            )
+            teacher_breaks = teacher_breaks.filter(teacher_id__in=teacher_pks)
+
+        lessons = timetable.prefetch_lessons(lessons)
+        self._lessons_by_pk = {lesson.pk: lesson for lesson in lessons}
+
+        self._lessons_by_pupil_pk: dict[int, list[models.Lesson]] = defaultdict(list)
+        for pupil_pk, lesson_pk in pupil_memberships.values_list(
+            "pupil_id", "lesson_id"
+        ):
+            self._lessons_by_pupil_pk[pupil_pk].append(self._lessons_by_pk[lesson_pk])
+
+        self._lessons_by_teacher_pk: dict[int, list[models.Lesson]] = defaultdict(list)
+        for lesson in self._lessons_by_pk.values():
+            if lesson.teacher_id is not None:
+                self._lessons_by_teacher_pk[lesson.teacher_id].append(lesson)
+
+        breaks_by_pk = {break_.pk: break_ for break_ in breaks}
+        self._breaks_by_year_group_pk: dict[int, list[models.Break]] = defaultdict(list)
+        for year_group_pk, break_pk in year_group_breaks.values_list(
+            "yeargroup_id", "break_id"
+        ):
+            self._breaks_by_year_group_pk[year_group_pk].append(breaks_by_pk[break_pk])
+
+        self._breaks_by_teacher_pk: dict[int, list[models.Break]] = defaultdict(list)
+        for teacher_pk, break_pk in teacher_breaks.values_list(
+            "teacher_id", "break_id"
+        ):
+            self._breaks_by_teacher_pk[teacher_pk].append(breaks_by_pk[break_pk])
+
+    @classmethod
+    def for_pupils(
+        cls, school_id: int, pupils: Sequence[models.Pupil]
+    ) -> "SchoolTimetables":
+        """
+        Load just the lessons and breaks of some of a school's pupils.
+        """
+        return cls(school_id=school_id, pupils=pupils)
+
+    @classmethod
+    def for_teachers(
+        cls, school_id: int, teachers: Sequence[models.Teacher]
+    ) -> "SchoolTimetables":
+        """
+        Load just the lessons and breaks of some of a school's teachers.
+        """
+        return cls(school_id=school_id, teachers=teachers)
+
+    def get_pupil_timetable(
+        self, pupil: models.Pupil
+    ) -> OrderedDict[data_constants.Day, list[timetable_component.TimetableComponent]]:
+        """
+        Assemble the timetable of one of the school's pupils, without querying the database.
+        """
+        return timetable.Timetable(
+            lessons=self._lessons_by_pupil_pk[pupil.pk],
+            breaks=self._breaks_by_year_group_pk[pupil.year_group_id],
+        ).make_timetable()
+
+    def get_teacher_timetable(
+        self, teacher: models.Teacher
+    ) -> OrderedDict[data_constants.Day, list[timetable_component.TimetableComponent]]:
+        """
+        Assemble the timetable of one of the school's teachers, without querying the database.
+        """
+        return timetable.Timetable(
+            lessons=self._lessons_by_teacher_pk[teacher.pk],
+            breaks=self._breaks_by_teacher_pk[teacher.pk],
+        ).make_timetable()
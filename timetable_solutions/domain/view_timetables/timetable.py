@@ -1,6 +1,7 @@
 # Standard library imports
 import datetime as dt
 from collections import OrderedDict
+from collections.abc import Iterable
 
 # Local application imports
 from data import constants as data_constants
@@ -13,23 +14,18 @@ class Timetable:
     """Class to store and construct timetables."""
 
     def __init__(
-        self, lessons: models.LessonQuerySet, breaks: models.BreakQuerySet | None
+        self,
+        lessons: Iterable[models.Lesson],
+        breaks: Iterable[models.Break] | None,
     ) -> None:
-        self._lessons = lessons
+        """
+        :param lessons: The lessons to show, which should be passed through prefetch_lessons, since
+        each lesson's slots and colour are then worked out without any further queries.
+        """
+        self._lessons = list(lessons)
         self._breaks = breaks
 
-        # Iterable data structure for a timetable, to be filled
-        self.timetable: OrderedDict = OrderedDict(
-            [
-                (data_constants.Day.MONDAY, []),
-                (data_constants.Day.TUESDAY, []),
-                (data_constants.Day.WEDNESDAY, []),
-                (data_constants.Day.THURSDAY, []),
-                (data_constants.Day.FRIDAY, []),
-                (data_constants.Day.SATURDAY, []),
-                (data_constants.Day.SUNDAY, []),
-            ]
-        )
+        self.timetable: OrderedDict = _get_empty_timetable()
 
     def make_timetable(
         self,
@@ -37,28 +33,7 @@ class Timetable:
         """Make a colourful timetable where the slots can start at different times across days."""
         self._make_components_from_lessons()
         self._make_components_from_breaks()
-
-        min_timetable_start = min(
-            component.starts_at for component in self._all_components
-        )
-        max_timetable_finish = max(
-            component.ends_at for component in self._all_components
-        )
-
-        for day, components in self.timetable.items():
-            if not components:
-                continue
-            components = _sort_components(components)
-            components = _merge_consecutive_components(components)
-            components = _fill_gaps_with_free_periods(
-                components,
-                timetable_starts_at=min_timetable_start,
-                timetable_ends_at=max_timetable_finish,
-            )
-            components = _set_percentage_of_days_timetable(components)
-
-            self.timetable[day] = components
-
+        self.timetable = make_timetable_from_components(self._all_components)
         return self.timetable
 
     # --------------------
@@ -67,13 +42,13 @@ class Timetable:
 
     def _make_components_from_lessons(self) -> None:
         """
-        Make all the timetable components from the LessonQuerySet.
+        Make all the timetable components from the lessons.
         """
         colour_mapping = _get_lesson_colours(self._lessons)
         for lesson in self._lessons:
             # Colour code will just be None if mapping wasn't set
             colour_code = colour_mapping.get(lesson.lesson_id)
-            for slot in lesson.get_all_time_slots():
+            for slot in _get_all_time_slots(lesson):
                 component = timetable_component.TimetableComponent.from_lesson_slot(
                     lesson=lesson, slot=slot, colour_code=colour_code
                 )
@@ -108,6 +83,64 @@ class Timetable:
         ]
 
 
+def prefetch_lessons(lessons: models.LessonQuerySet) -> models.LessonQuerySet:
+    """
+    Prefetch the slots of some lessons, and select the teacher and classroom shown with each lesson.
+    """
+    return lessons.select_related("teacher", "classroom").prefetch_related(
+        "user_defined_time_slots", "solver_defined_time_slots"
+    )
+
+
+def make_timetable_from_components(
+    components: Iterable[timetable_component.TimetableComponent],
+) -> OrderedDict[data_constants.Day, list[timetable_component.TimetableComponent]]:
+    """
+    Lay out lesson and break components as a timetable, with any gaps between them filled by free periods.
+    Every day of the timetable spans from the earliest start to the latest finish on any day.
+    """
+    all_components = list(components)
+    timetable = _get_empty_timetable()
+    if not all_components:
+        return timetable
+
+    for component in all_components:
+        timetable[component.day_of_week].append(component)
+    min_timetable_start = min(component.starts_at for component in all_components)
+    max_timetable_finish = max(component.ends_at for component in all_components)
+
+    for day, day_components in timetable.items():
+        if not day_components:
+            continue
+        day_components = _sort_components(day_components)
+        day_components = _merge_consecutive_components(day_components)
+        day_components = _fill_gaps_with_free_periods(
+            day_components,
+            timetable_starts_at=min_timetable_start,
+            timetable_ends_at=max_timetable_finish,
+        )
+        day_components = _set_percentage_of_days_timetable(day_components)
+
+        timetable[day] = day_components
+
+    return timetable
+
+
+def _get_empty_timetable() -> OrderedDict:
+    """Get an iterable data structure for a timetable, to be filled."""
+    return OrderedDict(
+        [
+            (data_constants.Day.MONDAY, []),
+            (data_constants.Day.TUESDAY, []),
+            (data_constants.Day.WEDNESDAY, []),
+            (data_constants.Day.THURSDAY, []),
+            (data_constants.Day.FRIDAY, []),
+            (data_constants.Day.SATURDAY, []),
+            (data_constants.Day.SUNDAY, []),
+        ]
+    )
+
+
 def _sort_components(
     components: list[timetable_component.TimetableComponent],
 ) -> list[timetable_component.TimetableComponent]:
@@ -115,7 +148,10 @@ def _sort_components(
     Sort the components by their start time.
     Upstream validation should mean this is the same as sorting by the end time.
     """
-    return sorted(components, key=lambda component: component.starts_at)
+    return sorted(
+        components,
+        key=lambda component: component.time_of_week.starts_at_minute_of_week,
+    )
 
 
 def _merge_consecutive_components(
@@ -201,9 +237,25 @@ def _set_percentage_of_days_timetable(
     return components
 
 
-def _get_lesson_colours(lessons: models.LessonQuerySet) -> dict[str, str]:
-    """Get a colour"""
-    ordered_lessons = lessons.order_by("total_required_slots").reverse()
+def _get_all_time_slots(lesson: models.Lesson) -> list[models.TimetableSlot]:
+    """
+    Equivalent of Lesson.get_all_time_slots, taking the union of any prefetched slots in memory.
+    """
+    slots = {
+        slot.pk: slot
+        for slot in [
+            *lesson.user_defined_time_slots.all(),
+            *lesson.solver_defined_time_slots.all(),
+        ]
+    }
+    return sorted(slots.values(), key=lambda slot: (slot.day_of_week, slot.starts_at))
+
+
+def _get_lesson_colours(lessons: list[models.Lesson]) -> dict[str, str]:
+    """Get a colour for each lesson, ranking the lessons by their number of required slots."""
+    ordered_lessons = sorted(
+        lessons, key=lambda lesson: lesson.total_required_slots, reverse=True
+    )
     return {
         lesson.lesson_id: view_timetable_constants.Colour.get_colour(rank)
         for rank, lesson in enumerate(ordered_lessons)
@@ -0,0 +1,77 @@
+"""
+Caching of built / rendered timetables, so that repeat views of a timetable don't remake it.
+"""
+
+# Standard library imports
+import functools
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
+
+# Django imports
+from django.core.cache import cache
+from django.db import transaction
+
+# Local application imports
+from data import models
+
+T = TypeVar("T")
+
+
+class TimetableCache:
+    """
+    Cache of anything made from a school's timetables, keyed by the school, its data version and an entity.
+
+    The data version is incremented whenever any data shown on a timetable changes (see data.signals), including
+    when a new solution is saved. So entries for an old version are just never read again, and no invalidation
+    is needed. The data version is read once, when the cache is instantiated.
+
+    Values are only cached once the current transaction (if any) commits. A transaction that changed the school's
+    data and was then rolled back would leave its data version to be reused by the next change, so values made in
+    it could otherwise be read as that change's.
+    """
+
+    def __init__(self, school_id: int) -> None:
+        self._school_id = school_id
+        self._data_version = (
+            models.School.objects.filter(school_access_key=school_id)
+            .values_list("data_version", flat=True)
+            .get()
+        )
+
+    def get_or_set(self, entity: str, make: Callable[[], T]) -> T:
+        """
+        Get the cached value for an entity (e.g. "pupil-1"), making and caching it if not cached.
+        """
+        key = self._get_key(entity)
+        if (value := cache.get(key)) is None:
+            value = make()
+            self._set_on_commit({key: value})
+        return value
+
+    def get_many_or_set(
+        self, entities: Sequence[str], make: Callable[[str], T]
+    ) -> dict[str, T]:
+        """
+        Get the cached values for many entities at once, making and caching any that aren't cached.
+        :return Dict mapping each entity to its value, in the order of the passed entities.
+        """
+        keys = {entity: self._get_key(entity) for entity in entities}
+        cached = cache.get_many(keys.values())
+
+        values = {}
+        missing = {}
+        for entity, key in keys.items():
+            if key in cached:
+                values[entity] = cached[key]
+            else:
+                values[entity] = missing[key] = make(entity)
+        if missing:
+            self._set_on_commit(missing)
+        return values
+
+    @staticmethod
+    def _set_on_commit(values: dict[str, Any]) -> None:
+        transaction.on_commit(functools.partial(cache.set_many, values))
+
+    def _get_key(self, entity: str) -> str:
+        return f"timetable:{self._school_id}:{self._data_version}:{entity}"
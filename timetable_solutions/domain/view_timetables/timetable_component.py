@@ -6,6 +6,7 @@ import re
 # Local application imports
 from data import constants as data_constants
 from data import models
+from domain.solver.filters import clashes as clash_filters
 from domain.view_timetables import constants as view_timetables_constants
 
 
@@ -138,14 +139,21 @@ class TimetableComponent:
     def is_free_period(self) -> bool:
         return not self.model_instance
 
+    @property
+    def time_of_week(self) -> clash_filters.TimeOfWeek:
+        """The time of week this component spans, e.g. to get its minutes since the start of the week."""
+        return clash_filters.TimeOfWeek(
+            starts_at=self.starts_at, ends_at=self.ends_at, day_of_week=self.day_of_week
+        )
+
     @property
     def duration_hours(self) -> float:
         """Number of hours (as a decimal) a component lasts."""
-        dur_delta = dt.timedelta(
-            hours=self.ends_at.hour, minutes=self.ends_at.minute
-        ) - dt.timedelta(hours=self.starts_at.hour, minutes=self.starts_at.minute)
-        seconds_per_hour = 3600
-        return dur_delta.seconds / seconds_per_hour
+        time_of_week = self.time_of_week
+        duration_minutes = (
+            time_of_week.ends_at_minute_of_week - time_of_week.starts_at_minute_of_week
+        )
+        return duration_minutes / 60
 
     @property
     def css_class(self) -> str:
@@ -112,6 +112,11 @@ class UrlName(StrEnum):
 
     # Create timetables app
     CREATE_TIMETABLES = "create_timetables"
+    SOLUTION_CANDIDATES = "solution-candidates"
+    SOLUTION_CANDIDATE_PROMOTE = (
+        "solution-candidate-promote"  # kwargs: candidate_number: int
+    )
+    SOLVER_RUN_HISTORY = "solver-run-history"
 
     # View timetables app
     PUPIL_TIMETABLE = "pupil_timetable"  # kwargs: pupil_id: int
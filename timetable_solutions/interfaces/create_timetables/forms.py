@@ -27,6 +27,7 @@ class SolutionSpecification(forms.Form):
     IDEAL_PROPORTION_CHOICES = [
         (value / 100, f"{value}%") for value in range(100, 0, -10)
     ]
+    NUMBER_OF_CANDIDATE_SOLUTIONS_CHOICES = [(n, str(n)) for n in range(1, 6)]
 
     # Form fields
     allow_split_lessons_within_each_day = forms.BooleanField(
@@ -54,6 +55,20 @@ class SolutionSpecification(forms.Form):
         required=False,
         coerce=float,
     )
+    allow_partial_timetable = forms.BooleanField(
+        label="If no full timetable is possible, find the best partial timetable",
+        label_suffix="",
+        widget=forms.CheckboxInput,
+        required=False,
+    )
+    number_of_candidate_solutions = forms.TypedChoiceField(
+        label="Number of alternative timetables to generate",
+        label_suffix="",
+        choices=NUMBER_OF_CANDIDATE_SOLUTIONS_CHOICES,
+        required=False,
+        coerce=int,
+        empty_value=1,
+    )
 
     def __init__(self, *args: Any, **kwargs: Any):
         """
@@ -113,5 +128,11 @@ class SolutionSpecification(forms.Form):
             ideal_proportion_of_free_periods_at_this_time=self.cleaned_data[
                 "ideal_proportion_of_free_periods_at_this_time"
             ],
+            number_of_candidate_solutions=self.cleaned_data.get(
+                "number_of_candidate_solutions", 1
+            ),
+            allow_partial_timetable=self.cleaned_data.get(
+                "allow_partial_timetable", False
+            ),
         )
         return spec
@@ -1,9 +1,11 @@
 # Django imports
 from django.core.management import base as base_command
+from django.utils import timezone
 
 # Local application imports
 from data import models
 from domain import solver
+from domain.solver import instrumentation
 
 
 class Command(base_command.BaseCommand):
@@ -33,9 +35,22 @@ class Command(base_command.BaseCommand):
             allow_triple_periods_and_above=False,
         )
 
-        solver.produce_timetable_solutions(
+        started_at = timezone.now()
+        error_messages = solver.produce_timetable_solutions(
             school_access_key=school.school_access_key, solution_specification=spec
         )
+        for message in error_messages:
+            self.stderr.write(message)
+
+        # Show the size of each family of constraints, if the problem got as far as being formulated
+        solver_run = models.SolverRun.objects.get_all_instances_for_school(
+            school_id=school.school_access_key
+        ).first()
+        if solver_run is not None and solver_run.created_at >= started_at:
+            report = instrumentation.FormulationReport.from_json(
+                solver_run.constraint_families
+            )
+            self.stdout.write(report.format_table())
 
 
 def _get_school(school_access_key: int) -> models.School:
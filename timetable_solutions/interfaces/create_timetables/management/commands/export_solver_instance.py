@@ -0,0 +1,74 @@
+# Standard library imports
+import json
+import pathlib
+
+# Django imports
+from django.core.management import base as base_command
+
+# Local application imports
+from data import models
+from domain import solver
+from domain.solver import snapshot
+
+
+class Command(base_command.BaseCommand):
+    help = (
+        "Export a school's timetabling problem as an anonymised json snapshot "
+        "and an MPS file, e.g. for reproducing a slow solve"
+    )
+
+    def add_arguments(self, parser: base_command.CommandParser) -> None:
+        parser.add_argument(
+            "--school-access-key",
+            help="The school whose timetabling problem should be exported",
+        )
+        parser.add_argument(
+            "--output-directory",
+            default=".",
+            help="The directory to write the snapshot and MPS file to",
+        )
+
+    def handle(self, *args: str, **options: str | int) -> None:
+        if not (school_access_key := options["school_access_key"]):
+            raise base_command.CommandError("You must provide a school access key")
+
+        try:
+            school_access_key = int(school_access_key)
+        except ValueError:
+            raise base_command.CommandError("School access key must be an integer")
+
+        if not models.School.objects.filter(
+            school_access_key=school_access_key
+        ).exists():
+            raise base_command.CommandError("No school with this access key exists")
+
+        output_directory = pathlib.Path(str(options["output_directory"]))
+        output_directory.mkdir(parents=True, exist_ok=True)
+
+        # This is the same specification used by the create_timetables command
+        spec = solver.SolutionSpecification(
+            allow_split_lessons_within_each_day=False,
+            allow_triple_periods_and_above=False,
+        )
+
+        # Write the snapshot
+        school_snapshot = snapshot.get_school_snapshot(
+            school_id=school_access_key, solution_specification=spec
+        )
+        snapshot_path = output_directory / f"school_{school_access_key}_snapshot.json"
+        snapshot_path.write_text(json.dumps(school_snapshot, indent=2))
+        self.stdout.write(f"Wrote snapshot to {snapshot_path}")
+
+        # Write the MPS file, renaming variables and constraints so that no ids are included
+        input_data = solver.TimetableSolverInputs(
+            school_id=school_access_key, solution_specification=spec
+        )
+        if input_data.error_messages:
+            raise base_command.CommandError(
+                "Could not formulate the problem as an MPS file: "
+                + " ".join(input_data.error_messages)
+            )
+        timetable_solver = solver.TimetableSolver(input_data=input_data)
+        mps_path = output_directory / f"school_{school_access_key}.mps"
+        timetable_solver.problem.writeMPS(str(mps_path), rename=True)
+        self.stdout.write(f"Wrote MPS file to {mps_path}")
@@ -0,0 +1,91 @@
+# Standard library imports
+import json
+import pathlib
+
+# Django imports
+from django.core.management import base as base_command
+from django.db import transaction
+
+# Local application imports
+from data import models
+from domain import solver
+from domain.solver import snapshot
+
+
+class Command(base_command.BaseCommand):
+    help = (
+        "Load a snapshot written by export_solver_instance into a new school, "
+        "or solve it directly without keeping any data"
+    )
+
+    def add_arguments(self, parser: base_command.CommandParser) -> None:
+        parser.add_argument(
+            "snapshot_path",
+            help="The json snapshot to load",
+        )
+        parser.add_argument(
+            "--solve",
+            action="store_true",
+            help="Solve the snapshot, report how long this took, and then discard all its data",
+        )
+
+    def handle(self, *args: str, **options: str | bool) -> None:
+        snapshot_path = pathlib.Path(str(options["snapshot_path"]))
+        try:
+            school_snapshot = json.loads(snapshot_path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError) as exc:
+            raise base_command.CommandError(f"Could not read snapshot: {exc}")
+
+        if not options["solve"]:
+            school = self._load_snapshot(school_snapshot)
+            self.stdout.write(
+                f"Loaded snapshot into school with access key {school.school_access_key}"
+            )
+            return None
+
+        # Load the snapshot into a scratch school, that is rolled back after solving
+        with transaction.atomic():
+            school = self._load_snapshot(school_snapshot)
+            spec = snapshot.get_solution_specification_from_snapshot(school_snapshot)
+            error_messages = solver.produce_timetable_solutions(
+                school_access_key=school.school_access_key,
+                solution_specification=spec,
+            )
+            self._write_solver_run(school=school, error_messages=error_messages)
+            transaction.set_rollback(True)
+
+    def _load_snapshot(self, school_snapshot: dict) -> models.School:
+        try:
+            return snapshot.load_school_snapshot(school_snapshot)
+        except (ValueError, KeyError) as exc:
+            raise base_command.CommandError(f"Invalid snapshot: {exc}")
+
+    def _write_solver_run(
+        self, school: models.School, error_messages: list[str]
+    ) -> None:
+        """
+        Report the outcome of solving the snapshot, and the resources used by each phase.
+        """
+        for message in error_messages:
+            self.stdout.write(self.style.ERROR(message))
+
+        if not (
+            solver_run := models.SolverRun.objects.get_all_instances_for_school(
+                school_id=school.school_access_key
+            ).first()
+        ):
+            return None
+
+        self.stdout.write(
+            f"Status: {solver_run.solver_status}, "
+            f"variables: {solver_run.number_of_variables}, "
+            f"constraints: {solver_run.number_of_constraints}, "
+            f"non-zeros: {solver_run.number_of_nonzeros}"
+        )
+        for phase in solver_run.phases:
+            self.stdout.write(
+                f"{phase['name']}: {phase['wall_time_seconds']:.3f}s, "
+                f"peak RSS +{phase['peak_rss_kb']}KB "
+                f"(child processes +{phase.get('child_peak_rss_kb', 0)}KB)"
+            )
+        self.stdout.write(f"Total: {solver_run.total_wall_time_seconds:.3f}s")
@@ -0,0 +1,92 @@
+# Standard library imports
+import datetime as dt
+import json
+import pathlib
+import platform
+
+# Django imports
+from django.core.management import base as base_command
+
+# Local application imports
+from domain import solver
+
+# The import from tests is a special-case, since the benchmark schools are built from the test factories
+from tests.benchmarks import run_benchmarks, synthetic_school
+
+
+class Command(base_command.BaseCommand):
+    help = (
+        "Solve the timetabling problems of synthetic schools at different scales, "
+        "and write the time spent in each phase to a json file"
+    )
+
+    def add_arguments(self, parser: base_command.CommandParser) -> None:
+        parser.add_argument(
+            "--scale",
+            action="append",
+            choices=list(synthetic_school.SCALES),
+            help="A scale to benchmark (can be repeated). Defaults to all scales.",
+        )
+        parser.add_argument(
+            "--repeats",
+            type=int,
+            default=1,
+            help="How many times to solve each scale, with a different seed each time",
+        )
+        parser.add_argument(
+            "--lazy-clash-constraints",
+            action="store_true",
+            help="Generate the teacher and classroom clash constraints lazily",
+        )
+        parser.add_argument(
+            "--sparse-model",
+            action="store_true",
+            help="Assemble the constraint matrix as arrays, rather than with PuLP",
+        )
+        parser.add_argument(
+            "--output",
+            default="solver_benchmarks.json",
+            help="The json file to write the results to",
+        )
+
+    def handle(self, *args: str, **options: str | int | list[str] | None) -> None:
+        scale_names = options["scale"] or list(synthetic_school.SCALES)
+        assert isinstance(scale_names, list)
+        repeats = int(str(options["repeats"]))
+        if repeats < 1:
+            raise base_command.CommandError("Repeats must be at least 1")
+
+        solution_specification = solver.SolutionSpecification(
+            allow_split_lessons_within_each_day=False,
+            allow_triple_periods_and_above=False,
+            lazy_clash_constraints=bool(options["lazy_clash_constraints"]),
+            sparse_model=bool(options["sparse_model"]),
+        )
+
+        results = []
+        for scale_name in scale_names:
+            for seed in range(repeats):
+                result = run_benchmarks.run_benchmark(
+                    scale_name=scale_name,
+                    scale=synthetic_school.SCALES[scale_name],
+                    seed=seed,
+                    solution_specification=solution_specification,
+                )
+                results.append(result)
+                self.stdout.write(
+                    f"{scale_name} (seed {seed}): {result['solver_status']} in "
+                    f"{result['total_wall_time_seconds']:.3f}s"
+                )
+
+        output_path = pathlib.Path(str(options["output"]))
+        output_path.write_text(
+            json.dumps(
+                {
+                    "created_at": dt.datetime.now().isoformat(),
+                    "python_version": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        self.stdout.write(f"Wrote benchmark results to {output_path}")
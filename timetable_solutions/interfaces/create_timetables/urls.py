@@ -7,5 +7,22 @@ from interfaces.create_timetables import views
 
 
 urlpatterns = [
-    urls.path("", views.CreateTimetable.as_view(), name=UrlName.CREATE_TIMETABLES.value)
+    urls.path(
+        "", views.CreateTimetable.as_view(), name=UrlName.CREATE_TIMETABLES.value
+    ),
+    urls.path(
+        "candidates/",
+        views.solution_candidates,
+        name=UrlName.SOLUTION_CANDIDATES.value,
+    ),
+    urls.path(
+        "candidates/<int:candidate_number>/promote/",
+        views.promote_solution_candidate,
+        name=UrlName.SOLUTION_CANDIDATE_PROMOTE.value,
+    ),
+    urls.path(
+        "history/",
+        views.solver_run_history,
+        name=UrlName.SOLVER_RUN_HISTORY.value,
+    ),
 ]
@@ -1,14 +1,19 @@
 """
-Module containing the view class for the timetable creation page.
+Module containing the views for the timetable creation page, and for choosing between solution candidates.
 """
 
 # Standard library imports
 from typing import Any
 
 # Django imports
+from django import http, shortcuts
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse
+from django.template import loader
+from django.views.decorators.http import require_POST
 from django.views.generic.edit import FormView
 
 # Local application imports
@@ -47,6 +52,9 @@ class CreateTimetable(LoginRequiredMixin, FormView):
         if len(error_messages) == 0:
             message = "Solutions have been found for your timetabling problem!"
             messages.add_message(self.request, level=messages.SUCCESS, message=message)
+            if form.cleaned_data.get("number_of_candidate_solutions", 1) > 1:
+                # Let the user choose between the alternative solutions
+                return http.HttpResponseRedirect(UrlName.SOLUTION_CANDIDATES.url())
             return super().form_valid(form=form)
         else:
             for message in error_messages:
@@ -70,6 +78,7 @@ class CreateTimetable(LoginRequiredMixin, FormView):
         Method adding additional context to the context dictionary provided by super class.
         In particular, we need to carry a boolean that's True if the user has uploaded all data and can start creating
         timetables, and False if they need to complete the data upload step.
+        In debug mode, the school's latest solver run is also added.
         """
         context_data = super().get_context_data()
         school = self.request.user.profile.school
@@ -78,6 +87,13 @@ class CreateTimetable(LoginRequiredMixin, FormView):
         ] = solver_school_queries.check_school_has_sufficient_data_to_create_timetables(
             school=school
         )
+        if settings.DEBUG:
+            # Show the size of each family of constraints in the latest run, to help debug slow formulations
+            context_data[
+                "latest_solver_run"
+            ] = models.SolverRun.objects.get_all_instances_for_school(
+                school_id=school.school_access_key
+            ).first()
         return context_data
 
     def get_form_kwargs(self) -> dict:
@@ -99,3 +115,56 @@ class CreateTimetable(LoginRequiredMixin, FormView):
         if "teachers" in http_referer or "pupils" in http_referer:
             return http_referer
         return super().get_success_url()
+
+
+@login_required
+def solution_candidates(request: http.HttpRequest) -> http.HttpResponse:
+    """
+    View listing the alternative timetable solutions found in the school's latest run of the solver.
+    Each candidate is previewed as the slots assigned to each lesson.
+    """
+    school_id = request.user.profile.school.school_access_key
+    candidates = models.SolutionCandidate.objects.get_all_instances_for_school(
+        school_id=school_id
+    )
+    candidate_lesson_slots = {
+        candidate: candidate.get_lesson_slots() for candidate in candidates
+    }
+
+    template = loader.get_template("create-timetables/solution-candidates.html")
+    context = {"candidate_lesson_slots": candidate_lesson_slots}
+    return http.HttpResponse(template.render(context, request))
+
+
+@login_required
+@require_POST
+def promote_solution_candidate(
+    request: http.HttpRequest, candidate_number: int
+) -> http.HttpResponse:
+    """
+    View making the chosen solution candidate the school's timetable.
+    """
+    school_id = request.user.profile.school.school_access_key
+    candidate = shortcuts.get_object_or_404(
+        models.SolutionCandidate, school_id=school_id, candidate_number=candidate_number
+    )
+    candidate.promote()
+
+    message = f"{candidate} is now your timetable solution!"
+    messages.success(request, message=message)
+    return shortcuts.redirect(UrlName.PUPIL_LIST.url())
+
+
+@login_required
+def solver_run_history(request: http.HttpRequest) -> http.HttpResponse:
+    """
+    View listing the school's previous runs of the solver, with the time and memory spent on each.
+    """
+    school_id = request.user.profile.school.school_access_key
+    solver_runs = models.SolverRun.objects.get_all_instances_for_school(
+        school_id=school_id
+    )
+
+    template = loader.get_template("create-timetables/solver-run-history.html")
+    context = {"solver_runs": solver_runs}
+    return http.HttpResponse(template.render(context, request))
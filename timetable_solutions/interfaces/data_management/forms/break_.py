@@ -12,6 +12,7 @@ from django.db import models as django_models
 # Local application imports
 from data import constants, models
 from domain.solver.filters import clashes as clash_filters
+from domain.solver.filters import occupancy
 from domain.solver.queries import teacher as teacher_solver_queries
 from interfaces.data_management.forms import base_forms
 
@@ -114,23 +115,16 @@ class BreakUpdateYearGroups(django_forms.Form):
 
     def _raise_if_clashes_produced_for_a_year_group(self) -> None:
         time_of_week = clash_filters.TimeOfWeek.from_break(self.break_)
-        relevant_year_groups = self.cleaned_data["relevant_year_groups"]
-
-        # Check for clashes with breaks
-        check_against_breaks = models.Break.objects.filter(
-            relevant_year_groups__in=relevant_year_groups
-        ).exclude(break_id=self.break_.break_id)
-        break_clash_str = _get_break_clash_str(
-            time_of_week=time_of_week, check_against_breaks=check_against_breaks
-        )
-
-        # Check for clashes with slots
-        check_against_slots = models.TimetableSlot.objects.filter(
-            relevant_year_groups__in=relevant_year_groups
-        )
-        slot_clash_str = _get_slot_clash_str(
-            time_of_week=time_of_week, check_against_slots=check_against_slots
+        clash = occupancy.get_school_occupancy(school_id=self.school_id).get_clashes(
+            time_of_week,
+            year_group_pks=[
+                year_group.pk
+                for year_group in self.cleaned_data["relevant_year_groups"]
+            ],
+            exclude_break_pk=self.break_.pk,
         )
+        break_clash_str = clash.break_clash_str
+        slot_clash_str = clash.slot_clash_str
 
         if break_clash_str and slot_clash_str:
             raise django_forms.ValidationError(
@@ -301,21 +295,12 @@ class BreakCreate(_BreakCreateUpdateBase):
     def _raise_if_new_slot_would_produce_a_clash(
         self, time_of_week: clash_filters.TimeOfWeek
     ) -> None:
-        # Check for clashes with breaks
-        check_against_breaks = models.Break.objects.get_all_instances_for_school(
-            school_id=self.school_id
-        )
-        break_clash_str = _get_break_clash_str(
-            time_of_week=time_of_week, check_against_breaks=check_against_breaks
-        )
-
-        # Check for clashes with slots
-        check_against_slots = models.TimetableSlot.objects.get_all_instances_for_school(
-            school_id=self.school_id
-        )
-        slot_clash_str = _get_slot_clash_str(
-            time_of_week=time_of_week, check_against_slots=check_against_slots
+        # Check for clashes with all the school's breaks and slots
+        clash = occupancy.get_school_occupancy(school_id=self.school_id).get_clashes(
+            time_of_week
         )
+        break_clash_str = clash.break_clash_str
+        slot_clash_str = clash.slot_clash_str
 
         if break_clash_str and slot_clash_str:
             raise django_forms.ValidationError(
@@ -383,7 +368,7 @@ def _get_break_clash_str(
     Get part of a potential error message stating the times of the
     breaks that an updated break causes clashes with.
     """
-    break_clashes = clash_filters.filter_queryset_for_clashes(
+    break_clashes = clash_filters.find_clashes(
         queryset=check_against_breaks, time_of_week=time_of_week
     )
     if break_clashes:
@@ -404,7 +389,7 @@ def _get_slot_clash_str(
     Get part of a potential error message stating the times of the
     slots that an updated break causes clashes with.
     """
-    slot_clashes = clash_filters.filter_queryset_for_clashes(
+    slot_clashes = clash_filters.find_clashes(
         queryset=check_against_slots, time_of_week=time_of_week
     )
     if slot_clashes:
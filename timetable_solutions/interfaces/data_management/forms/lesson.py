@@ -10,6 +10,7 @@ from django import forms as django_forms
 
 # Local application imports
 from data import models
+from domain.solver.filters import clashes as clash_filters
 from domain.solver.queries import classroom as classroom_solver_queries
 from domain.solver.queries import pupil as pupil_solver_queries
 from domain.solver.queries import teacher as teacher_solver_queries
@@ -122,15 +123,9 @@ class LessonUpdate(_LessonCreateUpdateBase):
             return None
 
         # Check the updated teacher is not busy at any of the time slots
-        clashes = []
-        for slot in self.lesson.user_defined_time_slots.all():
-            if clash := teacher_solver_queries.check_if_teacher_busy_at_time(
-                teacher=teacher,
-                starts_at=slot.starts_at,
-                ends_at=slot.ends_at,
-                day_of_week=slot.day_of_week,
-            ):
-                clashes.append(clash)
+        clashes = teacher_solver_queries.find_teacher_clashes(
+            teacher=teacher, times=self._get_user_defined_times()
+        )
 
         if clashes:
             raise django_forms.ValidationError(
@@ -150,16 +145,10 @@ class LessonUpdate(_LessonCreateUpdateBase):
         ):
             return None
 
-        # Check the updated teacher is not busy at any of the time slots
-        clashes = []
-        for slot in self.lesson.user_defined_time_slots.all():
-            if clash := classroom_solver_queries.check_if_classroom_occupied_at_time(
-                classroom=classroom,
-                starts_at=slot.starts_at,
-                ends_at=slot.ends_at,
-                day_of_week=slot.day_of_week,
-            ):
-                clashes.append(clash)
+        # Check the updated classroom is not busy at any of the time slots
+        clashes = classroom_solver_queries.find_classroom_clashes(
+            classroom=classroom, times=self._get_user_defined_times()
+        )
 
         if clashes:
             raise django_forms.ValidationError(
@@ -169,6 +158,12 @@ class LessonUpdate(_LessonCreateUpdateBase):
 
         return classroom
 
+    def _get_user_defined_times(self) -> list[clash_filters.TimeOfWeek]:
+        return [
+            clash_filters.TimeOfWeek.from_slot(slot)
+            for slot in self.lesson.user_defined_time_slots.all()
+        ]
+
 
 class LessonAddPupil(django_forms.Form):
     pupil = django_forms.ModelChoiceField(
@@ -205,15 +200,11 @@ class LessonAddPupil(django_forms.Form):
 
     def clean_pupil(self) -> models.Pupil:
         pupil = self.cleaned_data["pupil"]
-        clashes = []
-        for slot in self.lesson.user_defined_time_slots.all():
-            if clash := pupil_solver_queries.check_if_pupil_busy_at_time(
-                pupil=pupil,
-                starts_at=slot.starts_at,
-                ends_at=slot.ends_at,
-                day_of_week=slot.day_of_week,
-            ):
-                clashes.append(clash)
+        times = [
+            clash_filters.TimeOfWeek.from_slot(slot)
+            for slot in self.lesson.user_defined_time_slots.all()
+        ]
+        clashes = pupil_solver_queries.find_busy_pupils(pupils=[pupil], times=times)
 
         if clashes:
             raise django_forms.ValidationError(
@@ -260,24 +251,19 @@ class LessonAddUserDefinedTimetableSlot(django_forms.Form):
         Check no pupil, teacher or pupil would be given a clash if added to the lesson.
         """
         slot = self.cleaned_data["slot"]
+        times = [clash_filters.TimeOfWeek.from_slot(slot)]
 
         # Check the lesson's teacher would be given a clash
-        if teacher_solver_queries.check_if_teacher_busy_at_time(
-            teacher=self.lesson.teacher,
-            starts_at=slot.starts_at,
-            ends_at=slot.ends_at,
-            day_of_week=slot.day_of_week,
+        if self.lesson.teacher and teacher_solver_queries.find_teacher_clashes(
+            teacher=self.lesson.teacher, times=times
         ):
             raise django_forms.ValidationError(
                 f"Cannot add {slot}, since the lesson's teacher "
                 "is already busy at this time"
             )
 
-        if classroom_solver_queries.check_if_classroom_occupied_at_time(
-            classroom=self.lesson.classroom,
-            starts_at=slot.starts_at,
-            ends_at=slot.ends_at,
-            day_of_week=slot.day_of_week,
+        if self.lesson.classroom and classroom_solver_queries.find_classroom_clashes(
+            classroom=self.lesson.classroom, times=times
         ):
             raise django_forms.ValidationError(
                 f"Cannot add {slot}, since the lesson's classroom "
@@ -285,16 +271,9 @@ class LessonAddUserDefinedTimetableSlot(django_forms.Form):
             )
 
         # Check none of the lesson's pupils would be given a clash
-        pupil_clashes = []
-        for pupil in self.lesson.pupils.all():
-            if clash := pupil_solver_queries.check_if_pupil_busy_at_time(
-                pupil=pupil,
-                starts_at=slot.starts_at,
-                ends_at=slot.ends_at,
-                day_of_week=slot.day_of_week,
-            ):
-                pupil_clashes.append(clash)
-        if pupil_clashes:
+        if pupil_solver_queries.find_busy_pupils(
+            pupils=list(self.lesson.pupils.all()), times=times
+        ):
             raise django_forms.ValidationError(
                 f"Cannot add {slot}, since at least one of the pupils in this "
                 "lesson is already busy at this time"
@@ -11,6 +11,7 @@ from django import forms as django_forms
 # Local application imports
 from data import constants, models
 from domain.solver.filters import clashes as clash_filters
+from domain.solver.filters import occupancy
 from interfaces.data_management.forms import base_forms
 
 
@@ -119,22 +120,16 @@ class TimetableSlotUpdateYearGroups(django_forms.Form):
 
     def _raise_if_clashes_produced_for_a_year_group(self) -> None:
         time_of_week = clash_filters.TimeOfWeek.from_slot(self.slot)
-
-        # Check for clashes with slots
-        check_against_slots = models.TimetableSlot.objects.filter(
-            relevant_year_groups__in=self.cleaned_data["relevant_year_groups"]
-        ).exclude(slot_id=self.slot.slot_id)
-        slot_clash_str = _get_slot_clash_str(
-            time_of_week=time_of_week, check_against_slots=check_against_slots
-        )
-
-        # Check for clashes with breaks
-        check_against_breaks = models.Break.objects.filter(
-            relevant_year_groups__in=self.cleaned_data["relevant_year_groups"]
-        )
-        break_clash_str = _get_break_clash_str(
-            time_of_week=time_of_week, check_against_breaks=check_against_breaks
+        clash = occupancy.get_school_occupancy(school_id=self.school_id).get_clashes(
+            time_of_week,
+            year_group_pks=[
+                year_group.pk
+                for year_group in self.cleaned_data["relevant_year_groups"]
+            ],
+            exclude_slot_pk=self.slot.pk,
         )
+        slot_clash_str = clash.slot_clash_str
+        break_clash_str = clash.break_clash_str
 
         if slot_clash_str and break_clash_str:
             raise django_forms.ValidationError(
@@ -223,21 +218,15 @@ class TimetableSlotUpdateTimings(_TimetableSlotCreateUpdateBase):
             day_of_week=self.cleaned_data["day_of_week"],
         )
 
-        # Check for clashes with slots
-        check_against_slots = models.TimetableSlot.objects.filter(
-            relevant_year_groups__in=self.slot.relevant_year_groups.all()
-        ).exclude(slot_id=self.slot.slot_id)
-        slot_clash_str = _get_slot_clash_str(
-            time_of_week=new_time_of_week, check_against_slots=check_against_slots
-        )
-
-        # Check for clashes with breaks
-        check_against_breaks = models.Break.objects.filter(
-            relevant_year_groups__in=self.slot.relevant_year_groups.all()
-        )
-        break_clash_str = _get_break_clash_str(
-            time_of_week=new_time_of_week, check_against_breaks=check_against_breaks
+        clash = occupancy.get_school_occupancy(
+            school_id=self.slot.school_id
+        ).get_clashes(
+            new_time_of_week,
+            year_group_pks=self.slot.relevant_year_groups.values_list("pk", flat=True),
+            exclude_slot_pk=self.slot.pk,
         )
+        slot_clash_str = clash.slot_clash_str
+        break_clash_str = clash.break_clash_str
 
         if slot_clash_str and break_clash_str:
             raise django_forms.ValidationError(
@@ -297,21 +286,12 @@ class TimetableSlotCreate(_TimetableSlotCreateUpdateBase):
             day_of_week=self.cleaned_data["day_of_week"],
         )
 
-        # Check for clashes with slots
-        check_against_slots = models.TimetableSlot.objects.get_all_instances_for_school(
-            school_id=self.school_id
-        )
-        slot_clash_str = _get_slot_clash_str(
-            time_of_week=time_of_week, check_against_slots=check_against_slots
-        )
-
-        # Check for clashes with breaks
-        check_against_breaks = models.Break.objects.get_all_instances_for_school(
-            school_id=self.school_id
-        )
-        break_clash_str = _get_break_clash_str(
-            time_of_week=time_of_week, check_against_breaks=check_against_breaks
+        # Check for clashes with all the school's slots and breaks
+        clash = occupancy.get_school_occupancy(school_id=self.school_id).get_clashes(
+            time_of_week
         )
+        slot_clash_str = clash.slot_clash_str
+        break_clash_str = clash.break_clash_str
 
         if slot_clash_str and break_clash_str:
             raise django_forms.ValidationError(
@@ -328,44 +308,3 @@ class TimetableSlotCreate(_TimetableSlotCreateUpdateBase):
                 "This slot cannot be assigned to all year groups since your school has a "
                 f"break at {break_clash_str} clashing with this time."
             )
-
-
-def _get_slot_clash_str(
-    time_of_week: clash_filters.TimeOfWeek,
-    check_against_slots: models.TimetableSlotQuerySet,
-) -> str:
-    """
-    Get part of a potential error message stating the times of the
-    slots that an updated slot causes clashes with.
-    """
-    slot_clashes = clash_filters.filter_queryset_for_clashes(
-        queryset=check_against_slots, time_of_week=time_of_week
-    )
-    if slot_clashes:
-        return ", ".join(
-            [
-                f'{slot.starts_at.strftime("%H:%M")}-{slot.ends_at.strftime("%H:%M")}'
-                for slot in slot_clashes
-            ]
-        )
-    return ""
-
-
-def _get_break_clash_str(
-    time_of_week: clash_filters.TimeOfWeek, check_against_breaks: models.BreakQuerySet
-) -> str:
-    """
-    Get part of a potential error message stating the times of the
-    breaks that an updated slot causes clashes with.
-    """
-    break_clashes = clash_filters.filter_queryset_for_clashes(
-        queryset=check_against_breaks, time_of_week=time_of_week
-    )
-    if break_clashes:
-        return ", ".join(
-            [
-                f'{break_.starts_at.strftime("%H:%M")}-{break_.ends_at.strftime("%H:%M")}'
-                for break_ in break_clashes
-            ]
-        )
-    return ""
@@ -4,7 +4,6 @@ import datetime as dt
 # Django imports
 from django.contrib.auth import models as auth_models
 from django.core.management import base as base_command
-from django.db import transaction
 
 # Local application imports
 # The import from tests is a special-case, since it's a big shortcut
@@ -55,7 +54,7 @@ class Command(base_command.BaseCommand):
         except ValueError:
             raise base_command.CommandError("School access key must be an integer")
 
-        with transaction.atomic():
+        with models.School.coalesce_data_version_increments():
             school = _create_school(school_access_key)
             # Create an admin user for this school if one does not exist already
             _create_admin_user_for_school(school)
@@ -2,16 +2,33 @@
 Views used to navigate users towards an individual pupil/teacher's timetable.
 """
 
+# Standard library imports
+import itertools
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
 # Django imports
 from django import http, shortcuts
 from django.contrib.auth.decorators import login_required
+from django.db import models as django_models
 from django.template import loader
 
 # Local application imports
+from data import constants as data_constants
 from data import models
 from domain import view_timetables
+from domain.view_timetables import timetable_component
 from interfaces.utils import typing_utils
 
+_Timetable = OrderedDict[
+    data_constants.Day, list[timetable_component.TimetableComponent]
+]
+_Person = TypeVar("_Person", models.Pupil, models.Teacher)
+
+# The number of people whose timetables are loaded / read from the cache at once, when printing them all
+_PRINT_BATCH_SIZE = 100
+
 
 @login_required
 def pupil_timetable(request: http.HttpRequest, pupil_id: int) -> http.HttpResponse:
@@ -24,28 +41,39 @@ def pupil_timetable(request: http.HttpRequest, pupil_id: int) -> http.HttpRespon
     pupil = models.Pupil.objects.get_individual_pupil(
         school_id=school_id, pupil_id=pupil_id
     )
-    timetable = view_timetables.get_pupil_timetable(pupil)
+    cache = view_timetables.TimetableCache(school_id=school_id)
+    timetable = cache.get_or_set(
+        f"pupil-{pupil.pk}", lambda: view_timetables.get_pupil_timetable(pupil)
+    )
+    timetable_html = cache.get_or_set(
+        f"pupil-{pupil.pk}-html", lambda: _render_timetable(timetable)
+    )
 
     template = loader.get_template("view_timetables/pupil-timetable.html")
     context = {
         "pupil": pupil,
         "timetable": timetable,
+        "timetable_html": timetable_html,
     }
     return http.HttpResponse(template.render(context, request))
 
 
 @login_required
-def pupil_timetables(request: http.HttpRequest) -> http.HttpResponse:
+def pupil_timetables(request: http.HttpRequest) -> http.StreamingHttpResponse:
     """
-    All pupil timetables.
+    All pupil timetables, streamed one at a time so that large schools' pages start rendering immediately.
     """
     school_id = request.user.profile.school.school_access_key
     pupils = models.Pupil.objects.filter(school_id=school_id)
-    timetables = {pupil: view_timetables.get_pupil_timetable(pupil) for pupil in pupils}
-
-    template = loader.get_template("view_timetables/print-timetables.html")
-    context = {"timetables": timetables, "is_pupils": True}
-    return http.HttpResponse(template.render(context, request))
+    return http.StreamingHttpResponse(
+        _stream_timetables(
+            school_id=school_id,
+            people=pupils,
+            load_timetables=view_timetables.SchoolTimetables.for_pupils,
+            get_timetable=view_timetables.SchoolTimetables.get_pupil_timetable,
+            is_pupils=True,
+        )
+    )
 
 
 @login_required
@@ -59,32 +87,39 @@ def teacher_timetable(request: http.HttpRequest, teacher_id: int) -> http.HttpRe
     teacher = models.Teacher.objects.get_individual_teacher(
         school_id=school_id, teacher_id=teacher_id
     )
-    timetable = view_timetables.get_teacher_timetable(teacher)
+    cache = view_timetables.TimetableCache(school_id=school_id)
+    timetable = cache.get_or_set(
+        f"teacher-{teacher.pk}", lambda: view_timetables.get_teacher_timetable(teacher)
+    )
+    timetable_html = cache.get_or_set(
+        f"teacher-{teacher.pk}-html", lambda: _render_timetable(timetable)
+    )
 
     template = loader.get_template("view_timetables/teacher-timetable.html")
     context = {
         "teacher": teacher,
         "timetable": timetable,
+        "timetable_html": timetable_html,
     }
     return http.HttpResponse(template.render(context, request))
 
 
 @login_required
-def teacher_timetables(request: http.HttpRequest) -> http.HttpResponse:
+def teacher_timetables(request: http.HttpRequest) -> http.StreamingHttpResponse:
     """
-    All teacher timetables.
+    All teacher timetables, streamed one at a time so that large schools' pages start rendering immediately.
     """
     school_id = request.user.profile.school.school_access_key
     teachers = models.Teacher.objects.filter(school_id=school_id)
-    timetables = {
-        teacher: view_timetables.get_teacher_timetable(teacher) for teacher in teachers
-    }
-
-    template = loader.get_template("view_timetables/print-timetables.html")
-    context = {
-        "timetables": timetables,
-    }
-    return http.HttpResponse(template.render(context, request))
+    return http.StreamingHttpResponse(
+        _stream_timetables(
+            school_id=school_id,
+            people=teachers,
+            load_timetables=view_timetables.SchoolTimetables.for_teachers,
+            get_timetable=view_timetables.SchoolTimetables.get_teacher_timetable,
+            is_pupils=False,
+        )
+    )
 
 
 @login_required
@@ -112,3 +147,58 @@ def lesson_detail_modal(
         return shortcuts.render(
             template_name=template_name, context=context, request=request
         )
+
+
+# --------------------
+# Helpers
+# --------------------
+
+
+def _render_timetable(timetable: _Timetable) -> str:
+    """
+    Render the html of a timetable, for caching and including in the timetable pages.
+    """
+    return loader.render_to_string("partials/timetable.html", {"timetable": timetable})
+
+
+def _stream_timetables(
+    school_id: int,
+    people: django_models.QuerySet[_Person],
+    load_timetables: Callable[[int, list[_Person]], view_timetables.SchoolTimetables],
+    get_timetable: Callable[[view_timetables.SchoolTimetables, _Person], _Timetable],
+    is_pupils: bool,
+) -> Iterator[str]:
+    """
+    Yield the print timetables page piece by piece: its header, and then each pupil / teacher's timetable.
+
+    People are loaded, and their rendered timetables read from the cache, in batches. The lessons and breaks of a
+    batch are only loaded if some of its timetables aren't cached, so that at most one batch's data is held.
+    """
+    yield loader.render_to_string("view_timetables/print-timetables.html")
+
+    cache = view_timetables.TimetableCache(school_id=school_id)
+    people_iterator = people.iterator(chunk_size=_PRINT_BATCH_SIZE)
+    while batch := list(itertools.islice(people_iterator, _PRINT_BATCH_SIZE)):
+        people_by_entity = {
+            f"{type(person).__name__.lower()}-{person.pk}-html": person
+            for person in batch
+        }
+        batch_timetables: view_timetables.SchoolTimetables | None = None
+
+        def render(entity: str) -> str:
+            nonlocal batch_timetables
+            if batch_timetables is None:
+                batch_timetables = load_timetables(school_id, batch)
+            timetable = get_timetable(batch_timetables, people_by_entity[entity])
+            return _render_timetable(timetable)
+
+        timetables_html = cache.get_many_or_set(list(people_by_entity), render)
+        for entity, person in people_by_entity.items():
+            yield loader.render_to_string(
+                "partials/print-timetable.html",
+                {
+                    "person": person,
+                    "timetable_html": timetables_html[entity],
+                    "is_pupils": is_pupils,
+                },
+            )
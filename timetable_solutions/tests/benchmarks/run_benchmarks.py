@@ -0,0 +1,75 @@
+"""
+Running the solver against synthetic schools, and collecting where the time goes.
+"""
+
+# Standard library imports
+import dataclasses
+import time
+from typing import Any
+
+# Third party imports
+import numpy as np
+
+# Django imports
+from django.db import transaction
+
+# Local application imports
+from data import models
+from domain import solver
+from tests.benchmarks.synthetic_school import SchoolScale, create_synthetic_school
+
+
+def run_benchmark(
+    scale_name: str,
+    scale: SchoolScale,
+    seed: int = 0,
+    solution_specification: solver.SolutionSpecification | None = None,
+) -> dict[str, Any]:
+    """
+    Generate a synthetic school, solve its timetabling problem, and summarise the resulting SolverRun.
+
+    All data is created inside a transaction that is rolled back, so nothing is kept in the database.
+    :return: a json serializable summary of the benchmark.
+    """
+    solution_specification = solution_specification or solver.SolutionSpecification(
+        allow_split_lessons_within_each_day=False,
+        allow_triple_periods_and_above=False,
+    )
+
+    with transaction.atomic():
+        start = time.perf_counter()
+        school = create_synthetic_school(scale=scale, seed=seed)
+        generation_seconds = time.perf_counter() - start
+
+        # The objective is randomised, so fix the seed to make runs comparable
+        np.random.seed(seed)
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=school.school_access_key,
+            solution_specification=solution_specification,
+        )
+        solver_run = models.SolverRun.objects.get_all_instances_for_school(
+            school_id=school.school_access_key
+        ).first()
+
+        transaction.set_rollback(True)
+
+    return {
+        "scale_name": scale_name,
+        "scale": dataclasses.asdict(scale),
+        "seed": seed,
+        "generation_seconds": generation_seconds,
+        "error_messages": error_messages,
+        "solver_status": solver_run.solver_status if solver_run else None,
+        "total_wall_time_seconds": solver_run.total_wall_time_seconds
+        if solver_run
+        else None,
+        "max_phase_rss_rise_kb": solver_run.max_phase_rss_rise_kb
+        if solver_run
+        else None,
+        "number_of_variables": solver_run.number_of_variables if solver_run else None,
+        "number_of_constraints": solver_run.number_of_constraints
+        if solver_run
+        else None,
+        "number_of_nonzeros": solver_run.number_of_nonzeros if solver_run else None,
+        "phases": solver_run.phases if solver_run else [],
+    }
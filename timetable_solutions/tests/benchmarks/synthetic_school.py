@@ -0,0 +1,208 @@
+"""
+Generator of synthetic schools at controlled scales, for benchmarking the solver.
+"""
+
+# Standard library imports
+import dataclasses
+import datetime as dt
+import random
+
+# Local application imports
+from data import constants, models
+from tests import data_factories
+
+
+@dataclasses.dataclass(frozen=True)
+class SchoolScale:
+    """
+    The parameters controlling the size and shape of a synthetic school.
+
+    :field n_year_groups: number of year groups, each with their own timetable slots.
+    :field classes_per_year_group: each class takes one lesson of every subject together.
+    :field pupils_per_class: number of pupils in each class.
+    :field subjects_per_class: number of lessons each class takes.
+    :field slots_per_lesson: number of slots each lesson requires per week.
+    :field classes_per_teacher: each teacher (and their classroom) teaches one subject to this many classes,
+    which may be in different year groups.
+    :field slots_per_day: number of (one hour) timetable slots each year group has per day.
+    :field days_per_week: number of days with timetable slots.
+    :field double_period_share: the proportion of lessons that require a double period.
+    :field stagger_minutes: how far the slots of each year group are shifted from the previous year group's.
+    :field break_density: the proportion of (year group, day) pairs with a break mid-way through the day.
+    """
+
+    n_year_groups: int
+    classes_per_year_group: int
+    pupils_per_class: int
+    subjects_per_class: int
+    slots_per_lesson: int
+    classes_per_teacher: int = 1
+    slots_per_day: int = 6
+    days_per_week: int = 5
+    double_period_share: float = 0.0
+    stagger_minutes: int = 0
+    break_density: float = 0.0
+
+    def __post_init__(self) -> None:
+        """
+        Ensure the lessons could fit into the week, for pupils and teachers.
+        """
+        slots_per_week = self.slots_per_day * self.days_per_week
+        if self.subjects_per_class * self.slots_per_lesson > slots_per_week:
+            raise ValueError("Each class has more lessons than slots in the week.")
+        if self.classes_per_teacher * self.slots_per_lesson > slots_per_week:
+            raise ValueError("Each teacher has more lessons than slots in the week.")
+        if not 1 <= self.days_per_week <= len(constants.Day):
+            raise ValueError(f"Schools have between 1 and {len(constants.Day)} days.")
+
+
+SCALES = {
+    "tiny": SchoolScale(
+        n_year_groups=1,
+        classes_per_year_group=1,
+        pupils_per_class=2,
+        subjects_per_class=2,
+        slots_per_lesson=2,
+        slots_per_day=3,
+        days_per_week=2,
+    ),
+    "small": SchoolScale(
+        n_year_groups=2,
+        classes_per_year_group=2,
+        pupils_per_class=5,
+        subjects_per_class=4,
+        slots_per_lesson=3,
+        classes_per_teacher=2,
+        double_period_share=0.25,
+    ),
+    "staggered": SchoolScale(
+        n_year_groups=3,
+        classes_per_year_group=2,
+        pupils_per_class=5,
+        subjects_per_class=4,
+        slots_per_lesson=3,
+        classes_per_teacher=2,
+        double_period_share=0.25,
+        stagger_minutes=60,
+        break_density=0.4,
+    ),
+    "medium": SchoolScale(
+        n_year_groups=4,
+        classes_per_year_group=3,
+        pupils_per_class=10,
+        subjects_per_class=6,
+        slots_per_lesson=4,
+        classes_per_teacher=3,
+        double_period_share=0.5,
+    ),
+}
+
+
+def create_synthetic_school(scale: SchoolScale, seed: int = 0) -> models.School:
+    """
+    Create a school with all the data needed to solve its timetabling problem.
+
+    :param scale: the size and shape of the school.
+    :param seed: used when randomly placing breaks, so that the same school can be generated again.
+    """
+    rand = random.Random(seed)
+    school = data_factories.School(school_name="Synthetic school")
+
+    teachers: dict[tuple[int, int], models.Teacher] = {}
+    classrooms: dict[tuple[int, int], models.Classroom] = {}
+    n_classes = 0
+
+    for yg_index in range(scale.n_year_groups):
+        year_group = data_factories.YearGroup(school=school)
+        yg_teachers = set()
+        break_days = _create_slots_for_year_group(
+            scale=scale,
+            school=school,
+            year_group=year_group,
+            yg_index=yg_index,
+            rand=rand,
+        )
+
+        for _ in range(scale.classes_per_year_group):
+            pupils = [
+                data_factories.Pupil(school=school, year_group=year_group)
+                for _ in range(scale.pupils_per_class)
+            ]
+            for subject in range(scale.subjects_per_class):
+                teacher_key = (subject, n_classes // scale.classes_per_teacher)
+                if teacher_key not in teachers:
+                    teachers[teacher_key] = data_factories.Teacher(school=school)
+                    classrooms[teacher_key] = data_factories.Classroom(school=school)
+                yg_teachers.add(teachers[teacher_key])
+
+                requires_double = rand.random() < scale.double_period_share
+                data_factories.Lesson(
+                    school=school,
+                    subject_name=f"subject-{subject}",
+                    teacher=teachers[teacher_key],
+                    classroom=classrooms[teacher_key],
+                    total_required_slots=scale.slots_per_lesson,
+                    total_required_double_periods=int(
+                        requires_double and scale.slots_per_lesson >= 2
+                    ),
+                    pupils=pupils,
+                )
+            n_classes += 1
+
+        for day, starts_at in break_days:
+            data_factories.Break(
+                school=school,
+                day_of_week=day,
+                starts_at=starts_at,
+                ends_at=_add_minutes(starts_at, 30),
+                teachers=tuple(yg_teachers),
+                relevant_year_groups=(year_group,),
+            )
+
+    return school
+
+
+def _create_slots_for_year_group(
+    scale: SchoolScale,
+    school: models.School,
+    year_group: models.YearGroup,
+    yg_index: int,
+    rand: random.Random,
+) -> list[tuple[constants.Day, dt.time]]:
+    """
+    Create the year group's slots, leaving a gap for a break on some days.
+
+    :return: the day and start time of each break that should be created.
+    """
+    break_days = []
+    first_slot_starts_at = _add_minutes(
+        dt.time(hour=9), yg_index * scale.stagger_minutes
+    )
+    break_after_slot = scale.slots_per_day // 2
+
+    for day in list(constants.Day)[: scale.days_per_week]:
+        has_break = rand.random() < scale.break_density
+        starts_at = first_slot_starts_at
+        for slot_index in range(scale.slots_per_day):
+            if has_break and slot_index == break_after_slot:
+                break_days.append((day, starts_at))
+                starts_at = _add_minutes(starts_at, 30)
+            data_factories.TimetableSlot(
+                school=school,
+                day_of_week=day,
+                starts_at=starts_at,
+                ends_at=_add_minutes(starts_at, 60),
+                relevant_year_groups=(year_group,),
+            )
+            starts_at = _add_minutes(starts_at, 60)
+
+    return break_days
+
+
+def _add_minutes(time: dt.time, minutes: int) -> dt.time:
+    """
+    Get the time some number of minutes later on the same day.
+    """
+    return (
+        dt.datetime.combine(dt.date.min, time) + dt.timedelta(minutes=minutes)
+    ).time()
@@ -0,0 +1,21 @@
+"""
+Fixtures shared by the whole test suite.
+"""
+
+# Standard library imports
+from collections.abc import Iterator
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    """
+    Clear the cache between tests, since school access keys (and data versions) are reused between tests.
+    """
+    yield
+    cache.clear()
@@ -1,3 +1,6 @@
+# Standard library imports
+import io
+
 # Third party imports
 import pytest
 
@@ -26,13 +29,22 @@ class TestCreateTimetablesCommand:
             pupils=(pupil,),
         )
 
+        output = io.StringIO()
         call_command(
-            "create_timetables", f"--school-access-key={school.school_access_key}"
+            "create_timetables",
+            f"--school-access-key={school.school_access_key}",
+            stdout=output,
         )
 
         # Ensure the timetabling problem has actually been solved
         assert lesson.solver_defined_time_slots.get() == slot
 
+        # Ensure the size of each family of constraints is shown
+        lines = output.getvalue().splitlines()
+        assert lines[0].startswith("Constraint family")
+        assert lines[1].split()[:2] == ["fulfillment", "1"]
+        assert any(line.startswith("no split lessons in a day") for line in lines)
+
     def test_raises_for_non_integer_school_access_key(self):
         with pytest.raises(base_command.CommandError):
             call_command("create_dummy_data", "--school-access-key=access-key")
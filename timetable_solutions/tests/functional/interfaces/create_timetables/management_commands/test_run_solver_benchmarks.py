@@ -0,0 +1,39 @@
+# Standard library imports
+import io
+import json
+import pathlib
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.core.management import call_command
+
+# Local application imports
+from data import models
+
+
+@pytest.mark.django_db
+class TestRunSolverBenchmarksCommand:
+    def test_writes_results_without_keeping_data(self, tmp_path: pathlib.Path):
+        output = tmp_path / "results.json"
+
+        call_command(
+            "run_solver_benchmarks",
+            "--scale=tiny",
+            "--repeats=2",
+            f"--output={output}",
+            stdout=io.StringIO(),
+        )
+
+        results = json.loads(output.read_text())["results"]
+        assert [result["seed"] for result in results] == [0, 1]
+        for result in results:
+            assert result["scale_name"] == "tiny"
+            assert result["solver_status"] == "Optimal"
+            assert result["error_messages"] == []
+            assert result["number_of_variables"] > 0
+            assert "solve" in [phase["name"] for phase in result["phases"]]
+
+        # The synthetic schools are rolled back
+        assert not models.School.objects.exists()
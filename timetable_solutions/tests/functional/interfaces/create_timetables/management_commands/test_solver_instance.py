@@ -0,0 +1,113 @@
+# Standard library imports
+import io
+import json
+import pathlib
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.core.management import base as base_command
+from django.core.management import call_command
+
+# Local application imports
+from data import constants, models
+from tests import data_factories
+
+
+def _create_school_with_solvable_problem() -> models.School:
+    """Create the minimum required data to have something to solve."""
+    school = data_factories.School()
+    yg = data_factories.YearGroup(school=school)
+    slot = data_factories.TimetableSlot(school=school, relevant_year_groups=(yg,))
+    data_factories.TimetableSlot.get_next_consecutive_slot(slot)
+    pupil = data_factories.Pupil(school=school, year_group=yg, firstname="Secret")
+    teacher = data_factories.Teacher(school=school, surname="Secret")
+    data_factories.Break(
+        school=school,
+        day_of_week=constants.Day.TUESDAY,
+        teachers=(teacher,),
+        relevant_year_groups=(yg,),
+    )
+    data_factories.Lesson(
+        school=school,
+        lesson_id="secret-lesson",
+        subject_name="Secret",
+        teacher=teacher,
+        total_required_slots=2,
+        total_required_double_periods=1,
+        pupils=(pupil,),
+    )
+    return school
+
+
+@pytest.mark.django_db
+class TestExportSolverInstanceCommand:
+    def test_writes_anonymised_snapshot_and_mps_file(self, tmp_path: pathlib.Path):
+        school = _create_school_with_solvable_problem()
+
+        call_command(
+            "export_solver_instance",
+            f"--school-access-key={school.school_access_key}",
+            f"--output-directory={tmp_path}",
+            stdout=io.StringIO(),
+        )
+
+        snapshot_path = tmp_path / f"school_{school.school_access_key}_snapshot.json"
+        mps_path = tmp_path / f"school_{school.school_access_key}.mps"
+        assert "Secret" not in snapshot_path.read_text()
+        assert "secret" not in mps_path.read_text().lower()
+
+        snapshot = json.loads(snapshot_path.read_text())
+        assert len(snapshot["pupils"]) == 1
+        assert len(snapshot["timetable_slots"]) == 2
+        assert len(snapshot["breaks"]) == 1
+        assert snapshot["lessons"][0]["total_required_double_periods"] == 1
+
+    def test_raises_for_unknown_school(self, tmp_path: pathlib.Path):
+        with pytest.raises(base_command.CommandError):
+            call_command(
+                "export_solver_instance",
+                "--school-access-key=123456",
+                f"--output-directory={tmp_path}",
+            )
+
+
+@pytest.mark.django_db
+class TestLoadSolverInstanceCommand:
+    def _export_snapshot(self, school: models.School, directory: pathlib.Path) -> str:
+        call_command(
+            "export_solver_instance",
+            f"--school-access-key={school.school_access_key}",
+            f"--output-directory={directory}",
+            stdout=io.StringIO(),
+        )
+        return str(directory / f"school_{school.school_access_key}_snapshot.json")
+
+    def test_loads_snapshot_into_new_school(self, tmp_path: pathlib.Path):
+        school = _create_school_with_solvable_problem()
+        snapshot_path = self._export_snapshot(school=school, directory=tmp_path)
+
+        call_command("load_solver_instance", snapshot_path, stdout=io.StringIO())
+
+        new_school = models.School.objects.exclude(pk=school.pk).get()
+        assert new_school.pupil_set.count() == 1
+        assert new_school.timetableslot_set.count() == 2
+        lesson = new_school.lesson_set.get()
+        assert lesson.pupils.count() == 1
+        assert lesson.teacher.breaks.count() == 1
+
+    def test_solves_snapshot_without_keeping_data(self, tmp_path: pathlib.Path):
+        school = _create_school_with_solvable_problem()
+        snapshot_path = self._export_snapshot(school=school, directory=tmp_path)
+        stdout = io.StringIO()
+
+        call_command("load_solver_instance", snapshot_path, "--solve", stdout=stdout)
+
+        assert "Status: Optimal" in stdout.getvalue()
+        assert models.School.objects.get() == school
+        assert not models.SolverRun.objects.exists()
+
+    def test_raises_for_missing_snapshot(self, tmp_path: pathlib.Path):
+        with pytest.raises(base_command.CommandError):
+            call_command("load_solver_instance", str(tmp_path / "missing.json"))
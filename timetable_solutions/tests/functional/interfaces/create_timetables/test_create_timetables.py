@@ -9,6 +9,7 @@ import datetime as dt
 import pytest
 
 # Local application imports
+from data import models
 from interfaces.constants import UrlName
 from tests import data_factories
 from tests.functional.client import TestClient
@@ -58,6 +59,119 @@ class TestCreateTimetables(TestClient):
         # Ensure the timetabling problem has actually been solved
         assert lesson.solver_defined_time_slots.get() == slot
 
+    def test_run_solver_for_multiple_candidates_then_promote_one(self):
+        school = self.create_school_and_authorise_client()
+
+        # Create a lesson that could take place in either of two slots
+        yg = data_factories.YearGroup(school=school)
+        slots = [
+            data_factories.TimetableSlot(school=school, relevant_year_groups=(yg,))
+            for _ in range(0, 2)
+        ]
+        pupil = data_factories.Pupil(school=school, year_group=yg)
+        data_factories.Break(school=school)
+        lesson = data_factories.Lesson(
+            school=school,
+            total_required_slots=1,
+            total_required_double_periods=0,
+            pupils=(pupil,),
+        )
+
+        # Ask for two alternative timetables
+        url = UrlName.CREATE_TIMETABLES.url()
+        page = self.client.get(url)
+        form = page.forms["create-timetables"]
+        form["optimal_free_period_time_of_day"] = "MORNING"
+        form["number_of_candidate_solutions"] = 2
+
+        response = form.submit()
+
+        # Check we are redirected to choose between the candidates
+        assert response.status_code == 302
+        assert response.location == UrlName.SOLUTION_CANDIDATES.url()
+
+        candidates_page = response.follow()
+        assert candidates_page.status_code == 200
+
+        # Promote the candidate not currently set as the solution
+        candidate = models.SolutionCandidate.objects.get(candidate_number=2)
+        candidate_slot = candidate.assignments.get().slot
+        assert lesson.solver_defined_time_slots.get() != candidate_slot
+        assert candidate_slot in slots
+
+        promote_response = candidates_page.forms["promote-candidate-2"].submit()
+
+        assert promote_response.status_code == 302
+        assert lesson.solver_defined_time_slots.get() == candidate_slot
+
+    def test_solver_run_history_lists_schools_runs(self):
+        school = self.create_school_and_authorise_client()
+        models.SolverRun.create_new(
+            school_id=school.school_access_key,
+            phases=[{"name": "solve", "wall_time_seconds": 1.5, "peak_rss_kb": 100}],
+            number_of_variables=12,
+            number_of_constraints=34,
+            number_of_nonzeros=56,
+            solver_status="Optimal",
+        )
+        # Make a run for some other school
+        models.SolverRun.create_new(
+            school_id=data_factories.School().school_access_key,
+            phases=[],
+            number_of_variables=0,
+            number_of_constraints=0,
+            number_of_nonzeros=0,
+            solver_status="Infeasible",
+        )
+
+        page = self.client.get(UrlName.SOLVER_RUN_HISTORY.url())
+
+        assert page.status_code == 200
+        table = page.html.find("table", id="solver-run-history")
+        rows = table.find("tbody").find_all("tr")
+        assert len(rows) == 1
+        assert "Optimal" in rows[0].text
+        assert "Saved" in rows[0].text
+        assert "solve: 1.500" in rows[0].text
+
+    @pytest.mark.parametrize("debug", [True, False])
+    def test_formulation_report_shown_in_debug_mode(self, settings, debug: bool):
+        settings.DEBUG = debug
+        school = self.create_school_and_authorise_client()
+        models.SolverRun.create_new(
+            school_id=school.school_access_key,
+            phases=[],
+            number_of_variables=12,
+            number_of_constraints=34,
+            number_of_nonzeros=56,
+            constraint_families=[
+                {
+                    "name": "pupil",
+                    "number_of_variables": 12,
+                    "number_of_constraints": 34,
+                    "number_of_nonzeros": 56,
+                    "wall_time_seconds": 0.25,
+                }
+            ],
+            solver_status="Optimal",
+        )
+
+        page = self.client.get(UrlName.CREATE_TIMETABLES.url())
+
+        assert page.status_code == 200
+        table = page.html.find("table", id="formulation-report")
+        if debug:
+            rows = table.find("tbody").find_all("tr")
+            assert [cell.text for cell in rows[0].find_all("td")] == [
+                "pupil",
+                "12",
+                "34",
+                "56",
+                "0.250",
+            ]
+        else:
+            assert table is None
+
     def test_school_with_insufficient_data_cant_access_create_timetables_form(self):
         # Create a school with no data
         self.create_school_and_authorise_client()
@@ -2,11 +2,19 @@
 
 # Standard library imports
 import datetime as dt
+from unittest import mock
+
+# Django imports
+from django import urls
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 # Local application imports
 from data import models
 from data.constants import Day
 from interfaces import constants as interfaces_constants
+from interfaces.view_timetables import views
 from tests import data_factories
 from tests.functional.client import TestClient
 
@@ -85,3 +93,91 @@ class TestPupilTimetable(TestClient):
             component for component in all_components if component.is_free_period
         ]
         assert len(free_periods) == 5
+
+    def test_print_all_pupil_timetables_page_contains_each_pupils_timetable(self):
+        pupil = self.get_pupil_with_timetable()
+        other_pupil = data_factories.Pupil(school=pupil.school)
+        self.authorise_client_for_school(pupil.school)
+
+        response = self.client.get(urls.reverse("print-all-pupils"))
+
+        assert response.status_code == 200
+        assert f"Timetable for: {pupil.firstname}" in response.text
+        assert f"Timetable for: {other_pupil.firstname}" in response.text
+
+    def test_print_all_pupil_timetables_page_streams_timetables_in_batches(self):
+        pupil = self.get_pupil_with_timetable()
+        other_pupils = data_factories.Pupil.create_batch(size=2, school=pupil.school)
+        self.authorise_client_for_school(pupil.school)
+
+        with mock.patch.object(views, "_PRINT_BATCH_SIZE", 2):
+            response = self.client.get(urls.reverse("print-all-pupils"))
+
+        assert response.status_code == 200
+        assert response.text.startswith("<!-- Header of the page")
+        assert response.text.count("Timetable for: ") == 3
+        for printed_pupil in [pupil, *other_pupils]:
+            assert f"- {printed_pupil.surname}" in response.text
+
+    def test_pupil_timetable_page_queries_do_not_depend_on_number_of_lessons(self):
+        pupil = self.get_pupil_with_timetable()
+        self.authorise_client_for_school(pupil.school)
+        url = interfaces_constants.UrlName.PUPIL_TIMETABLE.url(pupil_id=pupil.pupil_id)
+        # Log in, so that later requests only query for the timetable
+        self.client.get(url)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        n_queries = len(queries)
+
+        # Give the pupil some more lessons, each with its own teacher and classroom
+        slot = data_factories.TimetableSlot(
+            school=pupil.school, day_of_week=Day.SATURDAY
+        )
+        for _ in range(3):
+            data_factories.Lesson(
+                school=pupil.school, pupils=(pupil,), user_defined_time_slots=(slot,)
+            )
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+
+        assert len(queries) == n_queries
+
+    def test_pupil_timetable_page_is_cached_until_school_data_changes(
+        self, django_capture_on_commit_callbacks
+    ):
+        pupil = self.get_pupil_with_timetable()
+        self.authorise_client_for_school(pupil.school)
+        url = interfaces_constants.UrlName.PUPIL_TIMETABLE.url(pupil_id=pupil.pupil_id)
+
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                self.client.get(url)
+        n_uncached_queries = len(queries)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        # The timetable isn't remade from the school's lessons / breaks
+        assert len(queries) < n_uncached_queries
+        timetable = response.context["timetable"]
+        assert sum(len(components) for components in timetable.values()) == 40
+
+        # Give the pupil a lesson on a new day, which should now appear
+        slot = data_factories.TimetableSlot(
+            school=pupil.school, day_of_week=Day.SATURDAY
+        )
+        lesson = data_factories.Lesson(
+            school=pupil.school, pupils=(pupil,), user_defined_time_slots=(slot,)
+        )
+
+        response = self.client.get(url)
+
+        timetable = response.context["timetable"]
+        assert lesson in [
+            component.model_instance for component in timetable[Day.SATURDAY]
+        ]
+        assert lesson.lesson_id in response.text
@@ -0,0 +1,170 @@
+"""
+Integration tests for formulating the timetabling problem as a SparseModel, which should match the PuLP formulation.
+"""
+
+# Standard library imports
+from collections import Counter
+
+# Third party imports
+import numpy as np
+import pulp as lp
+import pytest
+
+# Local application imports
+from data import models
+from domain import solver as slvr
+from domain.solver.linear_programming.sparse_model import SparseModel
+from tests import data_factories, domain_factories
+from tests.benchmarks import synthetic_school
+
+# Row: (sense, rhs, ((variable name, coefficient), ...))
+Row = tuple[int, float, tuple[tuple[str, float], ...]]
+
+
+def get_solver(
+    school: models.School, sparse_model: bool, **spec_kwargs: bool
+) -> slvr.TimetableSolver:
+    """Formulate a school's problem, with the same random objective coefficients each time."""
+    np.random.seed(0)
+    inputs = slvr.TimetableSolverInputs(
+        school_id=school.school_access_key,
+        solution_specification=domain_factories.SolutionSpecification(
+            sparse_model=sparse_model, **spec_kwargs
+        ),
+    )
+    return slvr.TimetableSolver(input_data=inputs)
+
+
+def get_pulp_rows(problem: lp.LpProblem) -> Counter[Row]:
+    """Get the rows of a PuLP problem, leaving out any without variables."""
+    return Counter(
+        (
+            constraint.sense,
+            -constraint.constant,
+            tuple(
+                sorted(
+                    (variable.name, coefficient)
+                    for variable, coefficient in constraint.items()
+                )
+            ),
+        )
+        for constraint in problem.constraints.values()
+        if len(constraint) > 0
+    )
+
+
+def get_sparse_rows(model: SparseModel) -> Counter[Row]:
+    """Get the rows of a sparse model."""
+    entries: list[list[tuple[str, float]]] = [[] for _ in range(model.n_constraints)]
+    for row, column, coefficient in zip(*model.to_coo()):
+        entries[row].append((model.variables[column].name, coefficient))
+    return Counter(
+        (int(sense), float(rhs), tuple(sorted(row_entries)))
+        for sense, rhs, row_entries in zip(model.senses, model.rhs, entries)
+    )
+
+
+@pytest.fixture
+def school() -> models.School:
+    """
+    A school with overlapping year groups, breaks, double periods, and a user defined slot.
+    """
+    school = synthetic_school.create_synthetic_school(
+        scale=synthetic_school.SchoolScale(
+            n_year_groups=2,
+            classes_per_year_group=1,
+            pupils_per_class=2,
+            subjects_per_class=3,
+            slots_per_lesson=2,
+            classes_per_teacher=2,
+            slots_per_day=3,
+            days_per_week=2,
+            double_period_share=0.5,
+            stagger_minutes=30,
+            break_density=0.5,
+        ),
+    )
+    lesson = models.Lesson.objects.filter(school=school).first()
+    lesson.user_defined_time_slots.add(lesson.get_associated_timeslots().first())
+    return school
+
+
+@pytest.mark.django_db
+class TestTimetableSolverSparseFormulation:
+    @pytest.mark.parametrize("allow_structure", [True, False])
+    @pytest.mark.parametrize("allow_partial_timetable", [True, False])
+    def test_rows_match_pulp_problem(
+        self,
+        school: models.School,
+        allow_structure: bool,
+        allow_partial_timetable: bool,
+    ):
+        spec_kwargs = {
+            "allow_split_lessons_within_each_day": allow_structure,
+            "allow_triple_periods_and_above": allow_structure,
+            "allow_partial_timetable": allow_partial_timetable,
+        }
+        pulp_solver = get_solver(school=school, sparse_model=False, **spec_kwargs)
+        sparse_solver = get_solver(school=school, sparse_model=True, **spec_kwargs)
+
+        sparse_model = sparse_solver._sparse_formulation.model
+        assert get_sparse_rows(sparse_model) == get_pulp_rows(pulp_solver.problem)
+        assert sparse_solver.problem.numConstraints() == 0
+        # The objective coefficients match, including the (random) free period coefficients
+        assert {
+            variable.name: coefficient
+            for variable, coefficient in zip(
+                sparse_model.variables, sparse_model.objective
+            )
+            if coefficient != 0
+        } == {
+            variable.name: coefficient
+            for variable, coefficient in pulp_solver.problem.objective.items()
+            if coefficient != 0
+        }
+
+    def test_solution_matches_pulp_problem(self, school: models.School):
+        # The user defined slot can leave no full timetable, so the elastic problem is solved
+        pulp_solver = get_solver(
+            school=school, sparse_model=False, allow_partial_timetable=True
+        )
+        sparse_solver = get_solver(
+            school=school, sparse_model=True, allow_partial_timetable=True
+        )
+
+        pulp_solver.solve()
+        sparse_solver.solve()
+
+        assert sparse_solver.status == pulp_solver.status == "Optimal"
+        assert sparse_solver.objective_value == pytest.approx(
+            pulp_solver.objective_value
+        )
+        assert len(sparse_solver.get_solved_assignment()) == len(
+            pulp_solver.get_solved_assignment()
+        )
+
+    def test_produce_timetable_solutions_with_sparse_model(self):
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=2, total_required_double_periods=1
+        )
+        slot = data_factories.TimetableSlot(
+            school=lesson.school,
+            relevant_year_groups=(lesson.pupils.first().year_group,),
+        )
+        data_factories.TimetableSlot.get_next_consecutive_slot(slot)
+
+        error_messages = slvr.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(
+                sparse_model=True, number_of_candidate_solutions=2
+            ),
+        )
+
+        assert error_messages == []
+        assert lesson.solver_defined_time_slots.count() == 2
+        solver_run = models.SolverRun.objects.get(school=lesson.school)
+        assert solver_run.number_of_constraints > 0
+        # The only solution has been excluded, so there is no second candidate
+        assert (
+            models.SolutionCandidate.objects.filter(school=lesson.school).count() == 1
+        )
@@ -8,8 +8,13 @@ import datetime as dt
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 # Local application imports
 from data import constants
+from domain.solver.filters import clashes
 from domain.solver.queries import classroom as classroom_solver_queries
 from tests import data_factories
 
@@ -81,3 +86,34 @@ class TestCheckIfClassroomBusyAtTime:
 
         # Check classroom successfully made busy
         assert not clash
+
+
+@pytest.mark.django_db
+class TestFindClassroomClashes:
+    def test_finds_times_clashing_with_lessons(self):
+        classroom = data_factories.Classroom()
+        busy_slot = data_factories.TimetableSlot(
+            school=classroom.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
+        data_factories.Lesson(
+            school=classroom.school,
+            classroom=classroom,
+            user_defined_time_slots=(busy_slot,),
+        )
+        clashing_time = clashes.TimeOfWeek.from_slot(busy_slot)
+        free_time = clashes.TimeOfWeek(
+            starts_at=dt.time(hour=10),
+            ends_at=dt.time(hour=11),
+            day_of_week=constants.Day.MONDAY,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            times = classroom_solver_queries.find_classroom_clashes(
+                classroom=classroom, times=[clashing_time, free_time]
+            )
+
+        assert times == [clashing_time]
+        assert len(queries) == 1
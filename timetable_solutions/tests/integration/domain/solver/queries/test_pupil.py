@@ -7,8 +7,13 @@ import datetime as dt
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 # Local application imports
 from data import constants
+from domain.solver.filters import clashes
 from domain.solver.queries import pupil as pupil_solver_queries
 from tests import data_factories
 
@@ -114,3 +119,67 @@ class TestCheckIfBusyAtTime:
 
         # Ensure expected break in the clashes
         assert not clash
+
+
+@pytest.mark.django_db
+class TestFindBusyPupils:
+    def test_finds_pupils_busy_with_lessons_or_breaks(self):
+        school = data_factories.School()
+        slot = data_factories.TimetableSlot(
+            school=school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
+        pupil_with_lesson = data_factories.Pupil(school=school)
+        data_factories.Lesson(
+            school=school, pupils=(pupil_with_lesson,), user_defined_time_slots=(slot,)
+        )
+        pupil_with_break = data_factories.Pupil(school=school)
+        data_factories.Break(
+            school=school,
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=11),
+            ends_at=dt.time(hour=12),
+            relevant_year_groups=(pupil_with_break.year_group,),
+        )
+        free_pupil = data_factories.Pupil(school=school)
+        times = [
+            clashes.TimeOfWeek.from_slot(slot),
+            clashes.TimeOfWeek(
+                starts_at=dt.time(hour=11, minute=30),
+                ends_at=dt.time(hour=12, minute=30),
+                day_of_week=constants.Day.TUESDAY,
+            ),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            busy_pupils = pupil_solver_queries.find_busy_pupils(
+                pupils=[free_pupil, pupil_with_break, pupil_with_lesson], times=times
+            )
+
+        assert busy_pupils == [pupil_with_break, pupil_with_lesson]
+        assert len(queries) == 2
+
+    def test_no_pupils_busy_at_a_free_time(self):
+        pupil = data_factories.Pupil()
+        slot = data_factories.TimetableSlot(
+            school=pupil.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
+        data_factories.Lesson(
+            school=pupil.school, pupils=(pupil,), user_defined_time_slots=(slot,)
+        )
+        time_of_week = clashes.TimeOfWeek(
+            starts_at=dt.time(hour=10),
+            ends_at=dt.time(hour=11),
+            day_of_week=constants.Day.MONDAY,
+        )
+
+        busy_pupils = pupil_solver_queries.find_busy_pupils(
+            pupils=[pupil], times=[time_of_week]
+        )
+
+        assert busy_pupils == []
@@ -8,8 +8,13 @@ import datetime as dt
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 # Local application imports
 from data import constants
+from domain.solver.filters import clashes
 from domain.solver.queries import teacher as teacher_solver_queries
 from tests import data_factories
 
@@ -113,3 +118,62 @@ class TestCheckIfTeacherBusyAtTime:
         )
 
         assert not clash
+
+
+@pytest.mark.django_db
+class TestFindTeacherClashes:
+    def test_finds_times_clashing_with_lessons_and_breaks(self):
+        teacher = data_factories.Teacher()
+        busy_slot = data_factories.TimetableSlot(
+            school=teacher.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
+        data_factories.Lesson(
+            school=teacher.school, teacher=teacher, user_defined_time_slots=(busy_slot,)
+        )
+        data_factories.Break(
+            school=teacher.school,
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=11),
+            ends_at=dt.time(hour=12),
+            teachers=(teacher,),
+        )
+        lesson_clash = clashes.TimeOfWeek(
+            starts_at=dt.time(hour=9, minute=30),
+            ends_at=dt.time(hour=10, minute=30),
+            day_of_week=constants.Day.MONDAY,
+        )
+        break_clash = clashes.TimeOfWeek(
+            starts_at=dt.time(hour=11),
+            ends_at=dt.time(hour=12),
+            day_of_week=constants.Day.TUESDAY,
+        )
+        free_time = clashes.TimeOfWeek(
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+            day_of_week=constants.Day.TUESDAY,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            times = teacher_solver_queries.find_teacher_clashes(
+                teacher=teacher, times=[lesson_clash, free_time, break_clash]
+            )
+
+        assert times == [lesson_clash, break_clash]
+        assert len(queries) == 2
+
+    def test_no_clashes_when_teacher_has_no_commitments(self):
+        teacher = data_factories.Teacher()
+        time_of_week = clashes.TimeOfWeek(
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+            day_of_week=constants.Day.MONDAY,
+        )
+
+        times = teacher_solver_queries.find_teacher_clashes(
+            teacher=teacher, times=[time_of_week]
+        )
+
+        assert times == []
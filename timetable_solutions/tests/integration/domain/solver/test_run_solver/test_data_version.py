@@ -0,0 +1,73 @@
+"""
+Tests for saving the solver's solution only when a school's data has not changed during the solve.
+"""
+
+# Standard library imports
+from unittest import mock
+
+# Third party imports
+import pytest
+
+# Local application imports
+from data import constants, models
+from domain import solver
+from domain.solver.linear_programming.solver import TimetableSolver
+from domain.solver.run_solver import DATA_CHANGED_ERROR_MESSAGE
+from tests import data_factories, domain_factories
+
+
+@pytest.mark.django_db
+class TestSolverDataVersion:
+    def test_solution_saved_when_data_unchanged(self):
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=1)
+        slot = data_factories.TimetableSlot(
+            school=lesson.school,
+            relevant_year_groups=(lesson.pupils.first().year_group,),
+        )
+        lesson.school.refresh_from_db()
+        data_version = lesson.school.data_version
+
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+        )
+
+        assert error_messages == []
+        assert list(lesson.solver_defined_time_slots.all()) == [slot]
+        # Saving the solution is itself a change to the school's data
+        lesson.school.refresh_from_db()
+        assert lesson.school.data_version == data_version + 1
+
+    def test_solution_not_saved_when_data_changes_during_solve(self):
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=1)
+        data_factories.TimetableSlot(
+            school=lesson.school,
+            relevant_year_groups=(lesson.pupils.first().year_group,),
+        )
+        existing_solution_slot = data_factories.TimetableSlot(school=lesson.school)
+        lesson.solver_defined_time_slots.add(existing_solution_slot)
+
+        solve = TimetableSolver.solve
+
+        def solve_while_data_changes(timetable_solver: TimetableSolver) -> None:
+            solve(timetable_solver)
+            data_factories.Teacher(school=lesson.school)
+
+        with mock.patch.object(
+            TimetableSolver,
+            "solve",
+            autospec=True,
+            side_effect=solve_while_data_changes,
+        ):
+            error_messages = solver.produce_timetable_solutions(
+                school_access_key=lesson.school.school_access_key,
+                solution_specification=domain_factories.SolutionSpecification(),
+            )
+
+        # The existing solution should be left as it was, but the run still recorded
+        assert error_messages == [DATA_CHANGED_ERROR_MESSAGE]
+        assert list(lesson.solver_defined_time_slots.all()) == [existing_solution_slot]
+        solver_run = models.SolverRun.objects.get()
+        assert solver_run.outcome == constants.SolverRunOutcome.DATA_CHANGED
+        assert solver_run.solver_status == "Optimal"
+        assert solver_run.number_of_variables == 1
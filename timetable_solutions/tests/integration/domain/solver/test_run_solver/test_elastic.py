@@ -0,0 +1,143 @@
+"""Tests for the solutions found when solving the elastic version of the timetabling problem."""
+
+# Third party imports
+import pytest
+
+# Local application imports
+from data.constants import Day
+from domain import solver
+from domain.solver.linear_programming.solver import TimetableSolver
+from domain.solver.solver_input_data import TimetableSolverInputs
+from domain.solver.solver_output_data import TimetableSolverOutcome
+from tests import data_factories, domain_factories
+
+
+@pytest.mark.django_db
+class TestSolverSolutionElastic:
+    """
+    Tests for solver solutions where no full timetable exists, so the best partial timetable is found.
+    """
+
+    def test_best_partial_timetable_found_when_too_few_slots(self):
+        # Make a lesson requiring more slots than exist
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=3, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        slots = {
+            data_factories.TimetableSlot(
+                relevant_year_groups=(yg,), school=lesson.school
+            )
+            for _ in range(0, 2)
+        }
+        spec = domain_factories.SolutionSpecification(allow_partial_timetable=True)
+
+        # Solve the timetabling problem
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=spec,
+        )
+
+        # Check the lesson is given all the slots that were possible, and the shortfall is reported
+        assert set(lesson.solver_defined_time_slots.all()) == slots
+        assert error_messages == [
+            f"Could not fulfill required slots of lesson: {lesson}. "
+            "1 slot(s) still need to be scheduled."
+        ]
+
+    def test_shortfall_for_clashing_lessons_is_minimised(self):
+        # Make two lessons sharing a pupil, each requiring one slot, with only one slot available
+        pupil = data_factories.Pupil()
+        slot = data_factories.TimetableSlot(
+            relevant_year_groups=(pupil.year_group,), school=pupil.school
+        )
+        lesson_1 = data_factories.Lesson(school=pupil.school, pupils=(pupil,))
+        lesson_2 = data_factories.Lesson(school=pupil.school, pupils=(pupil,))
+        spec = domain_factories.SolutionSpecification(allow_partial_timetable=True)
+        input_data = TimetableSolverInputs(
+            school_id=pupil.school.school_access_key, solution_specification=spec
+        )
+
+        # Solve the timetabling problem
+        timetable_solver = TimetableSolver(input_data=input_data)
+        timetable_solver.solve()
+        outcome = TimetableSolverOutcome(timetable_solver=timetable_solver)
+
+        # Check exactly one of the lessons got the slot
+        assert timetable_solver.is_optimal
+        assert (
+            lesson_1.solver_defined_time_slots.count()
+            + lesson_2.solver_defined_time_slots.count()
+            == 1
+        )
+        assert slot in {
+            *lesson_1.solver_defined_time_slots.all(),
+            *lesson_2.solver_defined_time_slots.all(),
+        }
+        assert sum(outcome.slot_shortfall.values()) == 1
+
+    def test_double_period_shortfall_reported_when_no_consecutive_slots(self):
+        # Make a lesson requiring a double period, with no consecutive slots
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=2, total_required_double_periods=1
+        )
+        yg = lesson.pupils.first().year_group
+        data_factories.TimetableSlot(
+            day_of_week=Day.MONDAY, school=lesson.school, relevant_year_groups=(yg,)
+        )
+        data_factories.TimetableSlot(
+            day_of_week=Day.TUESDAY, school=lesson.school, relevant_year_groups=(yg,)
+        )
+        spec = domain_factories.SolutionSpecification(allow_partial_timetable=True)
+        input_data = TimetableSolverInputs(
+            school_id=lesson.school.school_access_key, solution_specification=spec
+        )
+
+        # Solve the timetabling problem
+        timetable_solver = TimetableSolver(input_data=input_data)
+        timetable_solver.solve()
+        outcome = TimetableSolverOutcome(timetable_solver=timetable_solver)
+
+        # Check the slots are still fulfilled, but the missing double period is reported
+        assert lesson.solver_defined_time_slots.count() == 2
+        assert outcome.slot_shortfall == {}
+        assert outcome.double_period_shortfall == {lesson: 1}
+
+    @pytest.mark.parametrize("sparse_model", [True, False])
+    def test_excluding_a_partial_assignment_does_not_exclude_its_supersets(
+        self, sparse_model: bool
+    ):
+        # Make a lesson that can be fully timetabled, at both of two slots
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=2, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        for day in [Day.MONDAY, Day.TUESDAY]:
+            data_factories.TimetableSlot(
+                day_of_week=day, school=lesson.school, relevant_year_groups=(yg,)
+            )
+        spec = domain_factories.SolutionSpecification(
+            allow_partial_timetable=True, sparse_model=sparse_model
+        )
+        input_data = TimetableSolverInputs(
+            school_id=lesson.school.school_access_key, solution_specification=spec
+        )
+        timetable_solver = TimetableSolver(input_data=input_data)
+        timetable_solver.solve()
+        full_assignment = timetable_solver.get_solved_assignment()
+        assert len(full_assignment) == 2
+
+        # Exclude the partial timetable using just one of the slots, and re-solve
+        timetable_solver.exclude_assignment(full_assignment[:1], name="partial")
+        timetable_solver.solve()
+
+        # The full timetable should still be found
+        assert timetable_solver.is_optimal
+        assert set(timetable_solver.get_solved_assignment()) == set(full_assignment)
+
+        # Until it is excluded itself
+        timetable_solver.exclude_assignment(full_assignment, name="full")
+        timetable_solver.solve()
+
+        assert timetable_solver.is_optimal
+        assert timetable_solver.get_solved_assignment() == full_assignment[1:]
@@ -191,3 +191,39 @@ class TestSolverSolutionDoublePeriodFulfillmentConstrainDriven:
 
         # Check the lesson now has the solution set
         assert lesson.solver_defined_time_slots.get() == tue_1
+
+
+@pytest.mark.django_db
+class TestSolverOutcomeExtraction:
+    def test_number_of_queries_does_not_grow_with_number_of_lessons(
+        self, django_assert_max_num_queries
+    ):
+        school = data_factories.School()
+        yg = data_factories.YearGroup(school=school)
+        slots = [
+            data_factories.TimetableSlot(school=school, relevant_year_groups=(yg,))
+            for _ in range(0, 4)
+        ]
+        lessons = [
+            data_factories.Lesson(
+                school=school,
+                pupils=(data_factories.Pupil(school=school, year_group=yg),),
+                total_required_slots=2,
+                user_defined_time_slots=(slots[n],),
+            )
+            for n in range(0, 3)
+        ]
+        input_data = solver.TimetableSolverInputs(
+            school_id=school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+        )
+        timetable_solver = solver.TimetableSolver(input_data=input_data)
+        timetable_solver.solve()
+
+        # Lessons, user defined slots, slot ids, existing user defined pairs, insert, data version
+        with django_assert_max_num_queries(6):
+            outcome = solver.TimetableSolverOutcome(timetable_solver=timetable_solver)
+
+        assert outcome.error_messages == []
+        for lesson in lessons:
+            assert lesson.solver_defined_time_slots.count() == 1
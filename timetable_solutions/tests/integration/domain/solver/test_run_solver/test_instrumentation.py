@@ -0,0 +1,121 @@
+"""Tests for the record of each run of the solver."""
+
+# Third party imports
+import pytest
+
+# Local application imports
+from data import constants, models
+from domain import solver
+from tests import data_factories, domain_factories
+
+
+@pytest.mark.django_db
+class TestSolverRunRecorded:
+    def test_solver_run_recorded_with_phases_and_problem_size(self):
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=1, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        data_factories.TimetableSlot(relevant_year_groups=(yg,), school=lesson.school)
+
+        solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+        )
+
+        solver_run = models.SolverRun.objects.get()
+        assert solver_run.school == lesson.school
+        assert solver_run.solver_status == "Optimal"
+        assert solver_run.outcome == constants.SolverRunOutcome.SAVED
+        assert solver_run.number_of_variables == 1
+        assert solver_run.number_of_constraints > 0
+        assert solver_run.number_of_nonzeros > 0
+
+        phase_names = [phase["name"] for phase in solver_run.phases]
+        assert phase_names[:4] == [
+            "input data",
+            "feasibility",
+            "variables",
+            "constraints: fulfillment",
+        ]
+        assert phase_names[-3:] == ["objective", "solve", "outcome"]
+        assert solver_run.total_wall_time_seconds == pytest.approx(
+            sum(phase["wall_time_seconds"] for phase in solver_run.phases)
+        )
+        assert solver_run.max_phase_rss_rise_kb == max(
+            max(phase["peak_rss_kb"], phase["child_peak_rss_kb"])
+            for phase in solver_run.phases
+        )
+
+    def test_solver_run_recorded_when_inputs_are_invalid(self):
+        # Make a lesson that already has a solution, which won't be cleared
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=1)
+        slot = data_factories.TimetableSlot(
+            relevant_year_groups=(lesson.pupils.first().year_group,),
+            school=lesson.school,
+        )
+        lesson.solver_defined_time_slots.add(slot)
+
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+            clear_existing=False,
+        )
+
+        assert error_messages
+        solver_run = models.SolverRun.objects.get()
+        assert solver_run.outcome == constants.SolverRunOutcome.INVALID_INPUTS
+        assert solver_run.solver_status == "Not Solved"
+        assert solver_run.number_of_variables == 0
+        assert [phase["name"] for phase in solver_run.phases] == ["input data"]
+
+    @pytest.mark.parametrize("sparse_model", [False, True])
+    def test_solver_run_recorded_with_size_of_each_constraint_family(
+        self, sparse_model: bool
+    ):
+        lesson = data_factories.Lesson.with_n_pupils(
+            n_pupils=2, total_required_slots=2, total_required_double_periods=1
+        )
+        slot = data_factories.TimetableSlot(
+            relevant_year_groups=(lesson.pupils.first().year_group,),
+            school=lesson.school,
+        )
+        data_factories.TimetableSlot.get_next_consecutive_slot(slot)
+
+        solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(
+                allow_split_lessons_within_each_day=False,
+                allow_triple_periods_and_above=False,
+                sparse_model=sparse_model,
+            ),
+        )
+
+        solver_run = models.SolverRun.objects.get()
+        families = {family["name"]: family for family in solver_run.constraint_families}
+        assert list(families) == [
+            "fulfillment",
+            "pupil",
+            "teacher",
+            "classroom",
+            "double period fulfillment",
+            "double period dependency",
+            "no split lessons in a day",
+            "no two doubles in a day",
+        ]
+        # Each pupil can only be at one slot at a time, which involves the lesson's two decision variables
+        assert families["pupil"]["number_of_constraints"] == 4
+        assert families["pupil"]["number_of_variables"] == 2
+        assert families["pupil"]["number_of_nonzeros"] == 4
+        assert sum(family["number_of_constraints"] for family in families.values()) == (
+            solver_run.number_of_constraints
+        )
+        assert sum(family["number_of_nonzeros"] for family in families.values()) == (
+            solver_run.number_of_nonzeros
+        )
+        phase_times = {
+            phase["name"]: phase["wall_time_seconds"] for phase in solver_run.phases
+        }
+        assert families["pupil"]["wall_time_seconds"] == (
+            phase_times["constraints: pupil"]
+        )
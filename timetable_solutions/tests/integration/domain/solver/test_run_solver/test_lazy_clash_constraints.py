@@ -0,0 +1,177 @@
+"""
+Tests for solving with the teacher and classroom clash constraints generated lazily.
+"""
+
+# Standard library imports
+import datetime as dt
+from unittest import mock
+
+# Third party imports
+import pulp as lp
+import pytest
+
+# Local application imports
+from data import models
+from data.constants import Day
+from domain import solver
+from tests import data_factories, domain_factories
+
+
+def get_solver(school: models.School, lazy: bool = True) -> solver.TimetableSolver:
+    """Get a solver for a school's timetabling problem."""
+    inputs = solver.TimetableSolverInputs(
+        school_id=school.school_access_key,
+        solution_specification=domain_factories.SolutionSpecification(
+            lazy_clash_constraints=lazy
+        ),
+    )
+    return solver.TimetableSolver(input_data=inputs)
+
+
+def create_lesson_for_new_year_group(
+    school: models.School,
+    starts_at_hours: list[float],
+    **lesson_kwargs,
+) -> models.Lesson:
+    """Create a one slot lesson for a new year group, which has slots on Monday at the given hours."""
+    year_group = data_factories.YearGroup(school=school)
+    for hour in starts_at_hours:
+        data_factories.TimetableSlot(
+            school=school,
+            relevant_year_groups=(year_group,),
+            day_of_week=Day.MONDAY,
+            starts_at=dt.time(hour=int(hour), minute=int(60 * (hour % 1))),
+        )
+    return data_factories.Lesson(
+        school=school,
+        pupils=(data_factories.Pupil(school=school, year_group=year_group),),
+        total_required_slots=1,
+        total_required_double_periods=0,
+        **lesson_kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestSolverLazyClashConstraints:
+    def test_teacher_clash_across_year_groups_is_avoided(self):
+        """
+        A teacher has one lesson in each of two year groups.
+        The second year group's only slot overlaps the first year group's 9:00 slot.
+        """
+        school = data_factories.School()
+        teacher = data_factories.Teacher(school=school)
+        lesson_a = create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9, 11], teacher=teacher
+        )
+        create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9.5], teacher=teacher
+        )
+        timetable_solver = get_solver(school=school)
+
+        timetable_solver.solve()
+
+        assert timetable_solver.is_optimal
+        slot = _get_solved_slot(timetable_solver=timetable_solver, lesson=lesson_a)
+        assert slot.starts_at == dt.time(hour=11)
+
+    def test_classroom_clash_across_year_groups_is_avoided(self):
+        """
+        A classroom hosts one lesson from each of two year groups.
+        The second year group's only slot overlaps the first year group's 9:00 slot.
+        """
+        school = data_factories.School()
+        classroom = data_factories.Classroom(school=school)
+        lesson_a = create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9, 11], classroom=classroom
+        )
+        create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9.5], classroom=classroom
+        )
+        timetable_solver = get_solver(school=school)
+
+        timetable_solver.solve()
+
+        assert timetable_solver.is_optimal
+        slot = _get_solved_slot(timetable_solver=timetable_solver, lesson=lesson_a)
+        assert slot.starts_at == dt.time(hour=11)
+
+    def test_unavoidable_teacher_clash_is_found_to_be_infeasible(self):
+        """
+        A teacher has one lesson in each of two year groups, which each have one slot, at overlapping times.
+        The first solve ignores the clash, so a clash constraint is added and the second solve fails.
+        """
+        school = data_factories.School()
+        teacher = data_factories.Teacher(school=school)
+        create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9], teacher=teacher
+        )
+        create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9.5], teacher=teacher
+        )
+        timetable_solver = get_solver(school=school)
+
+        timetable_solver.solve()
+
+        assert not timetable_solver.is_optimal
+        assert timetable_solver.n_lazy_clash_constraints == 1
+
+    def test_re_solves_use_the_passed_solver_warm_started(self):
+        school = data_factories.School()
+        teacher = data_factories.Teacher(school=school)
+        create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9], teacher=teacher
+        )
+        create_lesson_for_new_year_group(
+            school=school, starts_at_hours=[9.5], teacher=teacher
+        )
+        timetable_solver = get_solver(school=school)
+        pulp_solver = lp.PULP_CBC_CMD(msg=False, timeLimit=30, threads=1)
+
+        with mock.patch.object(
+            lp.PULP_CBC_CMD,
+            "actualSolve",
+            autospec=True,
+            side_effect=lp.PULP_CBC_CMD.actualSolve,
+        ) as actual_solve:
+            timetable_solver.solve(pulp_solver)
+
+        # The clash is only found after the first solve, so the problem is solved twice
+        first_solver, re_solver = (call.args[0] for call in actual_solve.call_args_list)
+        assert first_solver is pulp_solver
+        assert re_solver.timeLimit == 30
+        assert re_solver.optionsDict["threads"] == 1
+        assert re_solver.optionsDict["warmStart"]
+        # The passed solver isn't changed
+        assert not pulp_solver.optionsDict["warmStart"]
+
+    def test_lazy_problem_starts_with_fewer_constraints(self):
+        school = data_factories.School()
+        teacher = data_factories.Teacher(school=school)
+        classroom = data_factories.Classroom(school=school)
+        for _ in range(2):
+            create_lesson_for_new_year_group(
+                school=school,
+                starts_at_hours=[9, 10, 11],
+                teacher=teacher,
+                classroom=classroom,
+            )
+
+        eager_solver = get_solver(school=school, lazy=False)
+        lazy_solver = get_solver(school=school, lazy=True)
+
+        assert len(lazy_solver.problem.constraints) < len(
+            eager_solver.problem.constraints
+        )
+
+
+def _get_solved_slot(
+    timetable_solver: solver.TimetableSolver, lesson: models.Lesson
+) -> models.TimetableSlot:
+    """Get the single slot the solver has chosen for a lesson."""
+    slot_ids = [
+        key.slot_id
+        for key, variable in timetable_solver.variables.decision_variables.items()
+        if key.lesson_id == lesson.lesson_id and variable.varValue == 1
+    ]
+    assert len(slot_ids) == 1
+    return models.TimetableSlot.objects.get(school=lesson.school, slot_id=slot_ids[0])
@@ -0,0 +1,180 @@
+"""Tests for generating a pool of alternative solutions in a single run of the solver."""
+
+# Third party imports
+import pytest
+
+# Local application imports
+from data import models
+from domain import solver
+from domain.solver.linear_programming.solver import TimetableSolver
+from domain.solver.solution_pool import TimetableSolutionPool
+from domain.solver.solver_input_data import TimetableSolverInputs
+from tests import data_factories, domain_factories
+
+
+@pytest.mark.django_db
+class TestSolverSolutionPool:
+    @pytest.mark.parametrize(
+        "number_of_candidate_solutions,expected_pool_size", [(3, 3), (5, 3)]
+    )
+    def test_pool_contains_distinct_candidates(
+        self, number_of_candidate_solutions: int, expected_pool_size: int
+    ):
+        # Make a lesson that could go in any one of three slots
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=1, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        for _ in range(0, 3):
+            data_factories.TimetableSlot(
+                relevant_year_groups=(yg,), school=lesson.school
+            )
+        spec = domain_factories.SolutionSpecification(
+            number_of_candidate_solutions=number_of_candidate_solutions
+        )
+
+        # Solve the timetabling problem
+        solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=spec,
+        )
+
+        # Check a distinct candidate was stored for each possible slot
+        candidates = models.SolutionCandidate.objects.get_all_instances_for_school(
+            school_id=lesson.school.school_access_key
+        )
+        assert candidates.count() == expected_pool_size
+        candidate_slots = {candidate.assignments.get().slot for candidate in candidates}
+        assert len(candidate_slots) == expected_pool_size
+
+        # The first candidate is the solution set on the lesson
+        assert (
+            lesson.solver_defined_time_slots.get()
+            == candidates.get(candidate_number=1).assignments.get().slot
+        )
+
+    def test_no_candidates_stored_for_single_solution(self):
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=1, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        data_factories.TimetableSlot(relevant_year_groups=(yg,), school=lesson.school)
+
+        solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+        )
+
+        assert not models.SolutionCandidate.objects.exists()
+
+    def test_no_candidates_stored_for_partial_timetable(self):
+        # Make two lessons sharing a pupil, with only one slot, so either lesson could have the slot
+        pupil = data_factories.Pupil()
+        data_factories.TimetableSlot(
+            relevant_year_groups=(pupil.year_group,), school=pupil.school
+        )
+        lesson_1 = data_factories.Lesson(school=pupil.school, pupils=(pupil,))
+        lesson_2 = data_factories.Lesson(school=pupil.school, pupils=(pupil,))
+        spec = domain_factories.SolutionSpecification(
+            allow_partial_timetable=True, number_of_candidate_solutions=2
+        )
+
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=pupil.school.school_access_key,
+            solution_specification=spec,
+        )
+
+        # The partial timetable is saved, but not offered as a candidate
+        assert len(error_messages) == 1
+        assert (
+            lesson_1.solver_defined_time_slots.count()
+            + lesson_2.solver_defined_time_slots.count()
+            == 1
+        )
+        assert not models.SolutionCandidate.objects.exists()
+
+    def test_pool_is_empty_when_elastic_solution_has_shortfall(self):
+        # Make a lesson requiring more slots than exist
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=2, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        data_factories.TimetableSlot(relevant_year_groups=(yg,), school=lesson.school)
+        input_data = TimetableSolverInputs(
+            school_id=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(
+                allow_partial_timetable=True
+            ),
+        )
+        timetable_solver = TimetableSolver(input_data=input_data)
+        timetable_solver.solve()
+        assert timetable_solver.get_solved_slack() == 1
+
+        pool = TimetableSolutionPool(timetable_solver=timetable_solver, pool_size=3)
+        pool.find_solutions()
+
+        assert pool.assignments == []
+
+    def test_previous_candidates_replaced_when_not_clearing_existing_solution(self):
+        # Make a lesson that could go in any one of three slots
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=1, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        for _ in range(0, 3):
+            data_factories.TimetableSlot(
+                relevant_year_groups=(yg,), school=lesson.school
+            )
+        spec = domain_factories.SolutionSpecification(number_of_candidate_solutions=3)
+
+        # Solve it, and then reset the lesson's solution, leaving the candidates
+        solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=spec,
+        )
+        models.Lesson.delete_solver_solution_for_school(
+            school_id=lesson.school.school_access_key
+        )
+        previous_candidate_pks = set(
+            models.SolutionCandidate.objects.values_list("pk", flat=True)
+        )
+
+        # Solve again, without clearing any existing solution
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=spec,
+            clear_existing=False,
+        )
+
+        # The previous run's candidates should have been replaced with the new pool
+        assert error_messages == []
+        assert lesson.solver_defined_time_slots.count() == 1
+        candidates = models.SolutionCandidate.objects.get_all_instances_for_school(
+            school_id=lesson.school.school_access_key
+        )
+        assert candidates.count() == 3
+        assert not previous_candidate_pks & {candidate.pk for candidate in candidates}
+
+    def test_solved_assignment_tolerates_inexact_binary_values(self):
+        # Make a lesson that could go in either of two slots
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=1, total_required_double_periods=0
+        )
+        yg = lesson.pupils.first().year_group
+        for _ in range(0, 2):
+            data_factories.TimetableSlot(
+                relevant_year_groups=(yg,), school=lesson.school
+            )
+        input_data = TimetableSolverInputs(
+            school_id=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+        )
+        timetable_solver = TimetableSolver(input_data=input_data)
+
+        # Give the variables values as the solver might, just off 1 and 0
+        variables = timetable_solver.variables.decision_variables
+        assigned_key, unassigned_key = variables
+        variables[assigned_key].varValue = 0.9999999
+        variables[unassigned_key].varValue = 1e-07
+
+        assert timetable_solver.get_solved_assignment() == [assigned_key]
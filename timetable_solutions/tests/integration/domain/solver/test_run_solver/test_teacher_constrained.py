@@ -4,6 +4,9 @@ import datetime as dt
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+
 # Local application imports
 from data.constants import Day
 from domain import solver
@@ -167,6 +170,10 @@ class TestSolverSolutionTeacherConstraintDriven:
         assert lesson_1.solver_defined_time_slots.get() == lesson_1_forced_slot
         assert lesson_2.solver_defined_time_slots.get() == lesson_2_forced_slot
 
+    @pytest.mark.skipif(
+        connection.vendor == "postgresql",
+        reason="Year group slots and breaks can't clash in the db on Postgres.",
+    )
     @pytest.mark.parametrize("clash_slot_overlap_minutes", [0, 30])
     def test_teacher_cannot_take_lesson_if_has_a_break(
         self, clash_slot_overlap_minutes: int
@@ -0,0 +1,144 @@
+"""Tests for constructing all of a school's timetables at once."""
+
+# Standard library imports
+import datetime as dt
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Local application imports
+from data import constants as data_constants
+from domain import view_timetables
+from domain.view_timetables import school_timetables
+from tests import data_factories
+
+
+@pytest.mark.django_db
+class TestSchoolTimetables:
+    def test_pupil_and_teacher_timetables_match_individual_timetables(self):
+        school = data_factories.School()
+        year_group = data_factories.YearGroup(school=school)
+        pupil = data_factories.Pupil(school=school, year_group=year_group)
+        teacher = data_factories.Teacher(school=school)
+
+        slot_0 = data_factories.TimetableSlot(
+            school=school,
+            day_of_week=data_constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
+        slot_1 = data_factories.TimetableSlot.get_next_consecutive_slot(slot_0)
+        slot_2 = data_factories.TimetableSlot.get_next_consecutive_slot(slot_1)
+        lesson = data_factories.Lesson(
+            school=school,
+            pupils=(pupil,),
+            teacher=teacher,
+            total_required_slots=3,
+            user_defined_time_slots=(slot_0,),
+        )
+        lesson.solver_defined_time_slots.add(slot_0, slot_2)
+        data_factories.Lesson(
+            school=school,
+            pupils=(pupil,),
+            total_required_slots=1,
+            user_defined_time_slots=(slot_1,),
+        )
+        data_factories.Break(
+            school=school,
+            day_of_week=data_constants.Day.TUESDAY,
+            starts_at=dt.time(hour=12),
+            ends_at=dt.time(hour=13),
+            relevant_year_groups=(year_group,),
+            teachers=(teacher,),
+        )
+
+        timetables = school_timetables.SchoolTimetables(
+            school_id=school.school_access_key
+        )
+
+        assert timetables.get_pupil_timetable(
+            pupil
+        ) == view_timetables.get_pupil_timetable(pupil)
+        assert timetables.get_teacher_timetable(
+            teacher
+        ) == view_timetables.get_teacher_timetable(teacher)
+
+    def test_timetables_loaded_for_some_people_only_include_their_data(self):
+        school = data_factories.School()
+        slot = data_factories.TimetableSlot(school=school)
+        pupils = []
+        teachers = []
+        for _ in range(2):
+            year_group = data_factories.YearGroup(school=school)
+            pupil = data_factories.Pupil(school=school, year_group=year_group)
+            teacher = data_factories.Teacher(school=school)
+            data_factories.Lesson(
+                school=school,
+                pupils=(pupil,),
+                teacher=teacher,
+                user_defined_time_slots=(slot,),
+            )
+            data_factories.Break(
+                school=school,
+                relevant_year_groups=(year_group,),
+                teachers=(teacher,),
+            )
+            pupils.append(pupil)
+            teachers.append(teacher)
+
+        pupil_timetables = school_timetables.SchoolTimetables.for_pupils(
+            school_id=school.school_access_key, pupils=pupils[:1]
+        )
+        teacher_timetables = school_timetables.SchoolTimetables.for_teachers(
+            school_id=school.school_access_key, teachers=teachers[:1]
+        )
+
+        # The timetables of the passed people are complete
+        assert pupil_timetables.get_pupil_timetable(
+            pupils[0]
+        ) == view_timetables.get_pupil_timetable(pupils[0])
+        assert teacher_timetables.get_teacher_timetable(
+            teachers[0]
+        ) == view_timetables.get_teacher_timetable(teachers[0])
+        # But nothing else was loaded
+        assert not any(pupil_timetables.get_pupil_timetable(pupils[1]).values())
+        assert not any(teacher_timetables.get_teacher_timetable(teachers[1]).values())
+
+    def test_timetable_of_pupil_with_nothing_on_is_empty(self):
+        pupil = data_factories.Pupil()
+
+        timetables = school_timetables.SchoolTimetables(
+            school_id=pupil.school.school_access_key
+        )
+
+        assert not any(timetables.get_pupil_timetable(pupil).values())
+
+    @pytest.mark.parametrize("n_pupils", [1, 10])
+    def test_pupil_timetables_made_with_a_fixed_number_of_queries(self, n_pupils):
+        school = data_factories.School()
+        year_group = data_factories.YearGroup(school=school)
+        slot = data_factories.TimetableSlot(school=school)
+        data_factories.Break(school=school, relevant_year_groups=(year_group,))
+        pupils = [
+            data_factories.Pupil(school=school, year_group=year_group)
+            for _ in range(n_pupils)
+        ]
+        for pupil in pupils:
+            data_factories.Lesson(
+                school=school, pupils=(pupil,), user_defined_time_slots=(slot,)
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            timetables = school_timetables.SchoolTimetables(
+                school_id=school.school_access_key
+            )
+            for pupil in pupils:
+                timetables.get_pupil_timetable(pupil)
+
+        # The lessons (with both slot relations), pupil memberships and breaks
+        # (with year groups and teachers)
+        assert len(queries) == 7
@@ -0,0 +1,94 @@
+"""Tests for caching timetables against their school's data version."""
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import transaction
+
+# Local application imports
+from domain import view_timetables
+from tests import data_factories
+
+
+@pytest.mark.django_db
+class TestTimetableCache:
+    def test_get_or_set_only_makes_value_once_per_data_version(
+        self, django_capture_on_commit_callbacks
+    ):
+        school = data_factories.School()
+        calls = []
+
+        def make() -> str:
+            calls.append(1)
+            return f"timetable-{len(calls)}"
+
+        cache = view_timetables.TimetableCache(school_id=school.school_access_key)
+        with django_capture_on_commit_callbacks(execute=True):
+            assert cache.get_or_set("pupil-1", make) == "timetable-1"
+        assert cache.get_or_set("pupil-1", make) == "timetable-1"
+
+        # Changing the school's data should stop the old value being read
+        data_factories.Pupil(school=school)
+        cache = view_timetables.TimetableCache(school_id=school.school_access_key)
+
+        assert cache.get_or_set("pupil-1", make) == "timetable-2"
+        assert len(calls) == 2
+
+    def test_get_many_or_set_only_makes_missing_values(
+        self, django_capture_on_commit_callbacks
+    ):
+        school = data_factories.School()
+        cache = view_timetables.TimetableCache(school_id=school.school_access_key)
+        with django_capture_on_commit_callbacks(execute=True):
+            cache.get_or_set("pupil-1", lambda: "cached")
+
+        made = []
+
+        def make(entity: str) -> str:
+            made.append(entity)
+            return f"made {entity}"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            values = cache.get_many_or_set(["pupil-2", "pupil-1"], make)
+
+        assert values == {"pupil-2": "made pupil-2", "pupil-1": "cached"}
+        assert list(values) == ["pupil-2", "pupil-1"]
+        assert made == ["pupil-2"]
+        assert cache.get_many_or_set(["pupil-2"], make) == {"pupil-2": "made pupil-2"}
+        assert made == ["pupil-2"]
+
+    def test_entries_are_not_shared_between_schools(self):
+        school = data_factories.School()
+        other_school = data_factories.School()
+
+        view_timetables.TimetableCache(school_id=school.school_access_key).get_or_set(
+            "pupil-1", lambda: "school"
+        )
+        value = view_timetables.TimetableCache(
+            school_id=other_school.school_access_key
+        ).get_or_set("pupil-1", lambda: "other school")
+
+        assert value == "other school"
+
+    def test_values_made_in_rolled_back_transaction_not_cached(
+        self, django_capture_on_commit_callbacks
+    ):
+        school = data_factories.School()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    data_factories.Pupil(school=school)
+                    view_timetables.TimetableCache(
+                        school_id=school.school_access_key
+                    ).get_or_set("pupil-1", lambda: "rolled back")
+                    raise RuntimeError
+
+        # Reuse the rolled back data version
+        data_factories.Pupil(school=school)
+        value = view_timetables.TimetableCache(
+            school_id=school.school_access_key
+        ).get_or_set("pupil-1", lambda: "committed")
+
+        assert value == "committed"
@@ -245,10 +245,22 @@ class TestBreakUpdateTimings:
     def test_updated_break_with_year_group_slot_clash_invalid(self):
         school = data_factories.School()
         yg = data_factories.YearGroup(school=school)
-        break_ = data_factories.Break(relevant_year_groups=(yg,), school=school)
+        break_ = data_factories.Break(
+            relevant_year_groups=(yg,),
+            school=school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
 
         # Create a slot at the attempted update time
-        slot = data_factories.TimetableSlot(relevant_year_groups=(yg,), school=school)
+        slot = data_factories.TimetableSlot(
+            relevant_year_groups=(yg,),
+            school=school,
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=12),
+            ends_at=dt.time(hour=13),
+        )
 
         form = break_forms.BreakUpdateTimings(
             school_id=school.school_access_key,
@@ -277,10 +289,8 @@ class TestBreakUpdateTimings:
             relevant_year_groups=(yg, other_yg), school=school
         )
 
-        # Create a slot at the time we'll try updating to
-        slot = data_factories.TimetableSlot(
-            school=school, relevant_year_groups=(other_yg,)
-        )
+        # Create a slot at the time we'll try updating to, and a break for the other year group
+        slot = data_factories.TimetableSlot(school=school, relevant_year_groups=(yg,))
         data_factories.Break(
             relevant_year_groups=(other_yg,),
             school=school,
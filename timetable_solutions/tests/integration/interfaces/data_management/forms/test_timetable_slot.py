@@ -259,10 +259,20 @@ class TestTimetableSlotUpdateTimings:
     def test_updated_slot_with_break_clash_invalid(self):
         school = data_factories.School()
         yg = data_factories.YearGroup(school=school)
-        slot = data_factories.TimetableSlot(relevant_year_groups=(yg,), school=school)
+        slot = data_factories.TimetableSlot(
+            relevant_year_groups=(yg,),
+            school=school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+        )
 
         # Create a break at the attempted update time
-        break_ = data_factories.Break(relevant_year_groups=(yg,), school=school)
+        break_ = data_factories.Break(
+            relevant_year_groups=(yg,),
+            school=school,
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=12),
+        )
 
         form = timetable_slot_forms.TimetableSlotUpdateTimings(
             school_id=school.school_access_key,
@@ -291,8 +301,13 @@ class TestTimetableSlotUpdateTimings:
             relevant_year_groups=(yg, other_yg), school=school
         )
 
-        # Create a slot at the time we'll try updating to
-        other_slot = data_factories.TimetableSlot.get_next_consecutive_slot(slot=slot)
+        # Create a slot at the time we'll try updating to, and a break for the other year group
+        other_slot = data_factories.TimetableSlot(
+            school=school,
+            relevant_year_groups=(yg,),
+            day_of_week=slot.day_of_week,
+            starts_at=slot.ends_at,
+        )
         data_factories.Break(
             relevant_year_groups=(other_yg,),
             school=school,
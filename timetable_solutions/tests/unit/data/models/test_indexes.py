@@ -0,0 +1,89 @@
+"""
+Tests that the key queries on the data models are answered using an index, rather than by scanning a table.
+"""
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import connection
+from django.db.models import QuerySet
+
+# Local application imports
+from data import models
+from domain.solver.filters import clashes
+from tests import data_factories
+
+
+def assert_uses_index(queryset: QuerySet, index_name: str) -> None:
+    """
+    Check the query plan for the queryset uses the given index (SQLite), or any index scan (Postgres).
+    """
+    if connection.vendor == "postgresql":
+        # The test tables are tiny, so would otherwise always be scanned
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        assert "Index" in queryset.explain()
+    else:
+        assert f"INDEX {index_name}" in queryset.explain()
+
+
+@pytest.mark.django_db
+class TestQueriesUseIndexes:
+    def test_clash_filter_on_school_slots(self):
+        slot = data_factories.TimetableSlot()
+        slots = models.TimetableSlot.objects.get_all_instances_for_school(
+            school_id=slot.school.school_access_key
+        )
+
+        queryset = clashes.filter_queryset_for_clashes(
+            queryset=slots, time_of_week=clashes.TimeOfWeek.from_slot(slot)
+        )
+
+        assert_uses_index(queryset, index_name="slot_school_time_of_week")
+
+    def test_clash_filter_on_school_breaks(self):
+        break_ = data_factories.Break()
+        breaks = models.Break.objects.get_all_instances_for_school(
+            school_id=break_.school.school_access_key
+        )
+
+        queryset = clashes.filter_queryset_for_clashes(
+            queryset=breaks, time_of_week=clashes.TimeOfWeek.from_break(break_)
+        )
+
+        assert_uses_index(queryset, index_name="break_school_time_of_week")
+
+    def test_lessons_using_a_slot(self):
+        slot = data_factories.TimetableSlot()
+
+        queryset = slot.get_all_lessons()
+
+        assert_uses_index(queryset, index_name="lesson_user_slots_slot_lesson")
+        assert_uses_index(queryset, index_name="lesson_solver_slots_slot_lesson")
+
+    def test_slots_and_breaks_of_a_year_group(self):
+        year_group = data_factories.YearGroup()
+
+        assert_uses_index(
+            year_group.slots.all(), index_name="slot_year_groups_year_group_slot"
+        )
+        assert_uses_index(
+            year_group.breaks.all(), index_name="break_year_groups_year_group_break"
+        )
+
+    def test_lessons_and_slots_of_a_pupil(self):
+        pupil = data_factories.Pupil()
+
+        assert_uses_index(pupil.lessons.all(), index_name="lesson_pupils_pupil_lesson")
+        assert_uses_index(
+            models.TimetableSlot.objects.filter(user_lessons__pupils=pupil),
+            index_name="lesson_pupils_pupil_lesson",
+        )
+
+    def test_breaks_of_a_teacher(self):
+        teacher = data_factories.Teacher()
+
+        assert_uses_index(
+            teacher.breaks.all(), index_name="break_teachers_teacher_break"
+        )
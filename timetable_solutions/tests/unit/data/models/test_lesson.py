@@ -146,6 +146,46 @@ class TestLessonDeletionMethods:
         lesson.refresh_from_db()
         assert lesson.solver_defined_time_slots.count() == 0
 
+    def test_delete_solver_solution_for_school_is_a_single_delete(
+        self, django_assert_num_queries
+    ):
+        school = data_factories.School()
+        slot = data_factories.TimetableSlot(school=school)
+        for _ in range(0, 3):
+            data_factories.Lesson(school=school, solver_defined_time_slots=(slot,))
+        school.refresh_from_db()
+
+        # One query for the delete, and one to increment the school's data version
+        with django_assert_num_queries(2):
+            models.Lesson.delete_solver_solution_for_school(
+                school_id=school.school_access_key
+            )
+
+        assert not models.Lesson.solver_defined_time_slots.through.objects.exists()
+        assert models.School.objects.get().data_version == school.data_version + 1
+
+    def test_delete_solver_solution_for_subset_of_lessons(self):
+        school = data_factories.School()
+        slot = data_factories.TimetableSlot(school=school)
+        lesson = data_factories.Lesson(school=school, solver_defined_time_slots=(slot,))
+        other_lesson = data_factories.Lesson(
+            school=school, solver_defined_time_slots=(slot,)
+        )
+        # Make a lesson at another school, with the same lesson id
+        other_school_lesson = data_factories.Lesson(lesson_id=lesson.lesson_id)
+        other_school_slot = data_factories.TimetableSlot(
+            school=other_school_lesson.school
+        )
+        other_school_lesson.solver_defined_time_slots.add(other_school_slot)
+
+        models.Lesson.delete_solver_solution_for_school(
+            school_id=school.school_access_key, lesson_ids=[lesson.lesson_id]
+        )
+
+        assert not lesson.solver_defined_time_slots.exists()
+        assert other_lesson.solver_defined_time_slots.get() == slot
+        assert other_school_lesson.solver_defined_time_slots.get() == other_school_slot
+
 
 @pytest.mark.django_db
 class TestUpdate:
@@ -258,6 +298,54 @@ class TestAddSolverDefinedTimeSlots:
             lesson.add_solver_defined_time_slots(models.TimetableSlot.objects.all())
 
 
+@pytest.mark.django_db
+class TestBulkAddSolverDefinedTimeSlots:
+    def test_can_add_time_slots_to_several_lessons(self):
+        slot_1 = data_factories.TimetableSlot()
+        slot_2 = data_factories.TimetableSlot(school=slot_1.school)
+        lesson_1 = data_factories.Lesson(school=slot_1.school)
+        lesson_2 = data_factories.Lesson(
+            school=slot_1.school, solver_defined_time_slots=(slot_1,)
+        )
+
+        models.Lesson.bulk_add_solver_defined_time_slots(
+            school_id=slot_1.school.school_access_key,
+            time_slot_pks_by_lesson_pk={
+                lesson_1.pk: [slot_1.pk, slot_2.pk],
+                lesson_2.pk: [slot_1.pk],  # Already added
+            }
+        )
+
+        assert set(lesson_1.solver_defined_time_slots.all()) == {slot_1, slot_2}
+        assert lesson_2.solver_defined_time_slots.get() == slot_1
+
+    def test_adding_time_slots_increments_data_version(self):
+        slot = data_factories.TimetableSlot()
+        lesson = data_factories.Lesson(school=slot.school)
+        data_version = models.School.objects.get().data_version
+
+        models.Lesson.bulk_add_solver_defined_time_slots(
+            school_id=slot.school.school_access_key,
+            time_slot_pks_by_lesson_pk={lesson.pk: [slot.pk]},
+        )
+
+        assert models.School.objects.get().data_version == data_version + 1
+
+    def test_cannot_add_user_defined_time_slot_as_solver_defined(self):
+        slot = data_factories.TimetableSlot()
+        lesson = data_factories.Lesson(
+            school=slot.school, user_defined_time_slots=(slot,), total_required_slots=2
+        )
+
+        with pytest.raises(IntegrityError):
+            models.Lesson.bulk_add_solver_defined_time_slots(
+                school_id=slot.school.school_access_key,
+                time_slot_pks_by_lesson_pk={lesson.pk: [slot.pk]},
+            )
+
+        assert not lesson.solver_defined_time_slots.exists()
+
+
 @pytest.mark.django_db
 class TestLessonQueries:
     # --------------------
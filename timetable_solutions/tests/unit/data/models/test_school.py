@@ -6,6 +6,10 @@ Unit tests for methods on the School model
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 # Local application imports
 from data import models
 from tests import data_factories as factories
@@ -43,3 +47,105 @@ class TestSchool:
 
         # Check outcome
         assert test_school.school_access_key == factory_school.school_access_key + 1
+
+    # --------------------
+    # Mutators tests
+    # --------------------
+
+    def test_increment_data_version(self):
+        school = factories.School()
+        assert school.data_version == 0
+
+        models.School.increment_data_version(school_id=school.school_access_key)
+
+        school.refresh_from_db()
+        assert school.data_version == 1
+
+    def test_coalesce_data_version_increments_increments_each_changed_school_once(self):
+        school = factories.School()
+        other_school = factories.School()
+        unchanged_school = factories.School()
+
+        with CaptureQueriesContext(connection) as queries:
+            with models.School.coalesce_data_version_increments():
+                for _ in range(3):
+                    factories.Teacher(school=school)
+                    factories.Teacher(school=other_school)
+                with models.School.coalesce_data_version_increments():
+                    factories.Teacher(school=school)
+
+        school_updates = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "data_school"')
+        ]
+        assert len(school_updates) == 1
+        assert models.School.objects.get(pk=school.pk).data_version == 1
+        assert models.School.objects.get(pk=other_school.pk).data_version == 1
+        assert models.School.objects.get(pk=unchanged_school.pk).data_version == 0
+
+    def test_coalesce_data_version_increments_rolls_back_changes_on_error(self):
+        school = factories.School()
+
+        with pytest.raises(ValueError):
+            with models.School.coalesce_data_version_increments():
+                factories.Teacher(school=school)
+                raise ValueError
+
+        school.refresh_from_db()
+        assert school.data_version == 0
+        assert not models.Teacher.objects.exists()
+
+        # Increments are made straight away again once outside the block
+        factories.Teacher(school=school)
+        school.refresh_from_db()
+        assert school.data_version == 1
+
+    def test_deleting_all_of_a_schools_data_increments_data_version_once(self):
+        school = factories.School()
+        for _ in range(3):
+            factories.Pupil(school=school)
+        school.refresh_from_db()
+        data_version = school.data_version
+
+        models.Pupil.delete_all_instances_for_school(
+            school_id=school.school_access_key
+        )
+
+        school.refresh_from_db()
+        assert school.data_version == data_version + 1
+
+    def test_saving_and_deleting_solver_input_data_increments_data_version(self):
+        school = factories.School()
+
+        teacher = factories.Teacher(school=school)
+        school.refresh_from_db()
+        assert school.data_version == 1
+
+        teacher.delete()
+        school.refresh_from_db()
+        assert school.data_version == 2
+
+    def test_changing_solver_input_relationships_increments_data_version(self):
+        lesson = factories.Lesson()
+        pupil = factories.Pupil(school=lesson.school)
+        lesson.school.refresh_from_db()
+        data_version = lesson.school.data_version
+
+        # Change the relationship from both sides
+        lesson.pupils.add(pupil)
+        pupil.lessons.remove(lesson)
+
+        lesson.school.refresh_from_db()
+        assert lesson.school.data_version == data_version + 2
+
+    def test_adding_solver_defined_time_slots_does_not_increment_data_version(self):
+        lesson = factories.Lesson()
+        slot = factories.TimetableSlot(school=lesson.school)
+        lesson.school.refresh_from_db()
+        data_version = lesson.school.data_version
+
+        lesson.solver_defined_time_slots.add(slot)
+
+        lesson.school.refresh_from_db()
+        assert lesson.school.data_version == data_version
@@ -0,0 +1,76 @@
+"""
+Unit tests for methods on the SolutionCandidate class and SolutionCandidateQuerySet class.
+"""
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import IntegrityError
+
+# Local application imports
+from data import models
+from tests import data_factories
+
+
+@pytest.mark.django_db
+class TestCreateNew:
+    def test_create_new_candidate_with_assignments(self):
+        lesson = data_factories.Lesson()
+        slot = data_factories.TimetableSlot(school=lesson.school)
+
+        candidate = models.SolutionCandidate.create_new(
+            school_id=lesson.school.school_access_key,
+            candidate_number=1,
+            assignments=[(lesson, slot)],
+            objective_value=2.5,
+        )
+
+        assert candidate in models.SolutionCandidate.objects.all()
+        assert candidate.objective_value == 2.5
+        assert candidate.get_lesson_slots() == {lesson: [slot]}
+
+    def test_raises_for_non_unique_candidate_number_for_school(self):
+        school = data_factories.School()
+        models.SolutionCandidate.create_new(
+            school_id=school.school_access_key, candidate_number=1, assignments=[]
+        )
+
+        with pytest.raises(IntegrityError):
+            models.SolutionCandidate.create_new(
+                school_id=school.school_access_key, candidate_number=1, assignments=[]
+            )
+
+
+@pytest.mark.django_db
+class TestPromote:
+    def test_promote_replaces_lessons_solver_defined_time_slots(self):
+        school = data_factories.School()
+        old_slot = data_factories.TimetableSlot(school=school)
+        new_slot = data_factories.TimetableSlot(school=school)
+        lesson = data_factories.Lesson(
+            school=school, solver_defined_time_slots=(old_slot,)
+        )
+        candidate = models.SolutionCandidate.create_new(
+            school_id=school.school_access_key,
+            candidate_number=1,
+            assignments=[(lesson, new_slot)],
+        )
+
+        candidate.promote()
+
+        assert lesson.solver_defined_time_slots.get() == new_slot
+
+    def test_promote_does_not_affect_other_school(self):
+        other_lesson = data_factories.Lesson()
+        other_slot = data_factories.TimetableSlot(school=other_lesson.school)
+        other_lesson.solver_defined_time_slots.add(other_slot)
+
+        school = data_factories.School()
+        candidate = models.SolutionCandidate.create_new(
+            school_id=school.school_access_key, candidate_number=1, assignments=[]
+        )
+
+        candidate.promote()
+
+        assert other_lesson.solver_defined_time_slots.get() == other_slot
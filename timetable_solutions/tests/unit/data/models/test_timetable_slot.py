@@ -11,7 +11,7 @@ import pytest
 
 # Django imports
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 
 # Local application imports
 from data import constants, models
@@ -145,6 +145,85 @@ class TestCreateNewTimetableSlot:
             )
 
 
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Year group clashes are only checked by the db on Postgres.",
+)
+class TestYearGroupClashesCheckedByDatabase:
+    def test_cannot_give_year_group_a_clashing_slot(self):
+        yg = data_factories.YearGroup()
+        data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            relevant_year_groups=(yg,),
+        )
+        slot = data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9, minute=30),
+        )
+
+        with pytest.raises(IntegrityError):
+            slot.relevant_year_groups.add(yg)
+
+    def test_cannot_give_year_group_a_slot_clashing_with_a_break(self):
+        yg = data_factories.YearGroup()
+        data_factories.Break(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=12),
+            relevant_year_groups=(yg,),
+        )
+        slot = data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=12),
+        )
+
+        with pytest.raises(IntegrityError):
+            slot.relevant_year_groups.add(yg)
+
+    def test_cannot_move_slot_to_clash_within_year_group(self):
+        yg = data_factories.YearGroup()
+        data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            relevant_year_groups=(yg,),
+        )
+        slot = data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=9),
+            relevant_year_groups=(yg,),
+        )
+
+        with pytest.raises(IntegrityError):
+            slot.update_slot_timings(day_of_week=constants.Day.MONDAY)
+
+    def test_consecutive_slots_and_other_year_groups_do_not_clash(self):
+        yg = data_factories.YearGroup()
+        other_yg = data_factories.YearGroup(school=yg.school)
+        slot = data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            relevant_year_groups=(yg,),
+        )
+        data_factories.TimetableSlot(
+            school=yg.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            relevant_year_groups=(other_yg,),
+        )
+
+        next_slot = data_factories.TimetableSlot.get_next_consecutive_slot(slot)
+
+        assert next_slot.relevant_year_groups.get() == yg
+
+
 @pytest.mark.django_db
 class TestUpdateSlotTimings:
     def test_can_update_slot_to_valid_time(self):
@@ -10,6 +10,7 @@ import pytest
 
 # Local application imports
 from data import models
+from data.constants import Day
 from domain.solver.filters import clashes
 from tests import data_factories as data_factories
 
@@ -143,3 +144,112 @@ class TestFilterQuerysetForClashesBreak:
         )
 
         assert clashing_breaks.get() == break_
+
+
+@pytest.mark.django_db
+class TestGetClashMatrix:
+    def test_clash_matrix_agrees_with_filter_queryset_for_clashes(self):
+        school = data_factories.School()
+        for hour, minute in [(8, 0), (9, 0), (9, 30), (10, 0), (10, 15)]:
+            data_factories.TimetableSlot(
+                school=school,
+                starts_at=dt.time(hour=hour, minute=minute),
+                ends_at=dt.time(hour=hour + 1, minute=minute),
+            )
+        data_factories.TimetableSlot(school=school, day_of_week=Day.TUESDAY)
+        slots = list(models.TimetableSlot.objects.filter(school=school))
+
+        clash_matrix = clashes.get_clash_matrix(items=slots, times=slots)
+
+        for index, slot in enumerate(slots):
+            clashing_slots = clashes.filter_queryset_for_clashes(
+                queryset=models.TimetableSlot.objects.filter(school=school),
+                time_of_week=clashes.TimeOfWeek.from_slot(slot),
+            )
+            expected = [other_slot in clashing_slots for other_slot in slots]
+            assert clash_matrix[:, index].tolist() == expected
+
+
+@pytest.mark.django_db
+class TestTimesOfWeek:
+    def test_times_are_minutes_since_monday_midnight(self):
+        times = clashes.TimesOfWeek.from_items(
+            [
+                clashes.TimeOfWeek(
+                    starts_at=dt.time(hour=9),
+                    ends_at=dt.time(hour=10, minute=30),
+                    day_of_week=Day.MONDAY,
+                ),
+                clashes.TimeOfWeek(
+                    starts_at=dt.time(hour=0),
+                    ends_at=dt.time(hour=1),
+                    day_of_week=Day.TUESDAY,
+                ),
+            ]
+        )
+
+        assert times.starts.tolist() == [9 * 60, 24 * 60]
+        assert times.ends.tolist() == [10 * 60 + 30, 25 * 60]
+
+    def test_filter_items_for_clashes_agrees_with_filter_queryset_for_clashes(self):
+        school = data_factories.School()
+        for hour, minute in [(8, 0), (9, 0), (9, 30), (10, 0), (10, 15)]:
+            data_factories.Break(
+                school=school,
+                day_of_week=Day.MONDAY,
+                starts_at=dt.time(hour=hour, minute=minute),
+                ends_at=dt.time(hour=hour + 1, minute=minute),
+            )
+        data_factories.Break(school=school, day_of_week=Day.TUESDAY)
+        all_breaks = models.Break.objects.filter(school=school)
+
+        for break_ in all_breaks:
+            time_of_week = clashes.TimeOfWeek.from_break(break_)
+
+            clashing_breaks = clashes.filter_items_for_clashes(
+                items=list(all_breaks), time_of_week=time_of_week
+            )
+
+            assert clashing_breaks == list(
+                clashes.filter_queryset_for_clashes(
+                    queryset=all_breaks, time_of_week=time_of_week
+                )
+            )
+
+
+@pytest.mark.django_db
+class TestFindClashes:
+    def test_find_clashes_agrees_with_filter_queryset_for_clashes(self):
+        school = data_factories.School()
+        year_groups = []
+        for hour, minute in [(8, 0), (9, 0), (9, 30), (10, 0), (10, 15)]:
+            # Each slot has its own year groups, since a year group's slots can't clash
+            slot_year_groups = data_factories.YearGroup.create_batch(
+                size=2, school=school
+            )
+            year_groups += slot_year_groups
+            data_factories.TimetableSlot(
+                school=school,
+                day_of_week=Day.MONDAY,
+                starts_at=dt.time(hour=hour, minute=minute),
+                ends_at=dt.time(hour=hour + 1, minute=minute),
+                relevant_year_groups=slot_year_groups,
+            )
+        data_factories.TimetableSlot(school=school, day_of_week=Day.TUESDAY)
+        # Joining the year groups would give duplicates, without the distinct
+        slots = models.TimetableSlot.objects.filter(
+            relevant_year_groups__in=year_groups
+        )
+
+        for slot in slots:
+            time_of_week = clashes.TimeOfWeek.from_slot(slot)
+
+            clashing_slots = clashes.find_clashes(
+                queryset=slots, time_of_week=time_of_week
+            )
+
+            assert clashing_slots == list(
+                clashes.filter_queryset_for_clashes(
+                    queryset=slots, time_of_week=time_of_week
+                )
+            )
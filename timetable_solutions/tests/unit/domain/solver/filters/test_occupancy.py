@@ -0,0 +1,222 @@
+"""
+Tests for the per-year-group occupancy bitsets.
+"""
+
+# Standard library imports
+import datetime as dt
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+# Local application imports
+from data import models
+from data.constants import Day
+from domain.solver.filters import clashes, occupancy
+from tests import data_factories
+
+
+def get_time_of_week(
+    starts_at: dt.time, ends_at: dt.time, day_of_week: Day = Day.MONDAY
+) -> clashes.TimeOfWeek:
+    return clashes.TimeOfWeek(
+        starts_at=starts_at, ends_at=ends_at, day_of_week=day_of_week
+    )
+
+
+class TestGetBits:
+    def test_one_bit_per_minute_from_monday_midnight(self):
+        time_of_week = get_time_of_week(
+            starts_at=dt.time(hour=0, minute=1),
+            ends_at=dt.time(hour=0, minute=4),
+            day_of_week=Day.TUESDAY,
+        )
+
+        bits = occupancy.get_bits(time_of_week)
+
+        assert bits == 0b111 << (24 * 60 + 1)
+
+
+class TestGetBoundaryBits:
+    def test_bits_of_first_and_last_minutes(self):
+        time_of_week = get_time_of_week(
+            starts_at=dt.time(hour=0, minute=1), ends_at=dt.time(hour=0, minute=4)
+        )
+
+        bits = occupancy.get_boundary_bits(time_of_week)
+
+        assert bits == 0b101 << 1
+
+
+@pytest.mark.django_db
+class TestSchoolOccupancy:
+    def test_clashes_found_for_the_checked_year_groups(self):
+        year_group = data_factories.YearGroup()
+        school = year_group.school
+        slot = data_factories.TimetableSlot(
+            school=school,
+            day_of_week=Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+            relevant_year_groups=(year_group,),
+        )
+        break_ = data_factories.Break(
+            school=school,
+            day_of_week=Day.MONDAY,
+            starts_at=dt.time(hour=10),
+            ends_at=dt.time(hour=11),
+            relevant_year_groups=(year_group,),
+        )
+        other_year_group = data_factories.YearGroup(school=school)
+        time_of_week = get_time_of_week(
+            starts_at=dt.time(hour=9, minute=30), ends_at=dt.time(hour=10, minute=30)
+        )
+
+        school_occupancy = occupancy.get_school_occupancy(
+            school_id=school.school_access_key
+        )
+        clash = school_occupancy.get_clashes(
+            time_of_week, year_group_pks=[year_group.pk]
+        )
+        other_clash = school_occupancy.get_clashes(
+            time_of_week, year_group_pks=[other_year_group.pk]
+        )
+
+        assert [occupied.pk for occupied in clash.slots] == [slot.pk]
+        assert [occupied.pk for occupied in clash.breaks] == [break_.pk]
+        assert clash.slot_clash_str == "09:00-10:00"
+        assert clash.break_clash_str == "10:00-11:00"
+        assert not other_clash
+
+    def test_excluded_slot_does_not_clash(self):
+        slot = data_factories.TimetableSlot()
+        year_group = data_factories.YearGroup(school=slot.school)
+        slot.relevant_year_groups.add(year_group)
+
+        clash = occupancy.get_school_occupancy(
+            school_id=slot.school.school_access_key
+        ).get_clashes(
+            clashes.TimeOfWeek.from_slot(slot),
+            year_group_pks=[year_group.pk],
+            exclude_slot_pk=slot.pk,
+        )
+
+        assert not clash
+
+    @pytest.mark.parametrize(
+        "starts_at,ends_at,expect_clash",
+        [
+            (dt.time(hour=8), dt.time(hour=9), False),  # Adjacent
+            (dt.time(hour=8, minute=30), dt.time(hour=9, minute=30), True),
+            (dt.time(hour=9, minute=15), dt.time(hour=9, minute=45), True),
+            (dt.time(hour=9), dt.time(hour=10), True),  # Exact match
+            (dt.time(hour=9), dt.time(hour=11), True),  # Same start
+            (dt.time(hour=8), dt.time(hour=10), True),  # Same end
+            # As in filter_queryset_for_clashes, a slot strictly within the time doesn't clash
+            (dt.time(hour=8), dt.time(hour=11), False),
+        ],
+    )
+    def test_whole_school_clashes(self, starts_at, ends_at, expect_clash):
+        # A slot not relevant to any year group
+        slot = data_factories.TimetableSlot(
+            day_of_week=Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+        )
+        time_of_week = get_time_of_week(starts_at=starts_at, ends_at=ends_at)
+
+        clash = occupancy.get_school_occupancy(
+            school_id=slot.school.school_access_key
+        ).get_clashes(time_of_week)
+
+        assert bool(clash) is expect_clash
+        assert (
+            clashes.filter_queryset_for_clashes(
+                models.TimetableSlot.objects.all(), time_of_week=time_of_week
+            ).exists()
+            is expect_clash
+        )
+
+    def test_occupancy_cached_until_school_data_changes(
+        self, django_capture_on_commit_callbacks
+    ):
+        year_group = data_factories.YearGroup()
+        school = year_group.school
+        time_of_week = get_time_of_week(
+            starts_at=dt.time(hour=9), ends_at=dt.time(hour=10)
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            occupancy.get_school_occupancy(school_id=school.school_access_key)
+
+        with CaptureQueriesContext(connection) as queries:
+            school_occupancy = occupancy.get_school_occupancy(
+                school_id=school.school_access_key
+            )
+
+        # Only the data version is queried
+        assert len(queries) == 1
+        assert not school_occupancy.get_clashes(
+            time_of_week, year_group_pks=[year_group.pk]
+        )
+
+        # Adding a slot to the year group changes the school's data version
+        data_factories.TimetableSlot(
+            school=school,
+            day_of_week=Day.MONDAY,
+            starts_at=dt.time(hour=9),
+            ends_at=dt.time(hour=10),
+            relevant_year_groups=(year_group,),
+        )
+
+        school_occupancy = occupancy.get_school_occupancy(
+            school_id=school.school_access_key
+        )
+        assert school_occupancy.get_clashes(
+            time_of_week, year_group_pks=[year_group.pk]
+        )
+
+    def test_occupancy_built_in_rolled_back_transaction_not_cached(
+        self, django_capture_on_commit_callbacks
+    ):
+        year_group = data_factories.YearGroup()
+        school = year_group.school
+        time_of_week = get_time_of_week(
+            starts_at=dt.time(hour=9), ends_at=dt.time(hour=10)
+        )
+
+        # Give the year group a slot, and build the occupancy, but then roll back
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    data_factories.TimetableSlot(
+                        school=school,
+                        day_of_week=Day.MONDAY,
+                        starts_at=dt.time(hour=9),
+                        ends_at=dt.time(hour=10),
+                        relevant_year_groups=(year_group,),
+                    )
+                    rolled_back_school = models.School.objects.get(pk=school.pk)
+                    occupancy.get_school_occupancy(school_id=school.school_access_key)
+                    raise RuntimeError
+
+        # Give the year group a different slot, reusing the rolled back data version
+        with django_capture_on_commit_callbacks(execute=True):
+            data_factories.TimetableSlot(
+                school=school,
+                day_of_week=Day.TUESDAY,
+                starts_at=dt.time(hour=9),
+                ends_at=dt.time(hour=10),
+                relevant_year_groups=(year_group,),
+            )
+            school_occupancy = occupancy.get_school_occupancy(
+                school_id=school.school_access_key
+            )
+
+        school.refresh_from_db()
+        assert school.data_version == rolled_back_school.data_version
+        assert not school_occupancy.get_clashes(
+            time_of_week, year_group_pks=[year_group.pk]
+        )
@@ -7,6 +7,10 @@ import datetime as dt
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 # Local application imports
 from data import constants as data_constants
 from data import models
@@ -409,3 +413,55 @@ class TestSolverConstraints:
 
         with pytest.raises(StopIteration):
             next(constraints)
+
+    def test_structural_constraints_generated_without_queries(self):
+        lesson = data_factories.Lesson.with_n_pupils(
+            n_pupils=1, total_required_slots=4, total_required_double_periods=1
+        )
+        year_group = lesson.pupils.first().year_group
+        # Three consecutive slots on Monday, and a user defined slot on Tuesday
+        monday_0 = data_factories.TimetableSlot(
+            school=lesson.school,
+            day_of_week=data_constants.Day.MONDAY,
+            relevant_year_groups=(year_group,),
+        )
+        monday_1 = data_factories.TimetableSlot.get_next_consecutive_slot(monday_0)
+        data_factories.TimetableSlot.get_next_consecutive_slot(monday_1)
+        tuesday = data_factories.TimetableSlot(
+            school=lesson.school,
+            day_of_week=data_constants.Day.TUESDAY,
+            relevant_year_groups=(year_group,),
+        )
+        lesson.user_defined_time_slots.add(tuesday)
+        constraint_maker = self.get_constraint_maker(school=lesson.school)
+
+        with CaptureQueriesContext(connection) as queries:
+            no_split = {
+                name: constraint
+                for constraint, name in constraint_maker._get_all_no_split_lessons_in_a_day_constraints()
+            }
+            no_two_doubles = {
+                name: constraint
+                for constraint, name in constraint_maker._get_all_no_two_doubles_in_a_day_constraints()
+            }
+
+        assert len(queries) == 0
+        monday, tuesday = data_constants.Day.MONDAY, data_constants.Day.TUESDAY
+        # Monday: 3 singles - 2 doubles <= 1
+        monday_no_split = no_split[
+            f"no_split_{lesson.lesson_id}_classes_on_day_{monday}"
+        ]
+        assert len(monday_no_split) == 5
+        assert monday_no_split.constant == -1
+        # Tuesday: no variables, and the user defined slot uses up the day
+        tuesday_no_split = no_split[
+            f"no_split_{lesson.lesson_id}_classes_on_day_{tuesday}"
+        ]
+        assert len(tuesday_no_split) == 0
+        assert tuesday_no_split.constant == 0
+        # Monday: 2 doubles <= 1
+        monday_doubles = no_two_doubles[
+            f"max_one_{lesson.lesson_id}_double_day_{monday}"
+        ]
+        assert len(monday_doubles) == 2
+        assert monday_doubles.constant == -1
@@ -0,0 +1,108 @@
+"""Unit tests for the SparseModel class"""
+
+# Standard library imports
+import pathlib
+
+# Third party imports
+import numpy as np
+import pulp as lp
+
+# Local application imports
+from domain.solver.linear_programming.sparse_model import SparseModel
+
+
+def get_model() -> tuple[SparseModel, lp.LpVariable, lp.LpVariable]:
+    """
+    Get the model: maximise x + 2y, subject to x + y <= 3, with x binary and 0 <= y <= 2.
+    """
+    x = lp.LpVariable("x", cat="Binary")
+    y = lp.LpVariable("y", lowBound=0, upBound=2)
+    model = SparseModel(variables=[x, y])
+    model.objective[:] = [1, 2]
+    model.add_row_sums(
+        column_lists=[[0, 1]],
+        senses=np.array([lp.LpConstraintLE]),
+        rhs=np.array([3]),
+        names=["x_plus_y_at_most_three"],
+    )
+    return model, x, y
+
+
+class TestSparseModel:
+    def test_rows_added_in_blocks(self):
+        model, _, _ = get_model()
+
+        model.add_rows(
+            rows=np.array([0, 1, 1]),
+            columns=np.array([0, 0, 1]),
+            coefficients=np.array([1, 1, -1]),
+            senses=np.array([lp.LpConstraintGE, lp.LpConstraintEQ]),
+            rhs=np.array([0, 0]),
+            names=["x_at_least_zero", "x_equals_y"],
+        )
+
+        rows, columns, coefficients = model.to_coo()
+        assert rows.tolist() == [0, 0, 1, 2, 2]
+        assert columns.tolist() == [0, 1, 0, 0, 1]
+        assert coefficients.tolist() == [1, 1, 1, 1, -1]
+        assert model.senses.tolist() == [
+            lp.LpConstraintLE,
+            lp.LpConstraintGE,
+            lp.LpConstraintEQ,
+        ]
+        assert model.n_constraints == 3
+        assert model.n_nonzeros == 5
+
+    def test_get_columns_from_row(self):
+        model, _, _ = get_model()
+        model.add_row_sums(
+            column_lists=[[1], [0, 1]],
+            senses=np.array([lp.LpConstraintGE, lp.LpConstraintLE]),
+            rhs=np.array([0, 1]),
+            names=["y_at_least_zero", "x_plus_y_at_most_one"],
+        )
+
+        assert model.get_columns_from_row(first_row=0).tolist() == [0, 1, 1, 0, 1]
+        assert model.get_columns_from_row(first_row=1).tolist() == [1, 0, 1]
+        assert model.get_columns_from_row(first_row=3).tolist() == []
+
+    def test_write_mps_matches_pulp_problem(self, tmp_path: pathlib.Path):
+        model, _, _ = get_model()
+        model.write_mps(tmp_path / "model.mps")
+
+        # Read the file back into PuLP, which negates the objective when minimising
+        _, problem = lp.LpProblem.fromMPS(str(tmp_path / "model.mps"))
+
+        assert problem.sense == lp.LpMinimize
+        assert problem.numVariables() == 2
+        assert problem.numConstraints() == 1
+        assert {
+            variable.name: coefficient
+            for variable, coefficient in problem.objective.items()
+        } == {"X0000000": -1, "X0000001": -2}
+        variables = {variable.name: variable for variable in problem.variables()}
+        assert variables["X0000000"].cat == lp.LpInteger
+        assert variables["X0000001"].upBound == 2
+
+    def test_solve_sets_variable_values(self):
+        model, x, y = get_model()
+
+        model.solve()
+
+        assert model.status == lp.LpStatusOptimal
+        assert x.varValue == 1
+        assert y.varValue == 2
+        assert model.objective_value == 5
+
+    def test_solve_infeasible_model(self):
+        model, _, _ = get_model()
+        model.add_row_sums(
+            column_lists=[[0, 1]],
+            senses=np.array([lp.LpConstraintGE]),
+            rhs=np.array([4]),
+            names=["x_plus_y_at_least_four"],
+        )
+
+        model.solve()
+
+        assert model.status == lp.LpStatusInfeasible
@@ -0,0 +1,195 @@
+"""Tests for the capacity checks run before the timetabling problem is formulated."""
+
+# Standard library imports
+import datetime as dt
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import connection
+
+# Local application imports
+from data import constants, models
+from domain import solver
+from domain.solver.feasibility import check_feasibility
+from tests import data_factories, domain_factories
+
+
+def get_inputs(school: models.School) -> solver.TimetableSolverInputs:
+    """Get the solver inputs for a school, with the default solution specification."""
+    return solver.TimetableSolverInputs(
+        school_id=school.school_access_key,
+        solution_specification=domain_factories.SolutionSpecification(),
+    )
+
+
+def assert_solver_agrees_problem_is_infeasible(
+    inputs: solver.TimetableSolverInputs,
+) -> None:
+    """Check the solver would have found the problem rejected by the capacity checks infeasible."""
+    timetable_solver = solver.TimetableSolver(input_data=inputs)
+    timetable_solver.solve()
+    assert not timetable_solver.is_optimal
+
+
+@pytest.mark.django_db
+class TestCheckFeasibility:
+    def test_no_errors_for_problem_with_enough_slots(self):
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=2)
+        yg = lesson.pupils.first().year_group
+        for hour in [9, 10]:
+            data_factories.TimetableSlot(
+                school=lesson.school,
+                relevant_year_groups=(yg,),
+                starts_at=dt.time(hour=hour),
+            )
+
+        assert check_feasibility(inputs=get_inputs(lesson.school)) == []
+
+    def test_error_when_lesson_requires_more_slots_than_its_year_group_has(self):
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=2)
+        data_factories.TimetableSlot(
+            school=lesson.school,
+            relevant_year_groups=(lesson.pupils.first().year_group,),
+        )
+        inputs = get_inputs(lesson.school)
+
+        error_messages = check_feasibility(inputs=inputs)
+
+        assert error_messages == [
+            f"Lesson: {lesson} requires 2 more slot(s), but only 1 slot(s) are available to it.\n"
+            "Please amend your data!"
+        ]
+        assert_solver_agrees_problem_is_infeasible(inputs=inputs)
+
+    def test_error_when_lesson_requires_double_period_without_consecutive_slots(
+        self,
+    ):
+        lesson = data_factories.Lesson.with_n_pupils(
+            total_required_slots=2, total_required_double_periods=1
+        )
+        for hour in [9, 14]:
+            data_factories.TimetableSlot(
+                school=lesson.school,
+                relevant_year_groups=(lesson.pupils.first().year_group,),
+                day_of_week=constants.Day.MONDAY,
+                starts_at=dt.time(hour=hour),
+            )
+        inputs = get_inputs(lesson.school)
+
+        error_messages = check_feasibility(inputs=inputs)
+
+        assert error_messages == [
+            f"Lesson: {lesson} requires 1 more double period(s), "
+            "but only 0 pair(s) of consecutive slots are available to it.\n"
+            "Please amend your data!"
+        ]
+        assert_solver_agrees_problem_is_infeasible(inputs=inputs)
+
+    def test_error_when_teacher_has_more_lessons_than_slots(self):
+        school = data_factories.School()
+        teacher = data_factories.Teacher(school=school)
+        yg = data_factories.YearGroup(school=school)
+        for hour in [9, 10, 11]:
+            data_factories.TimetableSlot(
+                school=school, relevant_year_groups=(yg,), starts_at=dt.time(hour=hour)
+            )
+        # Each lesson fits, but the teacher can't teach both
+        for _ in range(2):
+            data_factories.Lesson(
+                school=school,
+                teacher=teacher,
+                pupils=(data_factories.Pupil(school=school, year_group=yg),),
+                total_required_slots=2,
+            )
+        inputs = get_inputs(school)
+
+        error_messages = check_feasibility(inputs=inputs)
+
+        assert error_messages == [
+            f"Teacher: {teacher} must teach 4 more slot(s), but at most 3 of the slots available "
+            "to their lessons can be taught without a clash.\n"
+            "Please amend your data!"
+        ]
+        assert_solver_agrees_problem_is_infeasible(inputs=inputs)
+
+    def test_error_when_classroom_is_needed_at_overlapping_slots(self):
+        school = data_factories.School()
+        classroom = data_factories.Classroom(school=school)
+        # Two year groups, each with one slot, at overlapping times
+        for starts_at in [dt.time(hour=9), dt.time(hour=9, minute=30)]:
+            yg = data_factories.YearGroup(school=school)
+            data_factories.TimetableSlot(
+                school=school,
+                relevant_year_groups=(yg,),
+                day_of_week=constants.Day.MONDAY,
+                starts_at=starts_at,
+            )
+            data_factories.Lesson(
+                school=school,
+                classroom=classroom,
+                pupils=(data_factories.Pupil(school=school, year_group=yg),),
+                total_required_slots=1,
+            )
+        inputs = get_inputs(school)
+
+        error_messages = check_feasibility(inputs=inputs)
+
+        assert error_messages == [
+            f"Classroom: {classroom} must host 2 more slot(s), but at most 1 of the slots available "
+            "to its lessons can be used without a clash.\n"
+            "Please amend your data!"
+        ]
+        assert_solver_agrees_problem_is_infeasible(inputs=inputs)
+
+    @pytest.mark.skipif(
+        connection.vendor == "postgresql",
+        reason="Year group slots and breaks can't clash in the db on Postgres.",
+    )
+    def test_error_when_pupil_is_busy_with_a_break(self):
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=2)
+        pupil = lesson.pupils.first()
+        for hour in [9, 12]:
+            data_factories.TimetableSlot(
+                school=lesson.school,
+                relevant_year_groups=(pupil.year_group,),
+                day_of_week=constants.Day.MONDAY,
+                starts_at=dt.time(hour=hour),
+            )
+        data_factories.Break(
+            school=lesson.school,
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=12),
+            relevant_year_groups=(pupil.year_group,),
+        )
+        inputs = get_inputs(lesson.school)
+
+        error_messages = check_feasibility(inputs=inputs)
+
+        assert error_messages == [
+            f"Pupil: {pupil} must attend 2 more slot(s), but is only free for 1 of the slots available "
+            "to their lessons.\n"
+            "Please amend your data!"
+        ]
+        assert_solver_agrees_problem_is_infeasible(inputs=inputs)
+
+    def test_produce_timetable_solutions_returns_errors_without_solving(self):
+        lesson = data_factories.Lesson.with_n_pupils(total_required_slots=1)
+
+        error_messages = solver.produce_timetable_solutions(
+            school_access_key=lesson.school.school_access_key,
+            solution_specification=domain_factories.SolutionSpecification(),
+        )
+
+        assert error_messages == [
+            f"Lesson: {lesson} requires 1 more slot(s), but only 0 slot(s) are available to it.\n"
+            "Please amend your data!"
+        ]
+        solver_run = models.SolverRun.objects.get()
+        assert solver_run.outcome == constants.SolverRunOutcome.INFEASIBLE
+        assert solver_run.solver_status == "Not Solved"
+        assert [phase["name"] for phase in solver_run.phases] == [
+            "input data",
+            "feasibility",
+        ]
@@ -0,0 +1,172 @@
+"""Tests for the utilities recording the resources used by the solver."""
+
+# Standard library imports
+import resource
+import subprocess
+import sys
+
+# Third party imports
+import pulp as lp
+
+# Local application imports
+from domain.solver import instrumentation
+
+
+class TestPhaseTimer:
+    def test_phases_recorded_in_order(self):
+        timer = instrumentation.PhaseTimer()
+
+        with timer.phase("first"):
+            pass
+        with timer.phase("second"):
+            pass
+
+        assert [phase.name for phase in timer.phases] == ["first", "second"]
+        assert all(phase.wall_time_seconds >= 0 for phase in timer.phases)
+        assert all(phase.peak_rss_kb >= 0 for phase in timer.phases)
+        assert all(phase.child_peak_rss_kb >= 0 for phase in timer.phases)
+        assert timer.total_wall_time_seconds == sum(
+            phase.wall_time_seconds for phase in timer.phases
+        )
+
+    def test_phase_recorded_when_exception_raised(self):
+        timer = instrumentation.PhaseTimer()
+
+        try:
+            with timer.phase("failing"):
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert [phase.name for phase in timer.phases] == ["failing"]
+
+    def test_as_json(self):
+        timer = instrumentation.PhaseTimer()
+        with timer.phase("only"):
+            pass
+
+        phases = timer.as_json()
+
+        assert len(phases) == 1
+        assert phases[0]["name"] == "only"
+        assert set(phases[0].keys()) == {
+            "name",
+            "wall_time_seconds",
+            "peak_rss_kb",
+            "child_peak_rss_kb",
+        }
+
+    def test_phase_records_rise_in_peak_rss_of_child_processes(self):
+        # Run a child process using 50MB more than any previous child process
+        previous_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        allocate_kb = previous_kb + 50 * 1024
+        timer = instrumentation.PhaseTimer()
+
+        with timer.phase("child"):
+            subprocess.run(
+                [sys.executable, "-c", f"data = b'x' * {allocate_kb * 1024}"],
+                check=True,
+            )
+        with timer.phase("no child"):
+            pass
+
+        child_phase, no_child_phase = timer.phases
+        assert child_phase.child_peak_rss_kb >= allocate_kb - previous_kb
+        assert no_child_phase.child_peak_rss_kb == 0
+
+
+class TestProblemSize:
+    def test_from_problem(self):
+        problem = lp.LpProblem("test")
+        x = lp.LpVariable("x")
+        y = lp.LpVariable("y")
+        problem += x + y <= 1
+        problem += x >= 0
+
+        size = instrumentation.ProblemSize.from_problem(problem=problem)
+
+        assert size == instrumentation.ProblemSize(
+            number_of_variables=2, number_of_constraints=2, number_of_nonzeros=3
+        )
+
+
+class TestConstraintFamilySize:
+    def test_from_constraints(self):
+        x = lp.LpVariable("x")
+        y = lp.LpVariable("y")
+        constraints = [x + y <= 1, x >= 0]
+
+        size = instrumentation.ConstraintFamilySize.from_constraints(
+            name="test", wall_time_seconds=0.5, constraints=constraints
+        )
+
+        assert size == instrumentation.ConstraintFamilySize(
+            name="test",
+            number_of_variables=2,
+            number_of_constraints=2,
+            number_of_nonzeros=3,
+            wall_time_seconds=0.5,
+        )
+
+
+class TestFormulationReport:
+    def test_json_round_trip(self):
+        report = instrumentation.FormulationReport()
+        report.add_family(
+            instrumentation.ConstraintFamilySize(
+                name="pupil",
+                number_of_variables=4,
+                number_of_constraints=2,
+                number_of_nonzeros=4,
+                wall_time_seconds=0.25,
+            )
+        )
+
+        families = report.as_json()
+
+        assert families == [
+            {
+                "name": "pupil",
+                "number_of_variables": 4,
+                "number_of_constraints": 2,
+                "number_of_nonzeros": 4,
+                "wall_time_seconds": 0.25,
+            }
+        ]
+        assert (
+            instrumentation.FormulationReport.from_json(families).families
+            == report.families
+        )
+
+    def test_format_table_has_a_line_per_family(self):
+        report = instrumentation.FormulationReport(
+            families=[
+                instrumentation.ConstraintFamilySize(
+                    name=name,
+                    number_of_variables=1,
+                    number_of_constraints=2,
+                    number_of_nonzeros=3,
+                    wall_time_seconds=0.5,
+                )
+                for name in ["fulfillment", "no split lessons in a day"]
+            ]
+        )
+
+        lines = report.format_table().splitlines()
+
+        assert len(lines) == 3
+        assert lines[0].split() == [
+            "Constraint",
+            "family",
+            "Variables",
+            "Rows",
+            "Non-zeros",
+            "Time",
+            "(s)",
+        ]
+        assert lines[2].split() == ["no", "split", "lessons", "in", "a", "day"] + [
+            "1",
+            "2",
+            "3",
+            "0.500",
+        ]
@@ -0,0 +1,176 @@
+"""Tests for the SlotAdjacency class."""
+
+# Standard library imports
+import datetime as dt
+
+# Third party imports
+import pytest
+
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Local application imports
+from data import constants
+from domain.solver.slot_adjacency import SlotAdjacency
+from tests import data_factories
+
+
+@pytest.mark.django_db
+class TestSlotAdjacency:
+    def test_consecutive_slots_found_for_each_year_group(self):
+        school = data_factories.School()
+        yg_0 = data_factories.YearGroup(school=school)
+        yg_1 = data_factories.YearGroup(school=school)
+        slot_0 = data_factories.TimetableSlot(
+            school=school, relevant_year_groups=(yg_0, yg_1)
+        )
+        slot_1 = data_factories.TimetableSlot.get_next_consecutive_slot(slot_0)
+        # Only consecutive for the first year group
+        slot_2 = data_factories.TimetableSlot(
+            school=school,
+            day_of_week=slot_0.day_of_week,
+            starts_at=slot_1.ends_at,
+            relevant_year_groups=(yg_0,),
+        )
+
+        adjacency = SlotAdjacency(school_id=school.school_access_key, lessons=[])
+
+        assert adjacency.get_consecutive_slots_for_year_group(year_group=yg_0) == [
+            (slot_0, slot_1),
+            (slot_1, slot_2),
+        ]
+        assert adjacency.get_consecutive_slots_for_year_group(year_group=yg_1) == [
+            (slot_0, slot_1)
+        ]
+
+    def test_consecutive_slots_for_lesson_use_year_group_of_pupils(self):
+        pupil = data_factories.Pupil()
+        slot_0 = data_factories.TimetableSlot(
+            school=pupil.school, relevant_year_groups=(pupil.year_group,)
+        )
+        slot_1 = data_factories.TimetableSlot.get_next_consecutive_slot(slot_0)
+        lesson = data_factories.Lesson(
+            school=pupil.school, pupils=(pupil,), year_group=None
+        )
+
+        adjacency = SlotAdjacency(
+            school_id=pupil.school.school_access_key, lessons=[lesson]
+        )
+
+        assert adjacency.get_consecutive_slots_for_lesson(lesson=lesson) == [
+            (slot_0, slot_1)
+        ]
+
+    def test_usable_days_of_week_match_lesson_method(self):
+        lesson = data_factories.Lesson.with_n_pupils()
+        yg = lesson.pupils.first().year_group
+        for day in [constants.Day.WEDNESDAY, constants.Day.MONDAY]:
+            data_factories.TimetableSlot(
+                school=lesson.school, relevant_year_groups=(yg,), day_of_week=day
+            )
+        # A slot for a different year group
+        data_factories.TimetableSlot(
+            school=lesson.school, day_of_week=constants.Day.FRIDAY
+        )
+
+        adjacency = SlotAdjacency(
+            school_id=lesson.school.school_access_key, lessons=[lesson]
+        )
+
+        assert adjacency.get_usable_days_of_week(lesson=lesson) == [
+            constants.Day.MONDAY,
+            constants.Day.WEDNESDAY,
+        ]
+        assert (
+            adjacency.get_usable_days_of_week(lesson=lesson)
+            == lesson.get_usable_days_of_week()
+        )
+
+    def test_user_defined_double_periods_match_lesson_methods(self):
+        school = data_factories.School()
+        yg = data_factories.YearGroup(school=school)
+        pupil = data_factories.Pupil(school=school, year_group=yg)
+        # A user defined triple period on Monday, and a split lesson on Tuesday
+        monday_0 = data_factories.TimetableSlot(
+            school=school,
+            relevant_year_groups=(yg,),
+            day_of_week=constants.Day.MONDAY,
+            starts_at=dt.time(hour=9),
+        )
+        monday_1 = data_factories.TimetableSlot.get_next_consecutive_slot(monday_0)
+        monday_2 = data_factories.TimetableSlot.get_next_consecutive_slot(monday_1)
+        tuesday_0 = data_factories.TimetableSlot(
+            school=school,
+            relevant_year_groups=(yg,),
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=9),
+        )
+        tuesday_1 = data_factories.TimetableSlot(
+            school=school,
+            relevant_year_groups=(yg,),
+            day_of_week=constants.Day.TUESDAY,
+            starts_at=dt.time(hour=14),
+        )
+        lesson = data_factories.Lesson(
+            school=school,
+            pupils=(pupil,),
+            user_defined_time_slots=(
+                monday_0,
+                monday_1,
+                monday_2,
+                tuesday_0,
+                tuesday_1,
+            ),
+            total_required_slots=8,
+            total_required_double_periods=3,
+        )
+
+        adjacency = SlotAdjacency(school_id=school.school_access_key, lessons=[lesson])
+
+        for day in constants.Day:
+            assert adjacency.get_user_defined_double_period_count_on_day(
+                lesson=lesson, day_of_week=day
+            ) == lesson.get_user_defined_double_period_count_on_day(day_of_week=day)
+            assert (
+                adjacency.get_user_defined_slot_count_on_day(
+                    lesson=lesson, day_of_week=day
+                )
+                == lesson.user_defined_time_slots.get_timeslots_on_given_day(
+                    school_id=school.school_access_key,
+                    day_of_week=day,
+                    year_group=yg,
+                ).count()
+            )
+        assert adjacency.get_n_solver_double_periods_required(lesson=lesson) == 1
+        assert (
+            adjacency.get_n_solver_double_periods_required(lesson=lesson)
+            == lesson.get_n_solver_double_periods_required()
+        )
+
+    def test_number_of_queries_does_not_depend_on_number_of_lessons(self):
+        school = data_factories.School()
+        yg = data_factories.YearGroup(school=school)
+        slot_0 = data_factories.TimetableSlot(school=school, relevant_year_groups=(yg,))
+        slot_1 = data_factories.TimetableSlot.get_next_consecutive_slot(slot_0)
+        lessons = [
+            data_factories.Lesson(
+                school=school,
+                year_group=yg if n % 2 else None,
+                pupils=(data_factories.Pupil(school=school, year_group=yg),),
+                user_defined_time_slots=(slot_0, slot_1),
+                total_required_slots=4,
+                total_required_double_periods=2,
+            )
+            for n in range(10)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            adjacency = SlotAdjacency(
+                school_id=school.school_access_key, lessons=lessons
+            )
+            for lesson in lessons:
+                adjacency.get_consecutive_slots_for_lesson(lesson=lesson)
+                adjacency.get_n_solver_double_periods_required(lesson=lesson)
+
+        assert len(queries) == 4
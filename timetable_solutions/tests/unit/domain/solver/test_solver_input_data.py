@@ -8,6 +8,10 @@ import random
 # Third party imports
 import pytest
 
+# Django imports
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 # Local application imports
 from data import constants as data_constants
 from data import models
@@ -257,3 +261,52 @@ class TestTimetableSolverInputsValidation:
         assert len(data.error_messages) == 1
         error = data.error_messages[0]
         assert "solver defined time slot(s) was passed as solver input data!" in error
+
+    def test_error_when_lesson_has_no_pupils_and_disallows_split_lessons(self):
+        yg = data_factories.YearGroup()
+        lesson = data_factories.Lesson(
+            school=yg.school, year_group=yg, total_required_slots=1
+        )
+        data_factories.TimetableSlot(school=yg.school, relevant_year_groups=(yg,))
+
+        spec = domain_factories.SolutionSpecification(
+            allow_split_lessons_within_each_day=False
+        )
+        data = slvr.TimetableSolverInputs(
+            school_id=lesson.school.school_access_key, solution_specification=spec
+        )
+
+        assert data.error_messages == [
+            f"Lesson: {lesson} has no pupils, and therefore cannot be solved.\n"
+            "Please add some!"
+        ]
+
+    @pytest.mark.parametrize("n_lessons", [1, 10])
+    def test_number_of_validation_queries_does_not_depend_on_number_of_lessons(
+        self, n_lessons: int
+    ):
+        school = data_factories.School()
+        yg = data_factories.YearGroup(school=school)
+        slot = data_factories.TimetableSlot(school=school, relevant_year_groups=(yg,))
+        for _ in range(n_lessons):
+            data_factories.Lesson(
+                school=school,
+                year_group=yg,
+                pupils=(data_factories.Pupil(school=school, year_group=yg),),
+                solver_defined_time_slots=(slot,),
+                total_required_slots=1,
+                total_required_double_periods=0,
+            )
+
+        spec = domain_factories.SolutionSpecification(
+            allow_split_lessons_within_each_day=False
+        )
+        with CaptureQueriesContext(connection) as queries:
+            data = slvr.TimetableSolverInputs(
+                school_id=school.school_access_key, solution_specification=spec
+            )
+
+        # One error per lesson, for its existing solution
+        assert len(data.error_messages) == n_lessons
+        # The lessons, the slot adjacency, and one query per validation check
+        assert len(queries) == 6
@@ -3,8 +3,11 @@ import pytest
 
 # Django imports
 from django.core import exceptions as django_exceptions
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 # Local application imports
+from data import models
 from interfaces.data_management.forms import lesson as lesson_forms
 from tests import data_factories
 
@@ -290,3 +293,26 @@ class TestLessonAddUserDefinedTimetableSlot:
             form.clean_slot()
 
         assert "one of the pupils in this lesson is already busy" in str(exc.value)
+
+    def test_clean_slot_queries_do_not_grow_with_number_of_pupils(self):
+        assert self._count_clean_slot_queries(n_pupils=1) == (
+            self._count_clean_slot_queries(n_pupils=30)
+        )
+
+    @staticmethod
+    def _count_clean_slot_queries(n_pupils: int) -> int:
+        school = data_factories.School()
+        pupils = [data_factories.Pupil(school=school) for _ in range(n_pupils)]
+        lesson = data_factories.Lesson(school=school, pupils=pupils)
+        lesson = models.Lesson.objects.get(pk=lesson.pk)
+        slot = data_factories.TimetableSlot(school=school)
+
+        form = lesson_forms.LessonAddUserDefinedTimetableSlot(
+            school_id=school.school_access_key, lesson=lesson
+        )
+        form.cleaned_data = {"slot": slot}
+
+        with CaptureQueriesContext(connection) as queries:
+            form.clean_slot()
+
+        return len(queries)